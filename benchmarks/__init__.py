@@ -0,0 +1,4 @@
+"""
+Empty __init__.py file
+This makes the directory a Python package
+"""
@@ -0,0 +1,93 @@
+"""
+Analytics Metrics Benchmark
+Times the vectorized analytics engine on synthetic transactions
+
+Usage:
+    python -m benchmarks.analytics_benchmark [rows]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.analytics_metrics import (
+    compute_basic_metrics,
+    compute_category_totals,
+    compute_monthly_totals,
+    compute_month_over_month_change,
+)
+
+CATEGORIES = [
+    "Food", "Transport", "Books", "Entertainment", "Shopping",
+    "Dining", "Groceries", "Transportation", "Utilities", "Health"
+]
+MERCHANTS = [f"Merchant {i}" for i in range(500)]
+
+
+def make_transactions(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Seeded synthetic transactions over three years (~5% income)
+    """
+
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2023-01-01", "s")
+    offsets = rng.integers(0, 3 * 365 * 24 * 3600, rows)
+
+    return pd.DataFrame({
+        "date": (start + offsets).astype("datetime64[ns]"),
+        "type": pd.Categorical.from_codes(
+            (rng.random(rows) < 0.05).astype(np.int8),
+            categories=["expense", "income"]
+        ),
+        "amount": np.round(rng.uniform(10, 2000, rows), 2),
+        "category": pd.Categorical.from_codes(
+            rng.integers(0, len(CATEGORIES), rows), categories=CATEGORIES
+        ),
+        "merchant": pd.Categorical.from_codes(
+            rng.integers(0, len(MERCHANTS), rows), categories=MERCHANTS
+        ),
+    })
+
+
+def run(rows: int = 1_000_000, repeat: int = 5) -> dict:
+    """
+    Best-of-N timings in seconds for each metric and the full pipeline
+    """
+
+    df = make_transactions(rows)
+
+    def pipeline():
+        monthly = compute_monthly_totals(df)
+        return (
+            compute_basic_metrics(df),
+            compute_category_totals(df),
+            compute_month_over_month_change(monthly),
+        )
+
+    cases = {
+        "compute_basic_metrics": lambda: compute_basic_metrics(df),
+        "compute_category_totals": lambda: compute_category_totals(df),
+        "compute_monthly_totals": lambda: compute_monthly_totals(df),
+        "full_pipeline": pipeline,
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        results[name] = min(timings)
+
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Analytics benchmark ({rows:,} transactions)")
+    for name, seconds in run(rows).items():
+        print(f"  {name:<26} {seconds * 1000:8.1f} ms")
@@ -0,0 +1,393 @@
+"""
+In-Memory Service Stand-ins
+Minimal Firestore client and Gemini model used by the benchmarks,
+so the real FirebaseManager and GeminiManager code paths are timed
+without any network calls
+"""
+
+import itertools
+import operator
+from typing import Dict, Iterable, List, Optional
+
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore_v1.transforms import Increment
+
+from services.firebase_manager import FirebaseManager
+from services.gemini_manager import GeminiManager
+from services.response_cache import ResponseCache
+from services.storage import ReceiptStore
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda value, values: value in values
+}
+
+
+class InMemoryDocument:
+    def __init__(self, doc_id: str, data: Optional[Dict] = None):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Dict:
+        return dict(self._data)
+
+
+class InMemoryDocumentRef:
+    def __init__(self, collection: "InMemoryCollection", doc_id: str):
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self, transaction=None) -> InMemoryDocument:
+        return InMemoryDocument(self.id, self._collection.docs.get(self.id))
+
+    def create(self, data: Dict):
+        if self.id in self._collection.docs:
+            raise AlreadyExists(f"Document already exists: {self.id}")
+        self._collection.write(self.id, data)
+
+    def set(self, data: Dict, merge: bool = False):
+        if merge:
+            data = self._merged(data)
+        self._collection.write(self.id, data)
+
+    def _merged(self, data: Dict) -> Dict:
+        merged = dict(self._collection.docs.get(self.id) or {})
+        for field, value in data.items():
+            if isinstance(value, Increment):
+                value = merged.get(field, 0) + value.value
+            merged[field] = value
+        return merged
+
+    def delete(self):
+        self._collection.remove(self.id)
+
+    def collection(self, name: str) -> "InMemoryCollection":
+        return self._collection.db.collection(
+            f"{self._collection.path}/{self.id}/{name}"
+        )
+
+
+class InMemoryQuery:
+    """
+    Immutable query: order_by / where / limit / offset / start_after
+    return copies
+    The sorted result of a base query is computed once and shared.
+    """
+
+    def __init__(
+        self, collection, order=None, filters=(), limit=None, offset=0, after=None
+    ):
+        self._collection = collection
+        self._order = order
+        self._filters = filters
+        self._limit = limit
+        self._offset = offset
+        self._after = after
+
+    def _copy(self, **changes) -> "InMemoryQuery":
+        fields = {
+            "order": self._order,
+            "filters": self._filters,
+            "limit": self._limit,
+            "offset": self._offset,
+            "after": self._after
+        }
+        fields.update(changes)
+        return InMemoryQuery(self._collection, **fields)
+
+    def where(self, filter=None):
+        value = filter.value
+        if isinstance(value, list):
+            # Filters key the sorted-ID cache, so keep them hashable
+            value = tuple(value)
+        return self._copy(filters=self._filters + (
+            (filter.field_path, filter.op_string, value),
+        ))
+
+    def order_by(self, field: str, direction: str = "ASCENDING"):
+        return self._copy(order=(field, direction == "DESCENDING"))
+
+    def limit(self, count: int):
+        return self._copy(limit=count)
+
+    def offset(self, count: int):
+        return self._copy(offset=count)
+
+    def start_after(self, doc: InMemoryDocument):
+        return self._copy(after=doc.id)
+
+    def count(self, alias: str = "count") -> "InMemoryAggregation":
+        return InMemoryAggregation(self).count(alias)
+
+    def sum(self, field: str, alias: str = "sum") -> "InMemoryAggregation":
+        return InMemoryAggregation(self).sum(field, alias)
+
+    def avg(self, field: str, alias: str = "avg") -> "InMemoryAggregation":
+        return InMemoryAggregation(self).avg(field, alias)
+
+    def stream(self) -> Iterable[InMemoryDocument]:
+        ids, positions = self._collection.sorted_ids(self._order, self._filters)
+
+        skipped = 0
+        if self._after is not None:
+            skipped = positions[self._after] + 1
+
+        # Like Firestore, documents skipped by offset are billed as reads
+        start = skipped + self._offset
+        stop = len(ids) if self._limit is None else start + self._limit
+        docs = self._collection.docs
+        self._collection.reads += max(0, min(stop, len(ids)) - skipped)
+
+        return iter([
+            InMemoryDocument(doc_id, docs[doc_id])
+            for doc_id in ids[start:stop]
+        ])
+
+
+class InMemoryAggregationResult:
+    def __init__(self, alias: str, value):
+        self.alias = alias
+        self.value = value
+
+
+class InMemoryAggregation:
+    """
+    count / sum / avg over a query, like Firestore's AggregationQuery
+    """
+
+    def __init__(self, query: InMemoryQuery):
+        self._query = query
+        self._aggregations = []
+
+    def count(self, alias: str = "count"):
+        self._aggregations.append(("count", None, alias))
+        return self
+
+    def sum(self, field: str, alias: str = "sum"):
+        self._aggregations.append(("sum", field, alias))
+        return self
+
+    def avg(self, field: str, alias: str = "avg"):
+        self._aggregations.append(("avg", field, alias))
+        return self
+
+    def get(self) -> List[List[InMemoryAggregationResult]]:
+        collection = self._query._collection
+        ids, _ = collection.sorted_ids(None, self._query._filters)
+        collection.aggregations += 1
+
+        results = []
+        for kind, field, alias in self._aggregations:
+            if kind == "count":
+                value = len(ids)
+            else:
+                values = [
+                    collection.docs[doc_id][field] for doc_id in ids
+                    if isinstance(collection.docs[doc_id].get(field), (int, float))
+                ]
+                if kind == "sum":
+                    value = sum(values)
+                else:
+                    value = sum(values) / len(values) if values else None
+            results.append(InMemoryAggregationResult(alias, value))
+
+        return [results]
+
+
+class InMemoryCollection(InMemoryQuery):
+    def __init__(self, db: "InMemoryFirestore", path: str):
+        super().__init__(self)
+        self.db = db
+        self.path = path
+        self.docs: Dict[str, Dict] = {}
+        self.reads = 0
+        self.aggregations = 0
+        self._sorted = {}
+
+    def write(self, doc_id: str, data: Dict):
+        self.docs[doc_id] = data
+        self._sorted.clear()
+
+    def remove(self, doc_id: str):
+        self.docs.pop(doc_id, None)
+        self._sorted.clear()
+
+    def load(self, receipts: Iterable[Dict]):
+        """Bulk-insert receipts that carry their own "id" field"""
+
+        for receipt in receipts:
+            data = dict(receipt)
+            self.docs[data.pop("id")] = data
+        self._sorted.clear()
+
+    def sorted_ids(self, order, filters):
+        key = (order, filters)
+        if key not in self._sorted:
+            items = self.docs.items()
+            for field, op, value in filters:
+                compare = OPERATORS[op]
+                items = [
+                    (i, d) for i, d in items
+                    if field in d and compare(d[field], value)
+                ]
+
+            if order is not None:
+                field, reverse = order
+                # Firestore breaks ties on the document ID
+                items = sorted(
+                    items, key=lambda item: (item[1][field], item[0]),
+                    reverse=reverse
+                )
+
+            ids = [doc_id for doc_id, _ in items]
+            self._sorted[key] = (ids, {doc_id: i for i, doc_id in enumerate(ids)})
+
+        return self._sorted[key]
+
+    def document(self, doc_id: Optional[str] = None) -> InMemoryDocumentRef:
+        if doc_id is None:
+            # Unique across collections, like Firestore's random IDs
+            doc_id = f"doc-{next(self.db.ids):09d}"
+        return InMemoryDocumentRef(self, doc_id)
+
+    def add(self, data: Dict):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+
+class InMemoryBatch:
+    def __init__(self):
+        self._ops = []
+
+    def set(self, ref: InMemoryDocumentRef, data: Dict, merge: bool = False):
+        self._ops.append((lambda data: ref.set(data, merge=merge), data))
+
+    def delete(self, ref: InMemoryDocumentRef):
+        self._ops.append((lambda _: ref.delete(), None))
+
+    def commit(self):
+        for op, data in self._ops:
+            op(data)
+        self._ops = []
+
+
+class InMemoryTransaction(InMemoryBatch):
+    """
+    Writes are buffered and applied on commit, with just enough of
+    the Transaction protocol for @firestore.transactional
+    """
+
+    _read_only = False
+    _max_attempts = 1
+    _id = None
+
+    def _begin(self, retry_id=None):
+        self._id = b"in-memory"
+
+    def _clean_up(self):
+        self._ops = []
+        self._id = None
+
+    def _commit(self):
+        self.commit()
+        self._id = None
+
+    def _rollback(self):
+        self._clean_up()
+
+
+class InMemoryFirestore:
+    """
+    Stand-in for firestore.client() covering what FirebaseManager uses
+    """
+
+    def __init__(self):
+        # Keyed by path, e.g. "receipts" or "users/alice/receipts"
+        self.collections: Dict[str, InMemoryCollection] = {}
+        self.ids = itertools.count()
+
+    def collection(self, path: str) -> InMemoryCollection:
+        if path not in self.collections:
+            self.collections[path] = InMemoryCollection(self, path)
+        return self.collections[path]
+
+    def batch(self) -> InMemoryBatch:
+        return InMemoryBatch()
+
+    def get_all(self, refs: Iterable[InMemoryDocumentRef]):
+        # One billed read per requested document, found or not
+        for ref in refs:
+            ref._collection.reads += 1
+            yield ref.get()
+
+    def transaction(self) -> InMemoryTransaction:
+        return InMemoryTransaction()
+
+
+def make_firebase_store(receipts: Iterable[Dict] = ()) -> FirebaseManager:
+    """
+    FirebaseManager backed by InMemoryFirestore, preloaded with receipts
+    """
+
+    store = FirebaseManager.__new__(FirebaseManager)
+    ReceiptStore.__init__(store)
+    store.db = InMemoryFirestore()
+    store.db.collection("receipts").load(receipts)
+
+    # Bulk-loaded receipts bypass save_receipt_data, so backfill rollups
+    store.rebuild_rollups()
+    for collection in store.db.collections.values():
+        collection.reads = 0
+    return store
+
+
+class FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeResponse(FakeChunk):
+    pass
+
+
+class FakeGeminiModel:
+    """
+    Answers every prompt with a fixed reply, optionally streamed
+    """
+
+    REPLY = (
+        "You spent the most on Shopping this month. "
+        "Consider setting a weekly budget for dining out."
+    )
+
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        self.prompts.append(prompt)
+        if not stream:
+            return FakeResponse(self.REPLY)
+        return iter(FakeChunk(word + " ") for word in self.REPLY.split())
+
+
+def make_gemini_manager(
+    response_cache: Optional[ResponseCache] = None
+) -> GeminiManager:
+    """
+    GeminiManager that talks to FakeGeminiModel
+    """
+
+    manager = GeminiManager.__new__(GeminiManager)
+    manager.response_cache = response_cache
+    manager.model = FakeGeminiModel()
+    return manager
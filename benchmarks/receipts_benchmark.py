@@ -0,0 +1,253 @@
+"""
+Receipts Benchmark Suite
+Times the dashboard, summary, chart and upload paths on seeded
+synthetic receipts, with Firestore and Gemini replaced by the
+in-memory stand-ins in benchmarks.fakes
+
+Usage:
+    python -m benchmarks.receipts_benchmark
+    python -m benchmarks.receipts_benchmark --sizes 1000 100000 \\
+        --output results.json --baseline previous.json
+
+Results are written as JSON (one entry per size and case). With
+--baseline, cases slower than baseline * --threshold are reported
+and the exit code is 1, so the suite can gate a release.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import gradio as gr
+
+from benchmarks.fakes import make_firebase_store, make_gemini_manager
+from benchmarks.synthetic import END_DATE, make_receipts
+from services.ai_summary import summarize_store, summary_version
+from services.analytics_data import transactions_from_receipts
+from services.date_range import CUSTOM
+from services.document_ai_processor import DocumentAIProcessor
+from services.job_queue import ReceiptJobQueue
+from ui.dashboard import create_dashboard_tab, normalize_receipts
+from utils.charts import category_expense_chart, monthly_expense_chart
+from utils.helpers import calculate_spending_summary
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# Custom dashboard window: the last month of synthetic history
+LAST_MONTH = (END_DATE[:8] + "01", END_DATE)
+
+# Files per simulated upload batch (the store already holds `size` receipts)
+UPLOAD_BATCH = 20
+
+# Minimal valid PNG, enough for validate_file / get_mime_type
+PNG_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDATx\x9cc\xf8\x0f"
+    b"\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def _time(fn: Callable, repeat: int, setup: Callable = None) -> Dict:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "runs": len(timings)
+    }
+
+
+def _upload_files(directory: str) -> List[str]:
+    paths = []
+    for i in range(UPLOAD_BATCH):
+        path = os.path.join(directory, f"receipt_{i:03d}.png")
+        with open(path, "wb") as f:
+            f.write(PNG_BYTES)
+        paths.append(path)
+    return paths
+
+
+def _time_spending_summary(receipts: List[Dict], repeat: int) -> Dict[str, Dict]:
+    normalized = normalize_receipts(receipts)
+    return {
+        "calculate_spending_summary": _time(
+            lambda: calculate_spending_summary(normalized), repeat
+        )
+    }
+
+
+def _time_expense_charts(receipts: List[Dict], repeat: int) -> Dict[str, Dict]:
+    transactions = transactions_from_receipts(receipts)
+    return {
+        "monthly_expense_chart": _time(
+            lambda: monthly_expense_chart(transactions), repeat
+        ),
+        "category_expense_chart": _time(
+            lambda: category_expense_chart(transactions), repeat
+        )
+    }
+
+
+def run_size(size: int, repeat: int, seed: int = 42) -> Dict[str, Dict]:
+    """
+    Timings for every case at one dataset size
+    """
+
+    receipts = make_receipts(size, seed)
+    results = {}
+
+    # Dashboard: the first load bootstraps the aggregates from the store
+    cold_load = None
+
+    def fresh_dashboard():
+        nonlocal cold_load
+        with gr.Blocks():
+            cold_load = create_dashboard_tab(make_firebase_store(receipts))[0]
+
+    results["load_dashboard_cold"] = _time(
+        lambda: cold_load(), repeat, fresh_dashboard
+    )
+    cold_load = None
+
+    with gr.Blocks():
+        dashboard_store = make_firebase_store(receipts)
+        load_dashboard = create_dashboard_tab(dashboard_store)[0]
+
+    load_dashboard()
+    results["load_dashboard_warm"] = _time(load_dashboard, repeat)
+
+    # The last month of history through the date-range range query
+    results["load_dashboard_month"] = _time(
+        lambda: load_dashboard(CUSTOM, *LAST_MONTH), repeat
+    )
+
+    recent = receipts[:min(size, 50)]
+    results["normalize_receipts_recent"] = _time(
+        lambda: normalize_receipts(recent), repeat
+    )
+
+    results["normalize_receipts_all"] = _time(
+        lambda: normalize_receipts(receipts), repeat
+    )
+
+    # Each helper drops its intermediate frame when it returns
+    results.update(_time_spending_summary(receipts, repeat))
+    results.update(_time_expense_charts(receipts, repeat))
+
+    # Pilot context + a cached streamed answer through the fake model
+    gemini_manager = make_gemini_manager()
+
+    def pilot_answer():
+        context = summarize_store(dashboard_store)
+        return list(gemini_manager.stream_response(
+            "Where did my money go?", summary_version(context), context
+        ))
+
+    results["pilot_context"] = _time(pilot_answer, repeat)
+
+    # Upload a fixed batch into a store that already holds `size` receipts:
+    # enqueue the files as one submission and wait for the queue to drain
+    with tempfile.TemporaryDirectory() as directory:
+        files = _upload_files(directory)
+        job_queue = ReceiptJobQueue(dashboard_store, DocumentAIProcessor())
+
+        def upload_batch():
+            job_ids, _ = job_queue.submit_batch(files)
+            job_queue.wait(job_ids)
+
+        results["upload_batch"] = _time(upload_batch, repeat)
+        job_queue.shutdown()
+
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Cases whose best time regressed past baseline * threshold
+    """
+
+    regressions = []
+    for size, cases in results["results"].items():
+        for case, timing in cases.items():
+            previous = baseline.get("results", {}).get(size, {}).get(case)
+            if previous and timing["best"] > previous["best"] * threshold:
+                regressions.append(
+                    f"{case} @ {size}: {previous['best'] * 1000:.1f} ms -> "
+                    f"{timing['best'] * 1000:.1f} ms"
+                )
+    return regressions
+
+
+def run(sizes: List[int], repeat: int, seed: int = 42) -> Dict:
+    """
+    Full suite as a JSON-serializable dict
+    """
+
+    output = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "upload_batch": UPLOAD_BATCH,
+        "results": {}
+    }
+
+    for size in sizes:
+        print(f"Receipts benchmark ({size:,} receipts)")
+        cases = run_size(size, repeat, seed)
+        for name, timing in cases.items():
+            print(f"  {name:<28} {timing['best'] * 1000:10.1f} ms")
+        output["results"][str(size)] = cases
+
+    return output
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", help="previous results JSON to compare")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25,
+        help="allowed slowdown factor vs the baseline (default 1.25)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.seed)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"  REGRESSION {line}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Synthetic Receipts
+Seeded receipt generator for benchmarks, shaped like the documents
+FirebaseManager stores (created_at / updated_at as datetimes)
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from services.document_ai_processor import DEMO_CATEGORIES, DEMO_MERCHANTS
+
+# Receipts are spread over this many days before END_DATE
+HISTORY_DAYS = 730
+END_DATE = "2025-12-31"
+
+
+def make_receipts(count: int, seed: int = 42) -> List[Dict]:
+    """
+    count receipts with reproducible merchants, categories and amounts
+    Same seed and count always give the same receipts.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    end = pd.Timestamp(END_DATE)
+    offsets = rng.integers(0, HISTORY_DAYS * 24 * 3600, count)
+    created = (end - pd.to_timedelta(offsets, unit="s")).to_pydatetime()
+
+    merchants = rng.integers(0, len(DEMO_MERCHANTS), count).tolist()
+    categories = rng.integers(0, len(DEMO_CATEGORIES), count).tolist()
+    amounts = np.round(rng.uniform(50, 1500, count), 2).tolist()
+
+    return [
+        {
+            "id": f"bench-{seed}-{i:07d}",
+            "merchant_name": DEMO_MERCHANTS[merchants[i]],
+            "category": DEMO_CATEGORIES[categories[i]],
+            "total_amount": amounts[i],
+            "currency": "INR",
+            "transaction_date": created[i].strftime("%Y-%m-%d"),
+            "created_at": created[i],
+            "updated_at": created[i]
+        }
+        for i in range(count)
+    ]
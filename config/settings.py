@@ -21,17 +21,88 @@ class Settings:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 
+    # Hard cap on Pilot prompt size (summary + question)
+    PILOT_PROMPT_MAX_TOKENS = int(os.getenv("PILOT_PROMPT_MAX_TOKENS", 1000))
+
+    # Pilot response cache
+    RESPONSE_CACHE_ENABLED = (
+        os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    )
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256))
+    RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 3600))
+    # Optional on-disk tier (SQLite file); empty keeps the cache in memory
+    RESPONSE_CACHE_DISK_PATH = os.getenv("RESPONSE_CACHE_DISK_PATH", "")
+    # How long Pilot reuses a user's financial summary when this process
+    # has not written; bounds staleness from writes by other instances
+    PILOT_SUMMARY_TTL_SECONDS = int(os.getenv("PILOT_SUMMARY_TTL_SECONDS", 60))
+
     # Firebase Configuration (ENV-based, Railway-safe)
     FIREBASE_SERVICE_ACCOUNT_JSON = os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
 
+    # Storage Backend ("firebase" or "sqlite")
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firebase").lower()
+    SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "data/pocketpilot.db")
+    # How long Firestore table page cursors and the row count are reused
+    # (other instances' writes are unseen until then); 0 disables
+    TABLE_CACHE_TTL_SECONDS = int(os.getenv("TABLE_CACHE_TTL_SECONDS", 30))
+
     # App Configuration
     APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
     APP_PORT = int(os.getenv("APP_PORT", 7860))
 
+    # Sign-in accounts as "user:password,user2:password2"; each user
+    # sees only their own receipts. Empty runs without sign-in.
+    APP_USERS = os.getenv("APP_USERS", "")
+
+    # Dashboard Configuration
+    DASHBOARD_TABLE_LIMIT = int(os.getenv("DASHBOARD_TABLE_LIMIT", 50))
+    # Bars per category / merchant chart (the rest are grouped as
+    # "Other") and points on the spending-over-time chart
+    CHART_TOP_N = int(os.getenv("CHART_TOP_N", 10))
+    CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", 120))
+
+    # Receipt Upload Configuration (background job queue)
+    UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", 4))
+    UPLOAD_QUEUE_MAX_DEPTH = int(os.getenv("UPLOAD_QUEUE_MAX_DEPTH", 100))
+    UPLOAD_MAX_RETRIES = int(os.getenv("UPLOAD_MAX_RETRIES", 3))
+    UPLOAD_RETRY_BACKOFF_SECONDS = float(
+        os.getenv("UPLOAD_RETRY_BACKOFF_SECONDS", 1.0)
+    )
+
+    # Rows per chunk when bulk importing transaction files
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+
+    # Receipt image preprocessing before extraction
+    IMAGE_PREPROCESS_ENABLED = (
+        os.getenv("IMAGE_PREPROCESS_ENABLED", "true").lower() == "true"
+    )
+    IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", 2000))
+    IMAGE_GRAYSCALE = os.getenv("IMAGE_GRAYSCALE", "true").lower() == "true"
+    IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", 85))
+
+    # Extraction cache (keyed on the SHA-256 of the uploaded file)
+    EXTRACTION_CACHE_ENABLED = (
+        os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    )
+    EXTRACTION_CACHE_PATH = os.getenv(
+        "EXTRACTION_CACHE_PATH", "data/extraction_cache.db"
+    )
+    EXTRACTION_CACHE_MAX_BYTES = int(
+        os.getenv("EXTRACTION_CACHE_MAX_BYTES", 50 * 1024 * 1024)
+    )
+
+    # Local receipt mirror (Parquet snapshot + delta sync); only used
+    # without sign-in (APP_USERS empty)
+    MIRROR_ENABLED = os.getenv("MIRROR_ENABLED", "true").lower() == "true"
+    MIRROR_SNAPSHOT_PATH = os.getenv(
+        "MIRROR_SNAPSHOT_PATH", "data/receipts_snapshot.parquet"
+    )
+
     @classmethod
     def validate(cls):
         """
         Validate required environment variables
+        Called by main.create_app; importing settings never raises.
         """
 
         errors = []
@@ -39,13 +110,27 @@ class Settings:
         if not cls.GEMINI_API_KEY:
             errors.append("GEMINI_API_KEY is not set")
 
-        if not cls.FIREBASE_SERVICE_ACCOUNT_JSON:
-            errors.append("FIREBASE_SERVICE_ACCOUNT_JSON is not set")
-        else:
-            try:
-                json.loads(cls.FIREBASE_SERVICE_ACCOUNT_JSON)
-            except Exception:
-                errors.append("FIREBASE_SERVICE_ACCOUNT_JSON is not valid JSON")
+        if cls.STORAGE_BACKEND not in ("firebase", "sqlite"):
+            errors.append(
+                f"STORAGE_BACKEND must be 'firebase' or 'sqlite', "
+                f"got '{cls.STORAGE_BACKEND}'"
+            )
+
+        if cls.STORAGE_BACKEND == "firebase":
+            if not cls.FIREBASE_SERVICE_ACCOUNT_JSON:
+                errors.append("FIREBASE_SERVICE_ACCOUNT_JSON is not set")
+            else:
+                try:
+                    json.loads(cls.FIREBASE_SERVICE_ACCOUNT_JSON)
+                except Exception:
+                    errors.append(
+                        "FIREBASE_SERVICE_ACCOUNT_JSON is not valid JSON"
+                    )
+
+        for account in filter(None, cls.APP_USERS.split(",")):
+            if ":" not in account:
+                errors.append("APP_USERS entries must be 'user:password'")
+                break
 
         if errors:
             raise ValueError(
@@ -55,6 +140,15 @@ class Settings:
 
         return True
 
+    @classmethod
+    def app_users(cls):
+        """
+        APP_USERS as a list of (username, password) pairs
+        """
+
+        return [
+            tuple(account.strip().split(":", 1))
+            for account in cls.APP_USERS.split(",")
+            if account.strip()
+        ]
 
-# Validate on import
-Settings.validate()
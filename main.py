@@ -2,13 +2,13 @@
 PocketPilot AI - Main Application
 """
 
+import time
+
+PROCESS_START = time.perf_counter()
+
+from typing import Optional
 import gradio as gr
-from services.firebase_manager import FirebaseManager
-from services.document_ai_processor import DocumentAIProcessor
-from services.gemini_manager import GeminiManager
-from ui.dashboard import create_dashboard_tab
-from ui.receipt_upload import create_receipt_upload_tab
-from ui.chatbot import create_chatbot_tab
+from services.startup import ServiceRegistry, StartupTimer
 from config.settings import Settings
 
 CUSTOM_CSS = """
@@ -105,18 +105,146 @@ footer {
 }
 """
 
-def create_app():
+def create_receipt_store_service():
+    from services.storage import create_receipt_store
+    return create_receipt_store()
+
+
+def create_document_ai_service():
+    from services.document_ai_processor import DocumentAIProcessor
+
+    processor = DocumentAIProcessor()
+
+    if Settings.IMAGE_PREPROCESS_ENABLED:
+        from services.image_preprocessing import (
+            PreprocessingDocumentAIProcessor
+        )
+        processor = PreprocessingDocumentAIProcessor(
+            processor,
+            max_dimension=Settings.IMAGE_MAX_DIMENSION,
+            grayscale=Settings.IMAGE_GRAYSCALE,
+            jpeg_quality=Settings.IMAGE_JPEG_QUALITY
+        )
+
+    if not Settings.EXTRACTION_CACHE_ENABLED:
+        return processor
+
+    # Identical files skip preprocessing and extraction (see ExtractionCache)
+    from services.extraction_cache import (
+        CachedDocumentAIProcessor,
+        ExtractionCache
+    )
+    return CachedDocumentAIProcessor(
+        processor,
+        ExtractionCache(
+            Settings.EXTRACTION_CACHE_PATH,
+            max_bytes=Settings.EXTRACTION_CACHE_MAX_BYTES
+        )
+    )
+
+
+def create_gemini_service():
+    from services.gemini_manager import GeminiManager
+    from services.response_cache import ResponseCache
+
+    response_cache = None
+    if Settings.RESPONSE_CACHE_ENABLED:
+        response_cache = ResponseCache(
+            max_entries=Settings.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=Settings.RESPONSE_CACHE_TTL_SECONDS,
+            disk_path=Settings.RESPONSE_CACHE_DISK_PATH or None
+        )
+    return GeminiManager(response_cache)
+
+
+def register_services(registry: ServiceRegistry):
+    """
+    Register every backend client; nothing is constructed here
+    """
+
+    receipt_store = registry.register(
+        "receipt_store", create_receipt_store_service
+    )
+    doc_ai_processor = registry.register(
+        "document_ai", create_document_ai_service
+    )
+    gemini_manager = registry.register("gemini", create_gemini_service)
+
+    def create_job_queue_service():
+        from services.job_queue import ReceiptJobQueue
+        return ReceiptJobQueue(
+            receipt_store.resolve(),
+            doc_ai_processor.resolve(),
+            workers=Settings.UPLOAD_MAX_WORKERS,
+            max_depth=Settings.UPLOAD_QUEUE_MAX_DEPTH,
+            max_retries=Settings.UPLOAD_MAX_RETRIES,
+            backoff_seconds=Settings.UPLOAD_RETRY_BACKOFF_SECONDS
+        )
+
+    receipt_jobs = registry.register("receipt_jobs", create_job_queue_service)
+
+    # The mirror only pays off for the remote Firestore backend, and it
+    # tracks the default user's receipts, which nobody sees once
+    # sign-in is on
+    receipt_mirror = None
+    if (
+        Settings.MIRROR_ENABLED
+        and Settings.STORAGE_BACKEND == "firebase"
+        and not Settings.app_users()
+    ):
+        def create_mirror_service():
+            from services.receipt_mirror import ReceiptMirror
+            mirror = ReceiptMirror(
+                receipt_store.resolve(),
+                Settings.MIRROR_SNAPSHOT_PATH
+            )
+            # Warm the snapshot so the first dashboard load is a delta sync
+            mirror.refresh()
+            return mirror
+
+        receipt_mirror = registry.register(
+            "receipt_mirror", create_mirror_service
+        )
+
+    return receipt_store, receipt_jobs, gemini_manager, receipt_mirror
+
+
+def create_app(registry: Optional[ServiceRegistry] = None):
+    """
+    Build the UI and start service initialization in the background
+    The UI holds lazy handles; handlers wait for a service on first use.
+    """
+
+    from ui.dashboard import create_dashboard_tab
+    from ui.receipt_upload import create_receipt_upload_tab
+    from ui.bulk_import import create_bulk_import_tab
+    from ui.export import create_export_tab
+    from ui.chatbot import create_chatbot_tab
+
+    registry = registry or ServiceRegistry(StartupTimer(PROCESS_START))
+    timer = registry.timer
+    timer.mark("imports")
+
     print("=" * 60)
     print("🚀 Initializing PocketPilot AI...")
     print("=" * 60)
 
-    firebase_manager = FirebaseManager()
-    doc_ai_processor = DocumentAIProcessor()
-    gemini_manager = GeminiManager()
+    with timer.phase("config"):
+        Settings.validate()
+
+    (
+        receipt_store,
+        receipt_jobs,
+        gemini_manager,
+        receipt_mirror
+    ) = register_services(registry)
+    registry.start()
 
-    print("✅ All services initialized")
+    print("✅ Services initializing in the background")
     print("=" * 60)
 
+    ui_start = time.perf_counter()
+
     with gr.Blocks(
         title="PocketPilot AI",
         css=CUSTOM_CSS
@@ -144,44 +272,72 @@ def create_app():
                     summary_display,
                     category_chart,
                     merchant_chart,
-                    time_chart
-                ) = create_dashboard_tab(firebase_manager)
+                    time_chart,
+                    page_info,
+                    table_page_number,
+                    dashboard_inputs
+                ) = create_dashboard_tab(receipt_store, receipt_mirror)
 
             with gr.Tab("Upload Receipt (Demo)"):
-                upload_event = create_receipt_upload_tab(
-                    firebase_manager,
-                    doc_ai_processor
-                )
+                saved_receipts = create_receipt_upload_tab(receipt_jobs)
+
+            with gr.Tab("📥 Import"):
+                imported_receipts = create_bulk_import_tab(receipt_store)
+
+            with gr.Tab("📤 Export"):
+                create_export_tab(receipt_store)
 
             with gr.Tab("💬 Pilot"):
                 create_chatbot_tab(
                     gemini_manager,
-                    firebase_manager
+                    receipt_store
                 )
 
         # Initial dashboard load
         app.load(
             fn=load_dashboard,
+            inputs=dashboard_inputs,
             outputs=[
                 receipts_table,
                 status_msg,
                 summary_display,
                 category_chart,
                 merchant_chart,
-                time_chart
+                time_chart,
+                page_info,
+                table_page_number
             ]
         )
 
-        # Auto-refresh dashboard after receipt upload
-        upload_event.then(
+        # Auto-refresh dashboard when background uploads are saved
+        saved_receipts.change(
             fn=load_dashboard,
+            inputs=dashboard_inputs,
             outputs=[
                 receipts_table,
                 status_msg,
                 summary_display,
                 category_chart,
                 merchant_chart,
-                time_chart
+                time_chart,
+                page_info,
+                table_page_number
+            ]
+        )
+
+        # ...and when a bulk import finishes
+        imported_receipts.change(
+            fn=load_dashboard,
+            inputs=dashboard_inputs,
+            outputs=[
+                receipts_table,
+                status_msg,
+                summary_display,
+                category_chart,
+                merchant_chart,
+                time_chart,
+                page_info,
+                table_page_number
             ]
         )
 
@@ -190,12 +346,62 @@ def create_app():
         **PocketPilot AI by Team CyberForge** | *Powered by Gemini AI • Google Firebase and Demo Document AI*
         """)
 
+    timer.record("ui", time.perf_counter() - ui_start)
+    app.registry = registry
     return app
 
-if __name__ == "__main__":
-    create_app().launch(
-        server_name=Settings.APP_HOST,
-        server_port=7861,
+
+def create_server(app, registry: ServiceRegistry):
+    """
+    FastAPI server with the Gradio app at / and health endpoints
+
+    /health        liveness: 200 as soon as the server is listening
+    /health/ready  readiness: 200 once every service is ready, else 503
+    Both report per-service state and startup timings.
+    /metrics       Prometheus text format (see services.metrics)
+    """
+
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse, Response
+    from services.metrics import CONTENT_TYPE, REGISTRY
+
+    server = FastAPI()
+
+    @server.get("/health")
+    def health():
+        return registry.status()
+
+    @server.get("/health/ready")
+    def ready():
+        return JSONResponse(
+            registry.status(),
+            status_code=200 if registry.ready else 503
+        )
+
+    @server.get("/metrics")
+    def metrics():
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    server.router.on_startup.append(
+        lambda: registry.timer.mark("time_to_listening")
+    )
+
+    return gr.mount_gradio_app(
+        server,
+        app,
+        path="/",
+        auth=Settings.app_users() or None,
         show_error=True,
         theme=gr.themes.Base()
     )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    app = create_app()
+    uvicorn.run(
+        create_server(app, app.registry),
+        host=Settings.APP_HOST,
+        port=7861
+    )
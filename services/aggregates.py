@@ -0,0 +1,285 @@
+"""
+Spending Aggregates
+In-memory per-category, per-merchant and per-day totals
+maintained incrementally as receipts are saved or deleted
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from services.receipt_frame import receipt_days
+
+
+def receipt_fields(receipt: Dict) -> Optional[Tuple[str, str, str, float]]:
+    """
+    Extract (date, category, merchant, amount) from a raw receipt
+    Mirrors normalize_receipts: date comes from created_at and
+    receipts with a non-positive amount are ignored.
+    """
+
+    try:
+        amount = float(receipt.get("total_amount", 0))
+    except (TypeError, ValueError):
+        return None
+
+    if amount <= 0:
+        return None
+
+    created_at = receipt.get("created_at")
+    if isinstance(created_at, datetime):
+        date_val = created_at.strftime("%Y-%m-%d")
+    elif created_at:
+        # created_at comes as string "YYYY-MM-DD HH:MM:SS"
+        date_val = str(created_at).split(" ")[0]
+    else:
+        date_val = datetime.now().strftime("%Y-%m-%d")
+
+    return (
+        date_val,
+        receipt.get("category", ""),
+        receipt.get("merchant_name", ""),
+        amount
+    )
+
+
+# Rollup dimensions materialized by the storage backends
+ROLLUP_DIMENSIONS = ("day", "month", "category", "merchant")
+
+
+def rollup_keys(receipt: Dict) -> Optional[Tuple[float, Dict[str, str]]]:
+    """
+    Get (amount, {dimension: key}) for the rollups a receipt counts in
+    None for receipts the aggregates ignore (see receipt_fields).
+    """
+
+    fields = receipt_fields(receipt)
+    if fields is None:
+        return None
+
+    date_val, category, merchant, amount = fields
+    return amount, {
+        "day": date_val,
+        "month": date_val[:7],
+        "category": category or "",
+        "merchant": merchant or ""
+    }
+
+
+def rollup_totals(receipts: Iterable[Dict]) -> Dict[str, Dict[str, list]]:
+    """
+    Compute {dimension: {key: [total, count]}} for every rollup
+    Used to backfill rollups for receipts saved before they existed.
+    """
+
+    totals = {dim: {} for dim in ROLLUP_DIMENSIONS}
+
+    for receipt in receipts:
+        keys = rollup_keys(receipt)
+        if keys is None:
+            continue
+
+        amount, dims = keys
+        for dim, key in dims.items():
+            bucket = totals[dim].setdefault(key, [0.0, 0])
+            bucket[0] += amount
+            bucket[1] += 1
+
+    return totals
+
+
+def totals_frame(totals: Dict[str, Tuple[float, int]], column: str) -> pd.DataFrame:
+    """
+    {key: (total_amount, count)} as a two-column chart DataFrame
+    Dates are sorted by date, everything else by amount.
+    """
+
+    df = pd.DataFrame(
+        [(key, amount) for key, (amount, _) in totals.items()],
+        columns=[column, "amount"]
+    )
+
+    if column in ("date", "month"):
+        return df.sort_values(column, ignore_index=True)
+
+    return df.sort_values("amount", ascending=False, ignore_index=True)
+
+
+class SpendingAggregates:
+    """
+    Running totals and counts keyed by category, merchant and day
+
+    Every receipt is tracked by its document ID so that saving the
+    same receipt twice or deleting an unknown one is harmless.
+    upsert() and discard() are O(1).
+    """
+
+    DIMENSIONS = ("category", "merchant", "date")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[str, str, str, float]] = {}
+        self._totals: Dict[str, Dict[str, list]] = {
+            dim: {} for dim in self.DIMENSIONS
+        }
+        self._total_spent = 0.0
+        self.version = 0
+
+    def load(self, receipts: Iterable[Dict]):
+        """
+        Rebuild all totals from an iterable of raw receipts
+        The iterable is consumed lazily, so a paginated reader keeps
+        memory bounded; current totals stay readable until it finishes.
+        """
+
+        fresh = SpendingAggregates()
+        for receipt in receipts:
+            receipt_id = receipt.get("id")
+            if receipt_id:
+                fresh._upsert(receipt_id, receipt)
+
+        with self._lock:
+            self._entries = fresh._entries
+            self._totals = fresh._totals
+            self._total_spent = fresh._total_spent
+            self.version += 1
+
+    def load_frame(self, frame: pd.DataFrame):
+        """
+        Rebuild all totals from a receipt frame (see receipt_frame)
+        Totals come from one vectorized group-by per dimension.
+        """
+
+        frame = frame[(frame["total_amount"] > 0) & (frame["id"] != "")]
+        frame = frame.drop_duplicates("id", keep="first")
+
+        columns = {
+            "category": frame["category"].astype(str),
+            "merchant": frame["merchant_name"].astype(str),
+            "date": receipt_days(frame)
+        }
+        amounts = frame["total_amount"]
+
+        totals = {}
+        for dim, keys in columns.items():
+            grouped = amounts.groupby(keys.to_numpy(), sort=False).agg(
+                ["sum", "count"]
+            )
+            totals[dim] = {
+                key: [float(total), int(count)]
+                for key, total, count in zip(
+                    grouped.index, grouped["sum"], grouped["count"]
+                )
+            }
+
+        # Plain Python values, as upsert() stores them
+        entries = dict(zip(
+            frame["id"].tolist(),
+            zip(
+                columns["date"].tolist(),
+                columns["category"].tolist(),
+                columns["merchant"].tolist(),
+                amounts.astype(float).tolist()
+            )
+        ))
+
+        with self._lock:
+            self._entries = entries
+            self._totals = totals
+            self._total_spent = float(amounts.sum())
+            self.version += 1
+
+    def upsert(self, receipt_id: str, receipt: Dict):
+        """
+        Add a receipt, replacing any previous version with the same ID
+        """
+
+        with self._lock:
+            self._upsert(receipt_id, receipt)
+            self.version += 1
+
+    def discard(self, receipt_id: str):
+        """
+        Remove a receipt if it is being tracked
+        """
+
+        with self._lock:
+            self._remove(receipt_id)
+            self.version += 1
+
+    def _upsert(self, receipt_id: str, receipt: Dict):
+        self._remove(receipt_id)
+
+        fields = receipt_fields(receipt)
+        if fields is None:
+            return
+
+        self._entries[receipt_id] = fields
+        date_val, category, merchant, amount = fields
+        self._total_spent += amount
+
+        for dim, key in zip(self.DIMENSIONS, (category, merchant, date_val)):
+            bucket = self._totals[dim].setdefault(key, [0.0, 0])
+            bucket[0] += amount
+            bucket[1] += 1
+
+    def _remove(self, receipt_id: str):
+        fields = self._entries.pop(receipt_id, None)
+        if fields is None:
+            return
+
+        date_val, category, merchant, amount = fields
+        self._total_spent -= amount
+
+        for dim, key in zip(self.DIMENSIONS, (category, merchant, date_val)):
+            bucket = self._totals[dim][key]
+            bucket[0] -= amount
+            bucket[1] -= 1
+            if bucket[1] <= 0:
+                del self._totals[dim][key]
+
+        if not self._entries:
+            self._total_spent = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def totals(self, dimension: str) -> Dict[str, Tuple[float, int]]:
+        """
+        Get {key: (total_amount, count)} for one dimension
+        """
+
+        with self._lock:
+            return {
+                key: (bucket[0], bucket[1])
+                for key, bucket in self._totals[dimension].items()
+            }
+
+    def summary(self) -> Dict:
+        """
+        Spending summary in the same shape as calculate_spending_summary
+        """
+
+        with self._lock:
+            count = len(self._entries)
+            return {
+                "total_spent": self._total_spent,
+                "total_receipts": count,
+                "average_transaction": (
+                    self._total_spent / count if count else 0
+                ),
+                "categories": {
+                    key: bucket[0]
+                    for key, bucket in self._totals["category"].items()
+                }
+            }
+
+    def to_frame(self, dimension: str) -> pd.DataFrame:
+        """
+        Totals for one dimension as a two-column chart DataFrame
+        Categories and merchants are sorted by amount, dates by date.
+        """
+
+        return totals_frame(self.totals(dimension), dimension)
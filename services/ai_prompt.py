@@ -0,0 +1,69 @@
+"""
+Prompt Builder for Pilot
+Wraps the financial summary and user question in a prompt that
+never exceeds a hard token budget
+"""
+
+import math
+
+DEFAULT_MAX_PROMPT_TOKENS = 1000
+
+# Rough heuristic for English text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+SYSTEM_INSTRUCTIONS = (
+    "You are Pilot, a helpful personal finance assistant.\n"
+    "Answer clearly and simply.\n"
+)
+
+SUMMARY_INSTRUCTIONS = (
+    "Use the user's financial summary below when it is relevant. "
+    "Do not invent numbers that are not in it.\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count of a piece of text
+    """
+
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _render(summary_lines, question: str) -> str:
+    parts = [SYSTEM_INSTRUCTIONS]
+
+    if summary_lines:
+        parts.append(SUMMARY_INSTRUCTIONS)
+        parts.append("\nFinancial summary:\n" + "\n".join(summary_lines) + "\n")
+
+    parts.append(f"\nUser question: {question}")
+    return "".join(parts)
+
+
+def build_prompt(
+    summary: str,
+    question: str,
+    max_tokens: int = DEFAULT_MAX_PROMPT_TOKENS
+) -> str:
+    """
+    Build the Pilot prompt within max_tokens
+
+    Summary lines are dropped from the end (least important first)
+    until the prompt fits; an oversized question is truncated last.
+    """
+
+    summary_lines = [line for line in (summary or "").splitlines() if line]
+    question = question.strip()
+
+    while summary_lines and estimate_tokens(_render(summary_lines, question)) > max_tokens:
+        summary_lines.pop()
+
+    prompt = _render(summary_lines, question)
+    overflow = len(prompt) - max_tokens * CHARS_PER_TOKEN
+
+    if overflow > 0:
+        question = question[:max(0, len(question) - overflow)]
+        prompt = _render(summary_lines, question)
+
+    return prompt
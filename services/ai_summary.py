@@ -0,0 +1,227 @@
+"""
+Financial Summary for Pilot
+Condenses spending data into a short, fixed-size text block
+Size depends on the top-N limits below, never on receipt count
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from services.analytics_metrics import compute_month_over_month_change
+from services.storage import ReceiptStore
+from utils.helpers import format_currency
+
+MAX_CATEGORIES = 5
+MAX_MERCHANTS = 5
+MAX_MONTHS = 6
+
+
+def _pairs(data) -> List[Tuple[str, float]]:
+    """
+    Accept a dict, Series, two-column DataFrame or list of pairs
+    and return [(label, amount), ...]
+    """
+
+    if data is None:
+        return []
+
+    if isinstance(data, pd.DataFrame):
+        if data.empty:
+            return []
+        label_col = data.columns[0]
+        value_col = "amount" if "amount" in data.columns else data.columns[-1]
+        return list(zip(data[label_col].astype(str), data[value_col].astype(float)))
+
+    if isinstance(data, pd.Series):
+        return [(str(k), float(v)) for k, v in data.items()]
+
+    if isinstance(data, dict):
+        return [(str(k), float(v)) for k, v in data.items()]
+
+    return [(str(k), float(v)) for k, v in data]
+
+
+def _top(data, limit: int) -> List[Tuple[str, float]]:
+    return sorted(_pairs(data), key=lambda kv: kv[1], reverse=True)[:limit]
+
+
+def _share_list(items: List[Tuple[str, float]], total: float) -> str:
+    parts = []
+    for label, amount in items:
+        share = f" ({amount / total:.0%})" if total else ""
+        parts.append(f"{label} {format_currency(amount)}{share}")
+    return ", ".join(parts)
+
+
+def build_financial_summary(
+    basic: Dict,
+    category,
+    monthly,
+    mom: Optional[float],
+    merchants=None
+) -> str:
+    """
+    Build the financial summary text used as Pilot context
+
+    basic:     totals as returned by compute_basic_metrics
+               (total_expense, total_income, net_savings,
+               expense_count or transaction_count, average_expense)
+    category:  spending per category
+    monthly:   spending per month ("YYYY-MM" labels)
+    mom:       month-over-month spending change in percent, or None
+    merchants: optional spending per merchant
+
+    Lines are ordered most important first so build_prompt can
+    trim from the end when the token budget is tight.
+    """
+
+    basic = basic or {}
+    count = int(
+        basic.get("expense_count", basic.get("transaction_count", 0)) or 0
+    )
+
+    if not count:
+        return "No transactions recorded yet."
+
+    total_expense = float(basic.get("total_expense", 0) or 0)
+    lines = [
+        f"Total spent: {format_currency(total_expense)} across {count} "
+        f"transaction(s), average "
+        f"{format_currency(float(basic.get('average_expense', 0) or 0))}"
+    ]
+
+    if basic.get("total_income"):
+        lines.append(
+            f"Total income: {format_currency(float(basic['total_income']))}, "
+            f"net savings: "
+            f"{format_currency(float(basic.get('net_savings', 0) or 0))}"
+        )
+
+    if mom is not None and not pd.isna(mom):
+        lines.append(
+            f"Month-over-month spending change: {float(mom):+.1f}% "
+            f"(latest month vs previous)"
+        )
+
+    top_categories = _top(category, MAX_CATEGORIES)
+    if top_categories:
+        lines.append(
+            f"Top categories: {_share_list(top_categories, total_expense)}"
+        )
+
+    top_merchants = _top(merchants, MAX_MERCHANTS)
+    if top_merchants:
+        lines.append(
+            f"Top merchants: {_share_list(top_merchants, total_expense)}"
+        )
+
+    months = sorted(_pairs(monthly))[-MAX_MONTHS:]
+    if months:
+        trend = ", ".join(
+            f"{month} {format_currency(amount)}" for month, amount in months
+        )
+        lines.append(f"Monthly spending (last {len(months)}): {trend}")
+
+    return "\n".join(lines)
+
+
+def recent_months(monthly: Dict[str, float]) -> pd.Series:
+    """
+    Spending for the last MAX_MONTHS calendar months up to the latest
+    month with any, oldest first
+    Months without spending are 0, as in compute_monthly_totals, so
+    the month-over-month change compares adjacent calendar months.
+    """
+
+    if not monthly:
+        return pd.Series(dtype=float)
+
+    last = pd.Period(max(monthly), freq="M")
+    first = max(pd.Period(min(monthly), freq="M"), last - (MAX_MONTHS - 1))
+    labels = [str(month) for month in pd.period_range(first, last, freq="M")]
+
+    return pd.Series([monthly.get(label, 0.0) for label in labels], index=labels)
+
+
+def summarize_store(store: ReceiptStore) -> str:
+    """
+    Financial summary from the store's totals and rollups
+    No receipt is read: one server-side total plus the category,
+    merchant and month rollups.
+    """
+
+    def amounts(dimension: str) -> Dict[str, float]:
+        return {
+            key: amount
+            for key, (amount, _) in store.get_rollup(dimension).items()
+        }
+
+    totals = store.get_spending_totals()
+    monthly = recent_months(amounts("month"))
+
+    basic = {
+        "total_expense": totals["total_spent"],
+        "transaction_count": totals["total_receipts"],
+        "average_expense": totals["average_transaction"]
+    }
+
+    return build_financial_summary(
+        basic,
+        amounts("category"),
+        monthly,
+        compute_month_over_month_change(monthly),
+        merchants=amounts("merchant")
+    )
+
+
+def summary_version(summary: str) -> str:
+    """
+    Version stamp for cached answers: changes whenever the summary does
+    """
+
+    return hashlib.blake2b(summary.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SummaryCache:
+    """
+    Each user's summary and its version, reused between Pilot messages
+
+    An entry is rebuilt once its store has saved or deleted a receipt
+    (write_count moved) or after ttl_seconds, which bounds how long
+    writes made by other instances go unseen. A hit reads nothing.
+    """
+
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, store: ReceiptStore) -> Tuple[str, str]:
+        """
+        (summary, version) for store's user
+        """
+
+        now = time.time()
+        writes = store.write_count
+
+        with self._lock:
+            entry = self._entries.get(store.user_id)
+
+        if (
+            entry is not None
+            and entry[0] == writes
+            and now - entry[1] <= self.ttl_seconds
+        ):
+            return entry[2], entry[3]
+
+        summary = summarize_store(store)
+        version = summary_version(summary)
+
+        with self._lock:
+            self._entries[store.user_id] = (writes, now, summary, version)
+
+        return summary, version
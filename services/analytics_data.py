@@ -0,0 +1,90 @@
+"""
+Analytics Data Loader
+Builds the transactions DataFrame used by services.analytics_metrics
+
+Schema (same as expenses.csv):
+    date      datetime64[ns]
+    type      category ("expense" / "income")
+    amount    float64
+    category  category
+    merchant  category
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.storage import ReceiptStore
+
+TRANSACTION_COLUMNS = ["date", "type", "amount", "category", "merchant"]
+
+
+def normalize_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce a raw transactions frame to the analytics schema
+    Rows with an unparseable date or amount are dropped.
+    """
+
+    df = df.reindex(columns=TRANSACTION_COLUMNS)
+
+    out = pd.DataFrame({
+        "date": pd.to_datetime(df["date"], errors="coerce"),
+        "type": df["type"].fillna("expense").astype(str).str.lower(),
+        "amount": pd.to_numeric(df["amount"], errors="coerce"),
+        "category": df["category"].fillna("Other").astype(str),
+        "merchant": df["merchant"].fillna("").astype(str),
+    })
+
+    out = out[out["date"].notna() & out["amount"].notna()]
+
+    for col in ("type", "category", "merchant"):
+        out[col] = out[col].astype("category")
+    out["amount"] = out["amount"].astype(np.float64)
+
+    return out.reset_index(drop=True)
+
+
+def transactions_from_receipts(receipts: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Map stored receipts (all expenses) to the transactions schema
+    The transaction date is the receipt's created_at, as on the dashboard.
+    """
+
+    raw = pd.DataFrame(
+        list(receipts),
+        columns=["created_at", "total_amount", "category", "merchant_name"]
+    )
+
+    return normalize_transactions(pd.DataFrame({
+        "date": pd.to_datetime(raw["created_at"], utc=True).dt.tz_localize(None),
+        "type": "expense",
+        "amount": raw["total_amount"],
+        "category": raw["category"],
+        "merchant": raw["merchant_name"],
+    }))
+
+
+def load_transactions_csv(path: str) -> pd.DataFrame:
+    """
+    Load a transactions export such as expenses.csv
+    """
+
+    return normalize_transactions(pd.read_csv(path))
+
+
+def get_transactions_df(
+    user_id: str,
+    store: Optional[ReceiptStore] = None
+) -> pd.DataFrame:
+    """
+    Transactions DataFrame for a user
+    Only that user's receipts are streamed, page by page, from the
+    configured store.
+    """
+
+    if store is None:
+        from services.storage import create_receipt_store
+        store = create_receipt_store()
+
+    return transactions_from_receipts(store.for_user(user_id).iter_receipts())
@@ -0,0 +1,235 @@
+"""
+Bulk Export
+Streams a user's receipts out of the store into CSV or Parquet,
+one page at a time, optionally limited to a date range and to
+some categories
+
+Columns follow the expenses.csv schema (so an export can be read
+back by bulk_import) plus the receipt currency:
+
+    id, date, type, amount, category, merchant, notes, currency
+
+id is the source transaction ID for imported receipts and the
+receipt ID otherwise, so importing an export into the store it came
+from adds nothing.
+
+Only one page of receipts is held in memory at a time: CSV pages are
+appended to the file, Parquet pages are written as row groups.
+
+Usage:
+    python -m services.bulk_export receipts.csv [--user alice]
+        [--start 2026-01-01] [--end 2026-01-31] [--category Dining]
+    (use "-" to write CSV to stdout, e.g. to pipe into a loader)
+"""
+
+import argparse
+import contextlib
+import sys
+from datetime import datetime, timedelta
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from services.date_range import parse_date
+from services.metrics import track
+from services.storage import ReceiptStore
+
+EXPORT_COLUMNS = [
+    "id", "date", "type", "amount", "category", "merchant", "notes", "currency"
+]
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Bounds for an open-ended range (four-digit years keep the SQLite
+# store's text timestamps in order)
+EARLIEST = datetime(1900, 1, 1)
+LATEST = datetime(9999, 12, 31)
+
+
+def export_window(
+    start_date: str = "",
+    end_date: str = ""
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    [start, end) bounds for optional "YYYY-MM-DD" dates, both inclusive
+    None when neither is given; a missing side is left open.
+    """
+
+    start_date, end_date = (start_date or "").strip(), (end_date or "").strip()
+    if not start_date and not end_date:
+        return None
+
+    start = parse_date(start_date, "Start date") if start_date else EARLIEST
+    end = (
+        parse_date(end_date, "End date") + timedelta(days=1) if end_date
+        else LATEST
+    )
+    if end <= start:
+        raise ValueError("End date must not be before the start date")
+    return start, end
+
+
+def export_frame(receipts: List[dict]) -> pd.DataFrame:
+    """
+    One page of receipts in the export columns
+    date is the receipt date shown on the dashboard (from created_at).
+    """
+
+    created_at = pd.to_datetime(
+        [r.get("created_at") for r in receipts], utc=True, format="mixed"
+    )
+
+    return pd.DataFrame({
+        "id": [str(r.get("source_id") or r.get("id", "")) for r in receipts],
+        "date": created_at.strftime("%Y-%m-%d"),
+        "type": "expense",
+        "amount": pd.to_numeric(
+            [r.get("total_amount") for r in receipts], errors="coerce"
+        ),
+        "category": [r.get("category") or "" for r in receipts],
+        "merchant": [r.get("merchant_name") or "" for r in receipts],
+        "notes": [r.get("notes") or "" for r in receipts],
+        "currency": [r.get("currency") or "" for r in receipts]
+    }, columns=EXPORT_COLUMNS)
+
+
+def iter_export_pages(
+    store: ReceiptStore,
+    window: Optional[Tuple[datetime, datetime]] = None,
+    categories: Optional[Iterable[str]] = None,
+    page_size: int = ReceiptStore.PAGE_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the store's receipts as export frames of up to page_size rows
+    The window and categories are answered by the store's range query,
+    so only receipts inside them are read. Newest receipts come first.
+    """
+
+    categories = list(categories or ())
+
+    if window is None and not categories:
+        receipts = store.iter_receipts(page_size)
+    else:
+        receipts = store.iter_receipts_between(
+            *(window or (EARLIEST, LATEST)),
+            page_size=page_size,
+            categories=categories
+        )
+
+    page = []
+
+    for receipt in receipts:
+        page.append(receipt)
+        if len(page) == page_size:
+            yield export_frame(page)
+            page = []
+
+    if page:
+        yield export_frame(page)
+
+
+def iter_csv(pages: Iterable[pd.DataFrame]) -> Iterator[str]:
+    """
+    CSV text for a stream of export frames: the header, then one
+    block of rows per page
+    """
+
+    yield ",".join(EXPORT_COLUMNS) + "\n"
+    for page in pages:
+        yield page.to_csv(index=False, header=False)
+
+
+def write_export(
+    pages: Iterable[pd.DataFrame],
+    target: Union[str, IO[str]],
+    fmt: str = "csv"
+) -> int:
+    """
+    Write export frames to a path (or, for CSV, an open text file)
+    Returns the number of rows written.
+    """
+
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    rows = 0
+
+    def counted(pages):
+        nonlocal rows
+        for page in pages:
+            rows += len(page)
+            yield page
+
+    with track("export", fmt):
+        if fmt == "parquet":
+            _write_parquet(counted(pages), target)
+        elif isinstance(target, str):
+            with open(target, "w", encoding="utf-8", newline="") as handle:
+                handle.writelines(iter_csv(counted(pages)))
+        else:
+            target.writelines(iter_csv(counted(pages)))
+
+    return rows
+
+
+def _write_parquet(pages: Iterable[pd.DataFrame], path: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (column, pa.float64() if column == "amount" else pa.string())
+        for column in EXPORT_COLUMNS
+    ])
+
+    # Each page becomes a row group; an empty export still gets a schema
+    with pq.ParquetWriter(path, schema) as writer:
+        for page in pages:
+            writer.write_table(
+                pa.Table.from_pandas(page, schema=schema, preserve_index=False)
+            )
+
+
+def export_format(path: str) -> str:
+    """
+    Export format for a file name ("-" and unknown extensions are CSV)
+    """
+
+    return "parquet" if path.lower().endswith(".parquet") else "csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("path", help='output .csv / .parquet file, or "-"')
+    parser.add_argument(
+        "--user", default=None,
+        help="user to export (default: the default user)"
+    )
+    parser.add_argument("--start", default="", help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", default="", help="last date, YYYY-MM-DD")
+    parser.add_argument(
+        "--category", action="append", default=[],
+        help="only this category (repeat for several)"
+    )
+    args = parser.parse_args()
+
+    from services.storage import create_receipt_store
+
+    # Keep startup messages out of CSV written to stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        store = create_receipt_store().for_user(args.user)
+    pages = iter_export_pages(
+        store, export_window(args.start, args.end), args.category
+    )
+
+    if args.path == "-":
+        rows = write_export(pages, sys.stdout)
+        print(f"✓ Exported {rows} receipt(s)", file=sys.stderr)
+        return
+
+    rows = write_export(pages, args.path, export_format(args.path))
+    print(f"✓ Exported {rows} receipt(s) to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Bulk Import
+Streams transaction files (CSV or Parquet with the expenses.csv
+schema) into the receipt store one chunk at a time
+
+    id        source transaction ID, used to skip duplicates
+    date      transaction date (becomes the receipt's created_at)
+    type      "expense" / "income" (also "debit" / "credit")
+    amount    positive amount; "1,234.50" and "₹120" are accepted
+    category  optional, defaults to "Other"
+    merchant  optional
+    notes     optional
+
+Each chunk is validated and normalized column-wise and written with
+the store's batched import, so memory stays bounded by the chunk
+size however large the file is. Receipts are spending only: income
+rows are counted and skipped, and so never reach the aggregates.
+
+Usage:
+    python -m services.bulk_import expenses.csv [--user alice]
+"""
+
+import argparse
+import hashlib
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Settings
+from services.metrics import track
+from services.storage import ReceiptStore
+
+IMPORT_COLUMNS = ["id", "date", "type", "amount", "category", "merchant", "notes"]
+REQUIRED_COLUMNS = ["id", "date", "amount"]
+
+# Transaction types accepted in the "type" column
+EXPENSE_TYPES = ("expense", "debit", "")
+INCOME_TYPES = ("income", "credit")
+
+DEFAULT_CURRENCY = "INR"
+
+
+class ImportReport:
+    """
+    Running counts for one import, updated after every chunk
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.rows = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.income = 0
+        self.invalid = 0
+        # Share of the file read so far, 0.0 to 1.0
+        self.progress = 0.0
+
+    def describe(self) -> str:
+        return (
+            f"{self.file_name}: {self.rows} row(s) read ({self.progress:.0%}), "
+            f"{self.imported} imported, {self.duplicates} duplicate(s), "
+            f"{self.income} income row(s) skipped, {self.invalid} invalid"
+        )
+
+
+def import_receipt_id(user_id: str, source_id: str) -> str:
+    """
+    Stable receipt ID for an imported row
+    The same row always maps to the same receipt, per user, so
+    re-importing a file (or overlapping exports) adds nothing twice.
+    """
+
+    digest = hashlib.blake2b(
+        f"{user_id}/{source_id}".encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return f"import-{digest}"
+
+
+def read_chunks(
+    path: str,
+    chunk_size: int
+) -> Iterator[Tuple[pd.DataFrame, float]]:
+    """
+    Stream a CSV or Parquet file as (chunk, share of the file read)
+    CSV columns are read as text; parsing happens in normalize_chunk.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        columns = [c for c in IMPORT_COLUMNS if c in parquet.schema_arrow.names]
+        total = parquet.metadata.num_rows or 1
+        done = 0
+
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+        return
+
+    if extension != ".csv":
+        raise ValueError(f"Unsupported file type: {extension or path}")
+
+    size = os.path.getsize(path) or 1
+    with open(path, "rb") as handle:
+        reader = pd.read_csv(
+            handle,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=chunk_size,
+            usecols=lambda column: column.strip().lower() in IMPORT_COLUMNS
+        )
+        for chunk in reader:
+            # The reader buffers ahead, so this is an estimate
+            yield chunk, min(handle.tell() / size, 1.0)
+
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    # ISO dates take the fast fixed-format path; anything else
+    # (e.g. "31/01/2026") is parsed value by value
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values
+    else:
+        text = values.astype(str).str.strip()
+        dates = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+        retry = dates.isna() & (text != "")
+        if retry.any():
+            dates[retry] = pd.to_datetime(
+                text[retry], format="mixed", dayfirst=True, errors="coerce"
+            )
+
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+    return dates
+
+
+def _parse_amounts(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(np.float64)
+
+    # Drop currency symbols and thousands separators
+    text = values.astype(str).str.replace(r"[^0-9.\-]", "", regex=True)
+    return pd.to_numeric(text, errors="coerce").astype(np.float64)
+
+
+def _text(frame: pd.DataFrame, column: str, default: str = "") -> pd.Series:
+    if column not in frame:
+        return pd.Series(default, index=frame.index)
+    values = frame[column].fillna("").astype(str).str.strip()
+    return values.mask(values == "", default)
+
+
+def normalize_chunk(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Validate and normalize one chunk, all column-wise
+    Returns (expenses, income rows, invalid rows). Rows are invalid
+    without an ID, with an unparseable date, a non-positive amount
+    or an unknown type. Duplicate IDs within the chunk keep the first.
+    """
+
+    chunk = chunk.rename(columns=lambda column: column.strip().lower())
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    rows = pd.DataFrame({
+        "id": _text(chunk, "id"),
+        "date": _parse_dates(chunk["date"]),
+        "type": _text(chunk, "type").str.lower(),
+        "amount": _parse_amounts(chunk["amount"]),
+        "category": _text(chunk, "category", "Other"),
+        "merchant": _text(chunk, "merchant"),
+        "notes": _text(chunk, "notes")
+    })
+
+    is_expense = rows["type"].isin(EXPENSE_TYPES)
+    is_income = rows["type"].isin(INCOME_TYPES)
+    valid = (
+        (rows["id"] != "")
+        & rows["date"].notna()
+        & (rows["amount"] > 0)
+        & (is_expense | is_income)
+    )
+
+    income = int((valid & is_income).sum())
+    expenses = rows[valid & is_expense].drop_duplicates("id", keep="first")
+
+    return expenses, income, int((~valid).sum())
+
+
+def chunk_receipts(expenses: pd.DataFrame, user_id: str) -> List[dict]:
+    """
+    Receipts for normalized expense rows, in the shape the store saves
+    """
+
+    now = datetime.now()
+    created = pd.DatetimeIndex(expenses["date"]).to_pydatetime()
+    days = expenses["date"].dt.strftime("%Y-%m-%d").tolist()
+
+    return [
+        {
+            "id": import_receipt_id(user_id, source_id),
+            "source_id": source_id,
+            "merchant_name": merchant,
+            "category": category,
+            "total_amount": amount,
+            "currency": DEFAULT_CURRENCY,
+            "transaction_date": day,
+            "notes": notes,
+            "source": "import",
+            "created_at": created_at,
+            "updated_at": now
+        }
+        for source_id, merchant, category, amount, day, notes, created_at in zip(
+            expenses["id"].tolist(),
+            expenses["merchant"].tolist(),
+            expenses["category"].tolist(),
+            expenses["amount"].tolist(),
+            days,
+            expenses["notes"].tolist(),
+            created
+        )
+    ]
+
+
+def import_file(
+    path: str,
+    store: ReceiptStore,
+    chunk_size: Optional[int] = None
+) -> Iterator[ImportReport]:
+    """
+    Import a transactions file into store (already scoped to a user)
+    Yields the running report after every chunk. Rows already imported,
+    in this file or an earlier one, are counted as duplicates.
+    """
+
+    chunk_size = chunk_size or Settings.IMPORT_CHUNK_SIZE
+    report = ImportReport(os.path.basename(path))
+
+    for chunk, progress in read_chunks(path, chunk_size):
+        expenses, income, invalid = normalize_chunk(chunk)
+        receipts = chunk_receipts(expenses, store.user_id)
+        with track("import", "chunk"):
+            written = store.import_receipts(receipts) if receipts else []
+
+        report.rows += len(chunk)
+        report.income += income
+        report.invalid += invalid
+        report.imported += len(written)
+        report.duplicates += len(chunk) - income - invalid - len(written)
+        report.progress = progress
+
+        yield report
+
+    report.progress = 1.0
+
+
+def import_transactions(
+    path: str,
+    store: ReceiptStore,
+    chunk_size: Optional[int] = None
+) -> ImportReport:
+    """
+    Run import_file to completion and return the final report
+    """
+
+    report = ImportReport(os.path.basename(path))
+    for report in import_file(path, store, chunk_size):
+        pass
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("path", help="CSV or Parquet file to import")
+    parser.add_argument(
+        "--user", default=None,
+        help="user to import for (default: the default user)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help="rows per chunk (default: Settings.IMPORT_CHUNK_SIZE)"
+    )
+    args = parser.parse_args()
+
+    from services.storage import create_receipt_store
+
+    store = create_receipt_store().for_user(args.user)
+
+    report = ImportReport(os.path.basename(args.path))
+    for report in import_file(args.path, store, args.chunk_size):
+        print(f"⏳ {report.describe()}")
+
+    print(f"✓ {report.describe()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Chart Preparation
+Bounds the data sent to each dashboard plot: top-N categories and
+merchants with the rest folded into "Other", and spending over time
+binned by day, week, month or year to fit a fixed point budget
+"""
+
+import math
+
+import pandas as pd
+
+OTHER = "Other"
+
+# Coarser bins tried in order until a series fits its point budget
+TIME_BINS = ("D", "W-SUN", "M", "Y")
+
+
+def top_n_with_other(df: pd.DataFrame, column: str, n: int) -> pd.DataFrame:
+    """
+    Keep the n largest rows by amount and sum the rest into "Other"
+    At most n + 1 rows come back, sorted by amount. An existing
+    "Other" key is merged into the bucket rather than duplicated.
+    """
+
+    if df.empty:
+        return df
+
+    df = df.sort_values("amount", ascending=False, ignore_index=True)
+    top = df[df[column] != OTHER].head(n)
+
+    if len(top) == len(df):
+        return df
+
+    rest = df["amount"].drop(top.index).sum()
+    return pd.concat(
+        [top, pd.DataFrame({column: [OTHER], "amount": [rest]})],
+        ignore_index=True
+    ).sort_values("amount", ascending=False, ignore_index=True)
+
+
+def downsample_series(
+    df: pd.DataFrame,
+    max_points: int,
+    column: str = "date"
+) -> pd.DataFrame:
+    """
+    Sum a "YYYY-MM-DD" series into the finest of day / week / month /
+    year bins that gives at most max_points rows
+    Each bin is labelled with its first day. If even yearly bins are
+    too many, consecutive years are summed in equal runs.
+    """
+
+    if len(df) <= max_points:
+        return df
+
+    dates = pd.to_datetime(df[column], errors="coerce")
+    valid = dates.notna()
+    dates, amounts = dates[valid], df.loc[valid, "amount"]
+
+    for freq in TIME_BINS:
+        periods = dates.dt.to_period(freq)
+        binned = amounts.groupby(periods.to_numpy()).sum().sort_index()
+        if len(binned) <= max_points:
+            break
+
+    labels = [period.start_time.strftime("%Y-%m-%d") for period in binned.index]
+    result = pd.DataFrame({column: labels, "amount": binned.to_numpy()})
+
+    if len(result) > max_points:
+        run = math.ceil(len(result) / max_points)
+        runs = result.index // run
+        result = result.groupby(runs).agg({column: "first", "amount": "sum"})
+        result = result.reset_index(drop=True)
+
+    return result
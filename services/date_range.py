@@ -0,0 +1,81 @@
+"""
+Dashboard Date Ranges
+Preset and custom windows over the receipt date (created_at, as
+shown on the dashboard), resolved to [start, end) datetimes
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+ALL_TIME = "All time"
+THIS_WEEK = "This week"
+THIS_MONTH = "This month"
+LAST_90_DAYS = "Last 90 days"
+CUSTOM = "Custom range"
+
+WINDOW_PRESETS = [ALL_TIME, THIS_WEEK, THIS_MONTH, LAST_90_DAYS, CUSTOM]
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_date(value: str, label: str) -> datetime:
+    """
+    Parse a "YYYY-MM-DD" date typed into the dashboard
+    """
+
+    try:
+        return datetime.strptime(value.strip(), DATE_FORMAT)
+    except (AttributeError, ValueError):
+        raise ValueError(f"{label} must be a date like 2025-01-31")
+
+
+def resolve_window(
+    preset: str,
+    start_date: str = "",
+    end_date: str = "",
+    now: Optional[datetime] = None
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Get the (start, end) bounds for a preset, or None for all time
+    start is inclusive and end exclusive; both are midnight. Presets
+    run through today; a custom range includes its end date.
+    """
+
+    if not preset or preset == ALL_TIME:
+        return None
+
+    today = (now or datetime.now()).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    tomorrow = today + timedelta(days=1)
+
+    if preset == THIS_WEEK:
+        return today - timedelta(days=today.weekday()), tomorrow
+
+    if preset == THIS_MONTH:
+        return today.replace(day=1), tomorrow
+
+    if preset == LAST_90_DAYS:
+        return today - timedelta(days=89), tomorrow
+
+    if preset == CUSTOM:
+        start = parse_date(start_date, "Start date")
+        end = parse_date(end_date, "End date") + timedelta(days=1)
+        if end <= start:
+            raise ValueError("End date must not be before the start date")
+        return start, end
+
+    raise ValueError(f"Unknown date range: {preset}")
+
+
+def describe_window(window: Optional[Tuple[datetime, datetime]]) -> str:
+    """
+    Human-readable label for a resolved window
+    """
+
+    if window is None:
+        return ALL_TIME.lower()
+
+    start, end = window
+    last_day = end - timedelta(days=1)
+    return f"{start.strftime(DATE_FORMAT)} to {last_day.strftime(DATE_FORMAT)}"
@@ -10,6 +10,41 @@ so the app remains functional and educational.
 from typing import Dict
 import random
 
+from services.metrics import tracked
+
+# Demo output vocabulary (also used by the benchmark data generator)
+DEMO_MERCHANTS = [
+    "Amazon",
+    "Starbucks",
+    "Walmart",
+    "Zomato",
+    "Uber Eats",
+    "Swiggy",
+    "Flipkart",
+    "BigBasket",
+    "DMart",
+    "Reliance Fresh",
+    "Uber",
+    "Ola",
+    "Indian Oil",
+    "Apollo Pharmacy",
+    "BookMyShow",
+    "Netflix",
+    "Airtel",
+    "IRCTC"
+]
+
+DEMO_CATEGORIES = [
+    "Shopping",
+    "Dining",
+    "Groceries",
+    "Transportation",
+    "Utilities",
+    "Health",
+    "Entertainment",
+    "Travel"
+]
+
 
 class DocumentAIProcessor:
     """Mock Document AI processor"""
@@ -20,32 +55,18 @@ class DocumentAIProcessor:
             "(real API requires paid Google Cloud plan)"
         )
 
+    @tracked("document_ai", "extract")
     def process_receipt(self, file_path: str, mime_type: str) -> Dict:
         """
         Simulate receipt extraction
         """
 
-        merchants = [
-            "Amazon",
-            "Starbucks",
-            "Walmart",
-            "Zomato",
-            "Uber Eats"
-        ]
-
-        categories = [
-            "Shopping",
-            "Dining",
-            "Groceries",
-            "Transportation"
-        ]
-
         return {
-            "merchant_name": random.choice(merchants),
+            "merchant_name": random.choice(DEMO_MERCHANTS),
             "transaction_date": "2025-01-07",
             "total_amount": round(random.uniform(50, 1500), 2),
             "currency": "INR",
-            "category": random.choice(categories),
+            "category": random.choice(DEMO_CATEGORIES),
             "raw_text": "Demo receipt text extracted by mock Document AI",
             "confidence": 0.90
         }
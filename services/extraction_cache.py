@@ -0,0 +1,174 @@
+"""
+Extraction Cache
+Content-addressed cache of Document AI results, keyed on the SHA-256
+of the uploaded file's bytes, so re-uploads and retries of the same
+receipt skip extraction entirely
+Stored in SQLite on disk with a total-size bound and LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from services.metrics import EXTRACTION_CACHE_LOOKUPS
+
+# Bump when extraction output changes shape, to ignore old entries
+CACHE_VERSION = "1"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path: str) -> str:
+    """
+    SHA-256 of a file's bytes, read in chunks
+    """
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Size-bounded LRU cache of extraction results on disk
+
+    Each entry is the extracted receipt as JSON. When the stored
+    JSON exceeds max_bytes, least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_last_used "
+                "ON extractions (last_used)"
+            )
+
+    @staticmethod
+    def make_key(content_hash: str) -> str:
+        return f"{CACHE_VERSION}:{content_hash}"
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """
+        Cached extraction for a file hash, or None on a miss
+        """
+
+        key = self.make_key(content_hash)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                EXTRACTION_CACHE_LOOKUPS.labels(result="miss").inc()
+                return None
+
+            with self._db:
+                self._db.execute(
+                    "UPDATE extractions SET last_used = ? WHERE key = ?",
+                    (time.time(), key)
+                )
+
+            self.hits += 1
+            EXTRACTION_CACHE_LOOKUPS.labels(result="hit").inc()
+            return json.loads(row[0])
+
+    def set(self, content_hash: str, receipt_data: Dict):
+        """
+        Store an extraction, evicting LRU entries past max_bytes
+        """
+
+        data = json.dumps(receipt_data, default=str)
+        size = len(data.encode())
+
+        if size > self.max_bytes:
+            return
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+                (self.make_key(content_hash), data, size, time.time())
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM extractions"
+        ).fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM extractions ORDER BY last_used"
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+
+        self._db.executemany("DELETE FROM extractions WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM extractions")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+            ).fetchone()
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+class CachedDocumentAIProcessor:
+    """
+    Drop-in for DocumentAIProcessor that consults the cache first
+    Identical files (same bytes) are extracted once.
+    """
+
+    def __init__(self, processor, cache: ExtractionCache):
+        self.processor = processor
+        self.cache = cache
+
+    def process_receipt(self, file_path: str, mime_type: str) -> Dict:
+        content_hash = file_sha256(file_path)
+
+        cached = self.cache.get(content_hash)
+        if cached is not None:
+            return cached
+
+        receipt_data = self.processor.process_receipt(file_path, mime_type)
+        self.cache.set(content_hash, receipt_data)
+        return receipt_data
@@ -6,16 +6,40 @@ Handles Firestore operations
 
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core.exceptions import AlreadyExists
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import hashlib
 import json
+import time
 from config.settings import Settings
+from services.aggregates import ROLLUP_DIMENSIONS, rollup_totals
+from services.metrics import FIRESTORE_DOCUMENTS, track
+from services.storage import DEFAULT_USER_ID, TABLE_SORT_FIELDS, ReceiptStore
 
+# Rollup documents: one per (dimension, key) holding a total and a count
+ROLLUP_COLLECTION = "receipt_rollups"
 
-class FirebaseManager:
+# One-off data migrations record themselves here so they run only once
+MIGRATION_COLLECTION = "migrations"
+
+
+class FirebaseManager(ReceiptStore):
     """Manages Firebase Firestore operations"""
 
-    def __init__(self):
+    # Firestore rejects batched writes with more than 500 operations
+    MAX_BATCH_WRITES = 500
+
+    # Receipts per batch: each one also increments a rollup per dimension
+    MAX_BATCH_RECEIPTS = MAX_BATCH_WRITES // (1 + len(ROLLUP_DIMENSIONS))
+
+    # Values Firestore accepts in one "in" filter
+    MAX_IN_VALUES = 30
+
+    # Page cursors remembered per table sort before starting over
+    MAX_TABLE_CURSORS = 200
+
+    def __init__(self, user_id: str = DEFAULT_USER_ID):
         try:
             if not firebase_admin._apps:
                 # Load credentials from environment variable (Railway-safe)
@@ -32,46 +56,568 @@ class FirebaseManager:
             print(f"✗ Firebase initialization error: {e}")
             raise
 
+        super().__init__(user_id)
+
+    def _scope(self, user_id: str):
+        super()._scope(user_id)
+        # Transactions table: page-boundary cursors per sort and the row
+        # count, kept until this store next writes or they expire
+        self._forget_table_pages()
+
+    def _forget_table_pages(self):
+        self._table_cursors: Dict[Tuple[str, bool], Dict[int, Any]] = {}
+        self._table_count: Optional[int] = None
+        self._table_cached_at = time.time()
+
+    def _on_receipt_saved(self, receipt_id: str, receipt_data: Dict):
+        self._forget_table_pages()
+        super()._on_receipt_saved(receipt_id, receipt_data)
+
+    def _on_receipt_deleted(self, receipt_id: str):
+        self._forget_table_pages()
+        super()._on_receipt_deleted(receipt_id)
+
+    def _collection(self, name: str):
+        """
+        One of this user's collections: users/{user_id}/{name}
+        The default user keeps the original top-level collections, so
+        receipts saved before partitioning need no migration.
+        """
+
+        if self.user_id == DEFAULT_USER_ID:
+            return self.db.collection(name)
+
+        return (
+            self.db.collection("users")
+            .document(self.user_id)
+            .collection(name)
+        )
+
     def save_receipt_data(self, receipt_data: Dict) -> str:
         """
         Save receipt data to Firestore
+        The receipt and its rollup increments are one atomic batch.
         """
 
         receipt_data["created_at"] = datetime.now()
         receipt_data["updated_at"] = datetime.now()
 
-        doc_ref = self.db.collection("receipts").add(receipt_data)
-        return doc_ref[1].id
+        doc_ref = self._collection("receipts").document()
+        batch = self.db.batch()
+        batch.set(doc_ref, receipt_data)
+        rollup_writes = self._write_rollups(batch, [receipt_data])
+
+        with track("firestore", "write"):
+            batch.commit()
+        FIRESTORE_DOCUMENTS.labels(operation="write").inc(1 + rollup_writes)
+        receipt_id = doc_ref.id
+
+        self._on_receipt_saved(receipt_id, receipt_data)
 
-    def get_all_receipts(self) -> List[Dict]:
+        return receipt_id
+
+    def save_receipts_batch(
+        self,
+        receipts: List[Dict],
+        receipt_ids: Optional[List[str]] = None
+    ) -> List[str]:
         """
-        Fetch all receipts
+        Save several receipts using Firestore batched writes
+        Rollup increments are merged per key within each batch.
         """
 
+        if receipt_ids is not None:
+            return super().save_receipts_batch(receipts, receipt_ids)
+
+        collection = self._collection("receipts")
+        receipt_ids = []
+
+        for start in range(0, len(receipts), self.MAX_BATCH_RECEIPTS):
+            chunk = receipts[start:start + self.MAX_BATCH_RECEIPTS]
+            batch = self.db.batch()
+            refs = []
+
+            for receipt_data in chunk:
+                receipt_data["created_at"] = datetime.now()
+                receipt_data["updated_at"] = datetime.now()
+
+                doc_ref = collection.document()
+                batch.set(doc_ref, receipt_data)
+                refs.append(doc_ref)
+
+            rollup_writes = self._write_rollups(batch, chunk)
+
+            with track("firestore", "batch_write"):
+                batch.commit()
+            FIRESTORE_DOCUMENTS.labels(operation="write").inc(
+                len(chunk) + rollup_writes
+            )
+
+            for doc_ref, receipt_data in zip(refs, chunk):
+                self._on_receipt_saved(doc_ref.id, receipt_data)
+                receipt_ids.append(doc_ref.id)
+
+        return receipt_ids
+
+    def import_receipts(self, receipts: List[Dict]) -> List[str]:
+        """
+        Write receipts under their own IDs with batched writes,
+        skipping IDs already stored (see ReceiptStore)
+        Each batch first looks its documents, and the receipts named by
+        their source IDs, up with one get_all.
+        """
+
+        collection = self._collection("receipts")
+        receipt_ids = []
+        seen = set()
+
+        for start in range(0, len(receipts), self.MAX_BATCH_RECEIPTS):
+            chunk = receipts[start:start + self.MAX_BATCH_RECEIPTS]
+            refs = [collection.document(r["id"]) for r in chunk]
+            # Source IDs containing "/" cannot be document IDs
+            sources = {
+                r["source_id"] for r in chunk
+                if r.get("source_id") and "/" not in r["source_id"]
+            }
+            lookups = refs + [collection.document(s) for s in sources]
+
+            with track("firestore", "read"):
+                existing = {
+                    snapshot.id for snapshot in self.db.get_all(lookups)
+                    if snapshot.exists
+                }
+            FIRESTORE_DOCUMENTS.labels(operation="read").inc(len(lookups))
+
+            fresh = []
+            for doc_ref, receipt_data in zip(refs, chunk):
+                if doc_ref.id in existing or doc_ref.id in seen:
+                    continue
+                if receipt_data.get("source_id") in existing:
+                    continue
+                seen.add(doc_ref.id)
+                fresh.append((doc_ref, receipt_data))
+
+            if not fresh:
+                continue
+
+            batch = self.db.batch()
+            for doc_ref, receipt_data in fresh:
+                batch.set(doc_ref, {
+                    key: value for key, value in receipt_data.items()
+                    if key != "id"
+                })
+            rollup_writes = self._write_rollups(
+                batch, [receipt_data for _, receipt_data in fresh]
+            )
+
+            with track("firestore", "batch_write"):
+                batch.commit()
+            FIRESTORE_DOCUMENTS.labels(operation="write").inc(
+                len(fresh) + rollup_writes
+            )
+
+            for doc_ref, receipt_data in fresh:
+                self._on_receipt_saved(doc_ref.id, receipt_data)
+                receipt_ids.append(doc_ref.id)
+
+        return receipt_ids
+
+    # ------------------------------------------------------------------
+    # Rollups
+    # ------------------------------------------------------------------
+
+    def _rollup_ref(self, dimension: str, key: str):
+        # Keys are free text (merchant names may contain "/"), so hash them
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self._collection(ROLLUP_COLLECTION).document(
+            f"{dimension}_{digest}"
+        )
+
+    def _write_rollups(self, writer, receipts: List[Dict], sign: int = 1) -> int:
+        """
+        Add atomic rollup increments for receipts to a batch or transaction
+        sign=-1 takes them back out. Returns the number of writes added.
+        """
+
+        writes = 0
+
+        for dimension, keys in rollup_totals(receipts).items():
+            for key, (total, count) in keys.items():
+                writer.set(
+                    self._rollup_ref(dimension, key),
+                    {
+                        "dimension": dimension,
+                        "key": key,
+                        "total": firestore.Increment(sign * total),
+                        "count": firestore.Increment(sign * count)
+                    },
+                    merge=True
+                )
+                writes += 1
+
+        return writes
+
+    def get_rollup(self, dimension: str) -> Dict[str, Tuple[float, int]]:
+        """
+        Read one dimension's rollup documents
+        Costs one read per key, however many receipts exist.
+        """
+
+        if dimension not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+
+        query = (
+            self._collection(ROLLUP_COLLECTION)
+            .where(filter=firestore.FieldFilter("dimension", "==", dimension))
+            .order_by("key")
+        )
+
+        rollup = {}
+        for doc in self._iter_pages(query, self.PAGE_SIZE):
+            data = doc.to_dict()
+            # Keys whose receipts were all deleted stay behind at zero
+            if data["count"] > 0:
+                rollup[data["key"]] = (float(data["total"]), int(data["count"]))
+
+        return rollup
+
+    def backfill_rollups(self) -> bool:
+        """
+        Build the rollups once for receipts saved before they existed
+        The first instance to create the marker document runs it; the
+        marker then records that it finished, so later starts skip it.
+        A failed run removes the marker to be retried on the next start.
+        Returns True when this call ran the backfill.
+        """
+
+        marker = self._collection(MIGRATION_COLLECTION).document("rollup_backfill")
+
         try:
-            receipts = []
-            docs = (
-                self.db.collection("receipts")
-                .order_by("created_at", direction=firestore.Query.DESCENDING)
-                .stream()
+            marker.create({"state": "running", "started_at": datetime.now()})
+        except AlreadyExists:
+            return False
+
+        try:
+            self.rebuild_rollups()
+        except Exception:
+            marker.delete()
+            raise
+
+        marker.set({"state": "done", "finished_at": datetime.now()}, merge=True)
+        return True
+
+    def rebuild_rollups(self):
+        """
+        Recompute every rollup document from the receipts
+        One full read; backfills receipts saved before rollups existed.
+        Run it while no receipts are being saved or deleted.
+        """
+
+        totals = rollup_totals(self.iter_receipts())
+        collection = self._collection(ROLLUP_COLLECTION)
+
+        writes = []
+        for dimension, keys in totals.items():
+            for key, (total, count) in keys.items():
+                writes.append((
+                    self._rollup_ref(dimension, key),
+                    {
+                        "dimension": dimension,
+                        "key": key,
+                        "total": total,
+                        "count": count
+                    }
+                ))
+
+        current = {ref.id for ref, _ in writes}
+        stale = [
+            doc.id for doc in self._iter_pages(
+                collection.order_by("key"), self.PAGE_SIZE
             )
+            if doc.id not in current
+        ]
+
+        for start in range(0, len(writes), self.MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for ref, data in writes[start:start + self.MAX_BATCH_WRITES]:
+                batch.set(ref, data)
+            batch.commit()
+
+        for start in range(0, len(stale), self.MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for doc_id in stale[start:start + self.MAX_BATCH_WRITES]:
+                batch.delete(collection.document(doc_id))
+            batch.commit()
+
+        print(f"✓ Rebuilt {len(writes)} rollup document(s)")
 
+    def _receipts_query(self):
+        return (
+            self._collection("receipts")
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+        )
+
+    @staticmethod
+    def _doc_to_receipt(doc) -> Dict:
+        data = doc.to_dict()
+        data["id"] = doc.id
+        return data
+
+    @staticmethod
+    def _stream(query) -> List[Any]:
+        """Run a query, timing the round trip and counting documents read"""
+
+        with track("firestore", "read"):
+            docs = list(query.stream())
+        FIRESTORE_DOCUMENTS.labels(operation="read").inc(len(docs))
+        return docs
+
+    def _iter_pages(self, query, page_size: int) -> Iterator[Any]:
+        cursor = None
+
+        while True:
+            page = query.limit(page_size)
+            if cursor is not None:
+                page = page.start_after(cursor)
+
+            docs = self._stream(page)
             for doc in docs:
-                data = doc.to_dict()
-                data["id"] = doc.id
+                yield doc
 
-                if "created_at" in data:
-                    data["created_at"] = data["created_at"].strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    )
+            if len(docs) < page_size:
+                break
+            cursor = docs[-1]
 
-                receipts.append(data)
+    def get_receipts_page(
+        self,
+        page_size: int = ReceiptStore.PAGE_SIZE,
+        start_after: Optional[Any] = None
+    ) -> Tuple[List[Dict], Optional[Any]]:
+        """
+        Fetch one page of receipts, newest first
+        Returns (receipts, cursor); pass the cursor back as start_after
+        to get the next page. The cursor is None after the last page.
+        Timestamps are left as datetimes.
+        """
 
-            return receipts
+        query = self._receipts_query().limit(page_size)
+        if start_after is not None:
+            query = query.start_after(start_after)
 
-        except Exception as e:
-            print(f"✗ Firestore read error: {e}")
-            return []
+        docs = self._stream(query)
+        receipts = [self._doc_to_receipt(doc) for doc in docs]
+        cursor = docs[-1] if len(docs) == page_size else None
+
+        return receipts, cursor
+
+    def iter_receipts_between(
+        self,
+        start: datetime,
+        end: datetime,
+        page_size: int = ReceiptStore.PAGE_SIZE,
+        categories: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts with start <= created_at < end, newest first
+        (optionally only some categories)
+        Only documents inside the window are read, and only those in the
+        categories while there are no more than MAX_IN_VALUES of them;
+        longer lists are filtered as the documents arrive.
+        """
+
+        query = (
+            self._collection("receipts")
+            .where(filter=firestore.FieldFilter("created_at", ">=", start))
+            .where(filter=firestore.FieldFilter("created_at", "<", end))
+        )
+
+        wanted = set(categories or ())
+        if wanted and len(categories) <= self.MAX_IN_VALUES:
+            query = query.where(
+                filter=firestore.FieldFilter("category", "in", list(categories))
+            )
+            wanted = set()
+
+        query = query.order_by("created_at", direction=firestore.Query.DESCENDING)
+
+        for doc in self._iter_pages(query, page_size):
+            receipt = self._doc_to_receipt(doc)
+            if not wanted or receipt.get("category") in wanted:
+                yield receipt
+
+    def iter_receipts_updated_since(
+        self,
+        since: datetime,
+        page_size: int = ReceiptStore.PAGE_SIZE
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts whose updated_at is after the given watermark
+        """
+
+        query = (
+            self._collection("receipts")
+            .where(filter=firestore.FieldFilter("updated_at", ">", since))
+            .order_by("updated_at")
+        )
+
+        for doc in self._iter_pages(query, page_size):
+            yield self._doc_to_receipt(doc)
+
+    def get_deleted_receipt_ids_since(self, since: datetime) -> List[str]:
+        """
+        IDs of receipts deleted after the given watermark
+        """
+
+        query = (
+            self._collection("receipt_deletions")
+            .where(filter=firestore.FieldFilter("deleted_at", ">", since))
+            .order_by("deleted_at")
+        )
+
+        return [doc.id for doc in self._iter_pages(query, self.PAGE_SIZE)]
+
+    def prune_deletions_before(self, before: datetime) -> int:
+        """
+        Drop deletion tombstones older than before
+        """
+
+        collection = self._collection("receipt_deletions")
+        query = (
+            collection
+            .where(filter=firestore.FieldFilter("deleted_at", "<", before))
+            .order_by("deleted_at")
+        )
+        stale = [doc.id for doc in self._iter_pages(query, self.PAGE_SIZE)]
+
+        for start in range(0, len(stale), self.MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for doc_id in stale[start:start + self.MAX_BATCH_WRITES]:
+                batch.delete(collection.document(doc_id))
+            with track("firestore", "delete"):
+                batch.commit()
+
+        FIRESTORE_DOCUMENTS.labels(operation="write").inc(len(stale))
+        return len(stale)
+
+    def _aggregate(self, query) -> Tuple[int, float]:
+        """
+        (count, sum of total_amount) via a Firestore aggregation query
+        Billed as one read per 1,000 matching index entries.
+        """
+
+        aggregation = (
+            query.count(alias="count")
+            .sum("total_amount", alias="total")
+        )
+
+        with track("firestore", "aggregate"):
+            results = aggregation.get()
+        FIRESTORE_DOCUMENTS.labels(operation="aggregate").inc()
+
+        values = {result.alias: result.value for result in results[0]}
+        return int(values.get("count") or 0), float(values.get("total") or 0)
+
+    def _count(self, query) -> int:
+        """
+        Number of documents matching query via a count aggregation
+        """
+
+        with track("firestore", "aggregate"):
+            results = query.count(alias="count").get()
+        FIRESTORE_DOCUMENTS.labels(operation="aggregate").inc()
+
+        return int(results[0][0].value or 0)
+
+    def _positive_receipts(self):
+        # Same rule as the running aggregates: non-positive amounts are ignored
+        return self._collection("receipts").where(
+            filter=firestore.FieldFilter("total_amount", ">", 0)
+        )
+
+    def get_spending_totals(self) -> Dict:
+        """
+        Headline figures from one server-side count/sum aggregation
+        """
+
+        count, total = self._aggregate(self._positive_receipts())
+
+        return {
+            "total_spent": total,
+            "total_receipts": count,
+            "average_transaction": total / count if count else 0
+        }
+
+    def get_category_totals(self) -> Dict[str, Dict]:
+        """
+        Per-category breakdown from the category rollup documents
+        One read per category, however many receipts exist.
+        """
+
+        return {
+            category: {
+                "total": total,
+                "count": count,
+                "average": total / count
+            }
+            for category, (total, count) in self.get_rollup("category").items()
+        }
+
+    def search_receipts(
+        self,
+        search: str = "",
+        sort_by: str = "date",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = ReceiptStore.PAGE_SIZE,
+        window: Optional[Tuple[datetime, datetime]] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        One page of the transactions table (see ReceiptStore)
+        Unfiltered pages are one ordered query that resumes after the
+        nearest page boundary already seen, so stepping through pages
+        reads only the page (an offset is billed for every document it
+        skips). The count aggregation runs once until the next write
+        or until Settings.TABLE_CACHE_TTL_SECONDS pass, which bounds how
+        long writes from other instances go unseen.
+        Firestore has no substring search, so searches and windowed
+        pages use the streaming fallback. Text sorts are case-sensitive
+        here.
+        """
+
+        unsupported = search.strip() or window is not None
+        if unsupported or sort_by not in TABLE_SORT_FIELDS:
+            return super().search_receipts(
+                search, sort_by, descending, offset, limit, window
+            )
+
+        direction = (
+            firestore.Query.DESCENDING if descending
+            else firestore.Query.ASCENDING
+        )
+        query = self._positive_receipts().order_by(
+            TABLE_SORT_FIELDS[sort_by], direction=direction
+        )
+
+        if time.time() - self._table_cached_at >= Settings.TABLE_CACHE_TTL_SECONDS:
+            self._forget_table_pages()
+
+        cursors = self._table_cursors.setdefault((sort_by, descending), {})
+        start = max((seen for seen in cursors if seen <= offset), default=0)
+        if start:
+            query = query.start_after(cursors[start])
+        if offset > start:
+            query = query.offset(offset - start)
+
+        docs = self._stream(query.limit(limit))
+        if docs:
+            if len(cursors) >= self.MAX_TABLE_CURSORS:
+                cursors.clear()
+            cursors[offset + len(docs)] = docs[-1]
+
+        if self._table_count is None:
+            self._table_count = self._count(self._positive_receipts())
+
+        return [self._doc_to_receipt(doc) for doc in docs], self._table_count
 
     def get_receipt_by_id(self, receipt_id: str) -> Optional[Dict]:
         """
@@ -79,11 +625,13 @@ class FirebaseManager:
         """
 
         try:
-            doc = (
-                self.db.collection("receipts")
-                .document(receipt_id)
-                .get()
-            )
+            with track("firestore", "read"):
+                doc = (
+                    self._collection("receipts")
+                    .document(receipt_id)
+                    .get()
+                )
+            FIRESTORE_DOCUMENTS.labels(operation="read").inc()
 
             if doc.exists:
                 data = doc.to_dict()
@@ -99,10 +647,31 @@ class FirebaseManager:
     def delete_receipt(self, receipt_id: str) -> bool:
         """
         Delete a receipt
+        Runs in a transaction so the rollups are decremented exactly
+        once, by the amounts that were actually stored.
         """
 
+        receipt_ref = self._collection("receipts").document(receipt_id)
+        tombstone_ref = self._collection("receipt_deletions").document(receipt_id)
+
+        @firestore.transactional
+        def delete_in_transaction(transaction):
+            snapshot = receipt_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return
+
+            transaction.delete(receipt_ref)
+            self._write_rollups(transaction, [snapshot.to_dict()], sign=-1)
+
+            # Leave a tombstone so mirrors can sync the deletion
+            transaction.set(tombstone_ref, {"deleted_at": datetime.now()})
+
         try:
-            self.db.collection("receipts").document(receipt_id).delete()
+            with track("firestore", "delete"):
+                delete_in_transaction(self.db.transaction())
+
+            self._on_receipt_deleted(receipt_id)
+
             return True
         except Exception as e:
             print(f"✗ Firestore delete error: {e}")
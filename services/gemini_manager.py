@@ -3,12 +3,28 @@ Gemini Manager for Pilot
 STABLE implementation using google-generativeai
 """
 
-import google.generativeai as genai
+import time
+from typing import Iterator, Optional
 from config.settings import Settings
+from services.response_cache import ResponseCache
+from services.ai_prompt import build_prompt, estimate_tokens
+from services.metrics import (
+    GEMINI_PROMPT_TOKENS,
+    GEMINI_RESPONSE_TOKENS,
+    OPERATION_SECONDS,
+    RESPONSE_CACHE_LOOKUPS,
+    track
+)
 
 
 class GeminiManager:
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ResponseCache] = None):
+        # Optional cache of finished answers (see ResponseCache)
+        self.response_cache = response_cache
+
+        # Imported here so loading this module stays cheap at startup
+        import google.generativeai as genai
+
         # Configure API key
         genai.configure(api_key=Settings.GEMINI_API_KEY)
 
@@ -17,27 +33,60 @@ class GeminiManager:
 
         print("✓ Gemini initialized (google-generativeai)")
 
-    def generate_response(self, user_message: str) -> str:
+    def _build_prompt(self, user_message: str, context: str = "") -> str:
+        prompt = build_prompt(
+            context,
+            user_message,
+            max_tokens=Settings.PILOT_PROMPT_MAX_TOKENS
+        )
+        GEMINI_PROMPT_TOKENS.observe(estimate_tokens(prompt))
+        return prompt
+
+    def _cached(self, user_message: str, data_version: str) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get(user_message, data_version)
+        RESPONSE_CACHE_LOOKUPS.labels(
+            result="miss" if cached is None else "hit"
+        ).inc()
+        return cached
+
+    def _remember(self, user_message: str, data_version: str, reply: str):
+        if self.response_cache is not None:
+            self.response_cache.set(user_message, data_version, reply)
+
+    def generate_response(
+        self,
+        user_message: str,
+        data_version: str = "",
+        context: str = ""
+    ) -> str:
         """
         TEMP DEBUG VERSION
         Prints real Gemini error to terminal
+        context is the financial summary (see services.ai_summary);
+        data_version identifies the receipt data it was built from
         """
 
-        prompt = (
-            "You are Pilot, a helpful personal finance assistant.\n"
-            "Answer clearly and simply.\n\n"
-            f"User question: {user_message}"
-        )
+        cached = self._cached(user_message, data_version)
+        if cached is not None:
+            return cached
+
+        prompt = self._build_prompt(user_message, context)
 
         try:
-            response = self.model.generate_content(prompt)
+            with track("gemini", "generate"):
+                response = self.model.generate_content(prompt)
 
             print("✅ RAW GEMINI RESPONSE:", response)
 
             if not response or not response.text:
                 return "No text returned from Gemini."
 
-            return response.text.strip()
+            reply = response.text.strip()
+            GEMINI_RESPONSE_TOKENS.observe(estimate_tokens(reply))
+            self._remember(user_message, data_version, reply)
+            return reply
 
         except Exception as e:
             print("🔥🔥🔥 REAL GEMINI ERROR 🔥🔥🔥")
@@ -46,3 +95,59 @@ class GeminiManager:
             print("🔥🔥🔥 END ERROR 🔥🔥🔥")
 
             return "Gemini API failed. Check terminal logs."
+
+    def stream_response(
+        self,
+        user_message: str,
+        data_version: str = "",
+        context: str = ""
+    ) -> Iterator[str]:
+        """
+        Stream the reply as Gemini produces it
+        Yields text chunks; the caller concatenates them.
+        A cached answer is yielded as a single chunk.
+        """
+
+        cached = self._cached(user_message, data_version)
+        if cached is not None:
+            yield cached
+            return
+
+        prompt = self._build_prompt(user_message, context)
+        produced = []
+
+        try:
+            with track("gemini", "stream"):
+                started = time.perf_counter()
+                response = self.model.generate_content(prompt, stream=True)
+
+                for chunk in response:
+                    # Chunks without text (e.g. safety metadata) raise on .text
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        continue
+
+                    if text:
+                        if not produced:
+                            OPERATION_SECONDS.labels(
+                                component="gemini",
+                                operation="stream_first_chunk"
+                            ).observe(time.perf_counter() - started)
+                        produced.append(text)
+                        yield text
+
+            if not produced:
+                yield "No text returned from Gemini."
+            else:
+                reply = "".join(produced)
+                GEMINI_RESPONSE_TOKENS.observe(estimate_tokens(reply))
+                self._remember(user_message, data_version, reply)
+
+        except Exception as e:
+            print("🔥 Gemini streaming error:", type(e), e)
+
+            if produced:
+                yield "\n\n*(Response interrupted. Check terminal logs.)*"
+            else:
+                yield "Gemini API failed. Check terminal logs."
@@ -0,0 +1,374 @@
+"""
+Receipt Job Queue
+Background processing of uploaded receipts: a fixed pool of worker
+threads pulls jobs from a bounded queue and extracts the receipts,
+retrying transient failures with exponential backoff
+Files submitted together form a batch: once the last one has been
+extracted, all of the batch's receipts are saved in one batched write
+The upload handler only enqueues, so it returns immediately; the UI
+polls job status until every job has finished
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.metrics import JOB_QUEUE_DEPTH, JOB_RETRIES, JOBS_FINISHED, track
+from services.storage import DEFAULT_USER_ID, ReceiptStore
+from utils.helpers import get_mime_type, validate_file
+
+# Job states
+QUEUED = "queued"
+EXTRACTING = "extracting"
+SAVING = "saving"
+RETRYING = "retrying"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED_STATES = (DONE, FAILED)
+
+# Network-level failures worth retrying; validation errors are not
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+try:
+    from google.api_core import exceptions as google_exceptions
+
+    TRANSIENT_ERRORS += (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.TooManyRequests,
+        google_exceptions.InternalServerError,
+        google_exceptions.Aborted
+    )
+except ImportError:
+    pass
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when the queue is at max_depth"""
+
+
+class ReceiptBatch:
+    """
+    Jobs submitted together, saved together
+    pending counts the jobs still extracting.
+    """
+
+    def __init__(self):
+        self.jobs: List["ReceiptJob"] = []
+        self.pending = 0
+
+
+class ReceiptJob:
+    """
+    One uploaded file on its way to the store
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        user_id: str = DEFAULT_USER_ID,
+        batch: Optional[ReceiptBatch] = None
+    ):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.batch = batch
+        self.file_path = file_path
+        self.file_name = os.path.basename(file_path)
+        self.state = QUEUED
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.receipt_data: Optional[Dict] = None
+        self.receipt_id: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "file_name": self.file_name,
+            "state": self.state,
+            "attempts": self.attempts,
+            "error": self.error,
+            "receipt_id": self.receipt_id,
+            "receipt": self.receipt_data,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+
+class ReceiptJobQueue:
+    """
+    Bounded queue + worker pool for receipt extraction and saving
+
+    workers:         worker threads (throughput scales with this)
+    max_depth:       queued jobs allowed before submit() pushes back
+    max_retries:     extra attempts after a transient failure
+    backoff_seconds: first retry delay; doubles each attempt (+ jitter)
+    """
+
+    # Finished jobs kept for status polling
+    MAX_FINISHED_JOBS = 1000
+    MAX_BACKOFF_SECONDS = 30.0
+
+    def __init__(
+        self,
+        receipt_store: ReceiptStore,
+        doc_ai_processor,
+        workers: int = 4,
+        max_depth: int = 100,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0
+    ):
+        self.receipt_store = receipt_store
+        self.doc_ai_processor = doc_ai_processor
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self._queue: "queue.Queue[Optional[ReceiptJob]]" = queue.Queue(max_depth)
+        self._jobs: "OrderedDict[str, ReceiptJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+
+        self._workers = [
+            threading.Thread(
+                target=self._work, name=f"receipt-worker-{i}", daemon=True
+            )
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, file_path: str, user_id: str = DEFAULT_USER_ID) -> str:
+        """
+        Enqueue a file to be saved for user_id; returns the job ID
+        Raises QueueFullError instead of blocking when the queue is full.
+        """
+
+        job_ids, _ = self.submit_batch([file_path], user_id)
+        if not job_ids:
+            raise QueueFullError(
+                "Receipt queue is full, please try again shortly"
+            )
+
+        return job_ids[0]
+
+    def submit_batch(
+        self,
+        file_paths: List[str],
+        user_id: str = DEFAULT_USER_ID
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Enqueue files whose receipts are saved for user_id in one write
+        Returns (job IDs, file paths the full queue turned away).
+        """
+
+        batch = ReceiptBatch()
+        rejected = []
+
+        # Held while enqueuing, so no job can finish extracting before
+        # the batch knows all of its jobs
+        with self._lock:
+            for file_path in file_paths:
+                job = ReceiptJob(file_path, user_id, batch)
+                try:
+                    self._queue.put_nowait(job)
+                except queue.Full:
+                    rejected.append(file_path)
+                    continue
+
+                self._jobs[job.id] = job
+                batch.jobs.append(job)
+
+            batch.pending = len(batch.jobs)
+
+        JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        return [job.id for job in batch.jobs], rejected
+
+    def status(self, job_ids: Iterable[str]) -> List[Dict]:
+        """
+        Current state of each known job, in the order given
+        """
+
+        with self._lock:
+            return [
+                self._jobs[job_id].to_dict()
+                for job_id in job_ids
+                if job_id in self._jobs
+            ]
+
+    def wait(self, job_ids: Iterable[str], timeout: Optional[float] = None) -> bool:
+        """
+        Block until every job has finished; False on timeout
+        """
+
+        job_ids = list(job_ids)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._changed:
+            while not all(
+                self._jobs[job_id].finished
+                for job_id in job_ids
+                if job_id in self._jobs
+            ):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+
+        return True
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the workers after the jobs already queued
+        """
+
+        self._stopping.set()
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _update(self, job: ReceiptJob, state: str, error: Optional[str] = None):
+        with self._changed:
+            job.state = state
+            job.error = error
+            job.updated_at = time.time()
+
+            if job.finished:
+                JOBS_FINISHED.labels(state=state).inc()
+                self._forget_finished()
+
+            self._changed.notify_all()
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize())
+
+            if job is None:
+                return
+
+            try:
+                self._run(job)
+            except Exception as e:
+                print(f"✗ Receipt job error ({job.file_name}): {e}")
+                self._update(job, FAILED, str(e))
+
+    def _run(self, job: ReceiptJob):
+        job.attempts = 1
+
+        try:
+            job.receipt_data = self._attempt(
+                [job], EXTRACTING, lambda: self._extract(job.file_path)
+            )
+            # Extracted; saved with the rest of the batch
+            self._update(job, SAVING)
+
+        except Exception as e:
+            print(f"✗ Receipt job error ({job.file_name}): {e}")
+            self._update(job, FAILED, str(e))
+
+        jobs = self._extracted(job)
+        if not jobs:
+            return
+
+        try:
+            self._attempt(jobs, SAVING, lambda: self._save(jobs))
+        except Exception as e:
+            print(f"✗ Receipt save error ({len(jobs)} receipt(s)): {e}")
+            for job in jobs:
+                self._update(job, FAILED, str(e))
+            return
+
+        for job in jobs:
+            job.receipt_id = job.id
+            self._update(job, DONE)
+
+    def _extracted(self, job: ReceiptJob) -> List[ReceiptJob]:
+        """
+        Record that job is done extracting; once the whole batch is,
+        returns the jobs whose receipts are to be saved
+        """
+
+        with self._lock:
+            batch = job.batch
+            batch.pending -= 1
+            if batch.pending:
+                return []
+
+            return [job for job in batch.jobs if job.receipt_data is not None]
+
+    def _attempt(self, jobs: List[ReceiptJob], state: str, operation: Callable):
+        """
+        Run operation on behalf of jobs, retrying transient failures
+        Retries count against each job's attempts, so a job that retried
+        its extraction has fewer left for the save.
+        """
+
+        while True:
+            for job in jobs:
+                self._update(job, state)
+
+            try:
+                return operation()
+
+            except TRANSIENT_ERRORS as e:
+                attempts = max(job.attempts for job in jobs)
+                if attempts > self.max_retries or self._stopping.is_set():
+                    raise
+
+                delay = min(
+                    self.backoff_seconds * 2 ** (attempts - 1),
+                    self.MAX_BACKOFF_SECONDS
+                )
+                delay *= random.uniform(0.8, 1.2)
+
+                JOB_RETRIES.inc()
+                for job in jobs:
+                    self._update(
+                        job, RETRYING,
+                        f"{e} (retry {job.attempts}/{self.max_retries} in {delay:.1f}s)"
+                    )
+                    job.attempts += 1
+                self._stopping.wait(delay)
+
+    def _save(self, jobs: List[ReceiptJob]):
+        # Saved under the job IDs: a retry after a write that landed
+        # (but timed out) finds the receipts and adds nothing
+        store = self.receipt_store.for_user(jobs[0].user_id)
+
+        with track("jobs", "save"):
+            store.save_receipts_batch(
+                [dict(job.receipt_data) for job in jobs],
+                [job.id for job in jobs]
+            )
+
+    def _extract(self, file_path: str) -> Dict:
+        is_valid, msg = validate_file(file_path)
+        if not is_valid:
+            raise ValueError(msg)
+
+        with track("jobs", "extract"):
+            receipt_data = self.doc_ai_processor.process_receipt(
+                file_path,
+                get_mime_type(file_path)
+            )
+
+        receipt_data["original_filename"] = os.path.basename(file_path)
+        return receipt_data
@@ -0,0 +1,352 @@
+"""
+Metrics
+Small in-process instrumentation layer: counters, gauges and
+latency histograms rendered in the Prometheus text format
+(served at /metrics by main.create_server)
+
+Operations are labelled by component (firestore, gemini,
+document_ai, dashboard) and operation name, so a slow dashboard
+can be traced to the store or pandas; whatever the handler phases
+do not account for is Gradio serialization and transport.
+"""
+
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Prometheus client defaults, in seconds
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Prompt / response sizes in (estimated) tokens
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric(ABC):
+    """
+    Metric family: one child per combination of label values
+    Subclasses define the child type and how a child renders.
+    """
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+
+    def labels(self, **labels) -> "_Metric":
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                self._children[key] = child
+            return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the value holder for one set of label values"""
+
+    @abstractmethod
+    def _samples(self, child, labels) -> List[str]:
+        """Exposition lines for one child"""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}"
+        ]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in sorted(children):
+            lines.extend(self._samples(child, list(zip(self.labelnames, key))))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. errors or documents read"""
+
+    TYPE = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        """Increment an unlabelled counter"""
+
+        self.labels().inc(amount)
+
+    def _samples(self, child, labels):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. in-flight operations"""
+
+    TYPE = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        """Set an unlabelled gauge"""
+
+        self.labels().set(value)
+
+    def _samples(self, child, labels):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(child.value)}"]
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed buckets"""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        """Observe on an unlabelled histogram"""
+
+        self.labels().observe(value)
+
+    def _samples(self, child, labels):
+        with child._lock:
+            counts = list(child.counts)
+            count, total = child.count, child.sum
+
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            bucket_labels = labels + [("le", _format_value(bound))]
+            lines.append(
+                f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+            )
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds every metric and renders them for /metrics
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+OPERATION_SECONDS = REGISTRY.histogram(
+    "pocketpilot_operation_seconds",
+    "Latency of instrumented operations",
+    ("component", "operation")
+)
+OPERATION_ERRORS = REGISTRY.counter(
+    "pocketpilot_operation_errors_total",
+    "Instrumented operations that failed",
+    ("component", "operation")
+)
+OPERATIONS_IN_FLIGHT = REGISTRY.gauge(
+    "pocketpilot_operations_in_flight",
+    "Instrumented operations currently running",
+    ("component", "operation")
+)
+FIRESTORE_DOCUMENTS = REGISTRY.counter(
+    "pocketpilot_firestore_documents_total",
+    "Firestore documents read or written",
+    ("operation",)
+)
+GEMINI_PROMPT_TOKENS = REGISTRY.histogram(
+    "pocketpilot_gemini_prompt_tokens",
+    "Estimated tokens per Gemini prompt",
+    buckets=TOKEN_BUCKETS
+)
+GEMINI_RESPONSE_TOKENS = REGISTRY.histogram(
+    "pocketpilot_gemini_response_tokens",
+    "Estimated tokens per Gemini response",
+    buckets=TOKEN_BUCKETS
+)
+STARTUP_PHASE_SECONDS = REGISTRY.gauge(
+    "pocketpilot_startup_phase_seconds",
+    "Duration of each startup phase (see services.startup)",
+    ("phase",)
+)
+JOB_QUEUE_DEPTH = REGISTRY.gauge(
+    "pocketpilot_job_queue_depth",
+    "Receipt jobs waiting for a worker"
+)
+JOBS_FINISHED = REGISTRY.counter(
+    "pocketpilot_jobs_finished_total",
+    "Receipt jobs that reached a final state",
+    ("state",)
+)
+JOB_RETRIES = REGISTRY.counter(
+    "pocketpilot_job_retries_total",
+    "Receipt job attempts retried after a transient failure"
+)
+PREPROCESS_BYTES = REGISTRY.counter(
+    "pocketpilot_preprocess_bytes_total",
+    "Receipt image bytes before and after preprocessing",
+    ("stage",)
+)
+EXTRACTION_CACHE_LOOKUPS = REGISTRY.counter(
+    "pocketpilot_extraction_cache_lookups_total",
+    "Receipt extraction cache lookups",
+    ("result",)
+)
+RESPONSE_CACHE_LOOKUPS = REGISTRY.counter(
+    "pocketpilot_response_cache_lookups_total",
+    "Pilot response cache lookups",
+    ("result",)
+)
+
+
+def record_error(component: str, operation: str):
+    """Count a failure that was handled without raising"""
+
+    OPERATION_ERRORS.labels(component=component, operation=operation).inc()
+
+
+@contextmanager
+def track(component: str, operation: str) -> Iterator[None]:
+    """
+    Time a block: latency histogram, in-flight gauge and
+    an error count if the block raises
+    """
+
+    in_flight = OPERATIONS_IN_FLIGHT.labels(component=component, operation=operation)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_error(component, operation)
+        raise
+    finally:
+        OPERATION_SECONDS.labels(component=component, operation=operation).observe(
+            time.perf_counter() - started
+        )
+        in_flight.dec()
+
+
+def tracked(component: str, operation: str):
+    """Decorator form of track()"""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track(component, operation):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
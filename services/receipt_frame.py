@@ -0,0 +1,214 @@
+"""
+Receipt Frame
+Compact columnar representation of receipts for the dashboard path
+
+    id                string (object)
+    merchant_name     category (dictionary-encoded)
+    category          category
+    currency          category
+    transaction_date  category
+    total_amount      float64
+    created_at        datetime64[ns, UTC]
+    updated_at        datetime64[ns, UTC]
+
+Merchant and category strings are stored once per distinct value
+instead of once per receipt, and Parquet keeps the encoding on disk.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.helpers import format_currency, generate_short_id
+
+RECEIPT_FRAME_COLUMNS = [
+    "id",
+    "merchant_name",
+    "category",
+    "total_amount",
+    "currency",
+    "transaction_date",
+    "created_at",
+    "updated_at"
+]
+
+CATEGORICAL_COLUMNS = [
+    "merchant_name",
+    "category",
+    "currency",
+    "transaction_date"
+]
+
+
+def build_receipt_frame(
+    receipts: Union[pd.DataFrame, Iterable[dict]],
+    sort: bool = True
+) -> pd.DataFrame:
+    """
+    Build the compact frame from raw receipts or an existing frame
+    Rows are ordered newest first unless sort is False.
+    created_at may be a Firestore timestamp, a datetime or a
+    "YYYY-MM-DD HH:MM:SS" string; all are parsed in one pass.
+    """
+
+    if isinstance(receipts, pd.DataFrame):
+        df = receipts.reindex(columns=RECEIPT_FRAME_COLUMNS)
+    else:
+        df = pd.DataFrame(list(receipts), columns=RECEIPT_FRAME_COLUMNS)
+
+    df["id"] = df["id"].fillna("").astype(str)
+
+    for col in CATEGORICAL_COLUMNS:
+        values = df[col]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.fillna("").astype(str).astype("category")
+        elif values.isna().any():
+            if "" not in values.cat.categories:
+                values = values.cat.add_categories("")
+            values = values.fillna("")
+        df[col] = values
+
+    df["total_amount"] = pd.to_numeric(
+        df["total_amount"], errors="coerce"
+    ).fillna(0.0).astype(np.float64)
+
+    for col in ("created_at", "updated_at"):
+        df[col] = pd.to_datetime(df[col], utc=True, format="mixed")
+
+    if not sort:
+        return df.reset_index(drop=True)
+
+    return df.sort_values(
+        "created_at", ascending=False, ignore_index=True
+    )
+
+
+def receipt_days(frame: pd.DataFrame) -> pd.Series:
+    """
+    Receipt date ("YYYY-MM-DD") per row, taken from created_at
+    Rows without created_at fall back to today, like normalize_receipts.
+    """
+
+    # Format each distinct day once instead of every timestamp
+    codes, days = pd.factorize(frame["created_at"].dt.floor("D"))
+    labels = np.append(
+        days.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        datetime.now().strftime("%Y-%m-%d")
+    )
+
+    # NaT has code -1, which picks the trailing "today" label
+    return pd.Series(labels[codes], index=frame.index)
+
+
+def frame_between(
+    frame: pd.DataFrame,
+    start: datetime,
+    end: datetime
+) -> pd.DataFrame:
+    """
+    Rows with start <= created_at < end (naive bounds are read as UTC,
+    the same way build_receipt_frame reads naive timestamps)
+    """
+
+    created_at = frame["created_at"]
+    mask = (
+        (created_at >= pd.Timestamp(start, tz="UTC"))
+        & (created_at < pd.Timestamp(end, tz="UTC"))
+    )
+    return frame[mask]
+
+
+# Frame column for each transactions table sort key (see TABLE_SORT_FIELDS)
+FRAME_SORT_COLUMNS = {
+    "date": "created_at",
+    "amount": "total_amount",
+    "merchant": "merchant_name",
+    "category": "category"
+}
+
+
+def frame_page(
+    frame: pd.DataFrame,
+    search: str = "",
+    sort_by: str = "date",
+    descending: bool = True,
+    offset: int = 0,
+    limit: int = 50
+) -> Tuple[pd.DataFrame, int]:
+    """
+    One page of the transactions table from a receipt frame and the
+    number of matching rows (same rules as ReceiptStore.search_receipts)
+    Search is matched once per distinct merchant / category, not per row.
+    """
+
+    if sort_by not in FRAME_SORT_COLUMNS:
+        raise ValueError(f"Unknown sort field: {sort_by}")
+
+    frame = frame[frame["total_amount"] > 0]
+
+    needle = search.strip().lower()
+    if needle:
+        mask = np.zeros(len(frame), dtype=bool)
+        for col in ("merchant_name", "category"):
+            values = frame[col].astype("category")
+            hits = values.cat.categories.str.lower().str.contains(
+                needle, regex=False
+            )
+            mask |= values.isin(values.cat.categories[hits]).to_numpy()
+        frame = frame[mask]
+
+    column = FRAME_SORT_COLUMNS[sort_by]
+    keys = list(dict.fromkeys([column, "created_at", "id"]))
+
+    def sort_key(values: pd.Series) -> pd.Series:
+        if values.name not in ("merchant_name", "category"):
+            return values
+        # Rank the distinct values case-insensitively, then sort codes
+        values = values.astype("category")
+        ranks = pd.Series(values.cat.categories.str.lower()).rank(method="dense")
+        return pd.Series(ranks.to_numpy()[values.cat.codes], index=values.index)
+
+    ordered = frame.sort_values(
+        keys, ascending=not descending, key=sort_key, kind="stable"
+    )
+    return ordered.iloc[offset:offset + limit], len(frame)
+
+
+def normalize_receipt_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized equivalent of the dashboard's normalize_receipts
+    Columns: date, merchant, amount, category, id (short ID).
+    Receipts with a non-positive amount are dropped.
+    """
+
+    frame = frame[frame["total_amount"] > 0]
+
+    # Short IDs are memoized, so repeat refreshes skip the MD5
+    short_ids = [
+        generate_short_id(full_id) if full_id else ""
+        for full_id in frame["id"].tolist()
+    ]
+
+    return pd.DataFrame({
+        "date": receipt_days(frame),
+        "merchant": frame["merchant_name"].astype(str),
+        "amount": frame["total_amount"],
+        "category": frame["category"].astype(str),
+        "id": short_ids
+    }, index=frame.index).reset_index(drop=True)
+
+
+def frame_table_rows(frame: pd.DataFrame) -> List[List]:
+    """
+    Dashboard table rows [Date, Merchant, Amount, Category, ID]
+    Same output as format_receipts_for_display(normalize_receipts(...)).
+    """
+
+    rows = normalize_receipt_frame(frame)
+    if rows.empty:
+        return []
+
+    rows["amount"] = rows["amount"].map(format_currency)
+    return rows.values.tolist()
@@ -0,0 +1,191 @@
+"""
+Receipt Mirror
+Local columnar copy of the receipts collection (see receipt_frame)
+Kept in sync with the store through an updated_at watermark
+and persisted to disk as a Parquet snapshot
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+import pandas as pd
+
+from services.receipt_frame import build_receipt_frame
+from services.storage import ReceiptStore
+
+
+class ReceiptMirror:
+    """
+    Local mirror of a remote ReceiptStore (Firestore)
+
+    On the first refresh the on-disk snapshot is loaded; only receipts
+    changed (or deleted) since its newest updated_at are fetched.
+    Without a snapshot the collection is read once in full.
+    """
+
+    # Re-read a short window before the watermark so writes from
+    # hosts with slightly skewed clocks are not missed
+    WATERMARK_OVERLAP = timedelta(minutes=5)
+
+    # Deletion tombstones are kept this long past the watermark, so
+    # other replicas' mirrors and snapshots up to this old still see
+    # them; an older snapshot is discarded for a full sync instead
+    TOMBSTONE_RETENTION = timedelta(days=7)
+
+    # Seconds between tombstone prunes
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, store: ReceiptStore, snapshot_path: str):
+        self.store = store
+        self.snapshot_path = snapshot_path
+        self._frame = None
+        self._lock = threading.Lock()
+        self._pruned_at = None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        Current mirrored receipts (call refresh() first)
+        """
+
+        if self._frame is None:
+            return build_receipt_frame([])
+        return self._frame
+
+    @property
+    def watermark(self):
+        """
+        Newest updated_at held locally, or None when empty
+        """
+
+        if self._frame is None or self._frame.empty:
+            return None
+        return self._frame["updated_at"].max()
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Bring the mirror up to date and return its frame
+        """
+
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._load_snapshot()
+
+                if self._frame is None or self._snapshot_expired():
+                    self._full_sync()
+                else:
+                    self._delta_sync()
+            else:
+                self._delta_sync()
+
+            self._prune_tombstones()
+
+            return self._frame
+
+    def _snapshot_expired(self) -> bool:
+        # Tombstones this snapshot still needs may have been pruned
+        watermark = self.watermark
+        return (
+            watermark is not None
+            and watermark < pd.Timestamp.now(tz="UTC") - self.TOMBSTONE_RETENTION
+        )
+
+    def _prune_tombstones(self):
+        """
+        Delete tombstones the mirror has synced past (at most hourly)
+        """
+
+        watermark = self.watermark
+        now = time.monotonic()
+        if watermark is None or (
+            self._pruned_at is not None
+            and now - self._pruned_at < self.PRUNE_INTERVAL
+        ):
+            return
+
+        self._pruned_at = now
+        before = watermark - self.WATERMARK_OVERLAP - self.TOMBSTONE_RETENTION
+
+        try:
+            pruned = self.store.prune_deletions_before(before.to_pydatetime())
+            if pruned:
+                print(f"✓ Receipt mirror pruned {pruned} deletion tombstone(s)")
+
+        except Exception as e:
+            print(f"✗ Receipt mirror tombstone prune error: {e}")
+
+    def _full_sync(self):
+        self._frame = build_receipt_frame(self.store.iter_receipts())
+        self._save_snapshot()
+        print(f"✓ Receipt mirror fully synced ({len(self._frame)} receipts)")
+
+    def _delta_sync(self):
+        watermark = self.watermark
+        if watermark is None:
+            self._full_sync()
+            return
+
+        since = (watermark - self.WATERMARK_OVERLAP).to_pydatetime()
+        changed_frame = build_receipt_frame(
+            self.store.iter_receipts_updated_since(since)
+        )
+        deleted = self.store.get_deleted_receipt_ids_since(since)
+
+        # The overlap window returns receipts already held locally;
+        # keep only those that are new or have a newer updated_at
+        known = self._frame.set_index("id")["updated_at"]
+        changed_frame = changed_frame[
+            changed_frame["updated_at"] != changed_frame["id"].map(known)
+        ]
+        deleted = [
+            receipt_id for receipt_id in deleted if receipt_id in known.index
+        ]
+
+        if changed_frame.empty and not deleted:
+            return
+
+        stale_ids = set(changed_frame["id"]) | set(deleted)
+
+        frame = self._frame[~self._frame["id"].isin(stale_ids)]
+        if not changed_frame.empty:
+            frame = pd.concat([frame, changed_frame], ignore_index=True)
+
+        # concat falls back to object dtype when categories differ
+        self._frame = build_receipt_frame(frame)
+        self._save_snapshot()
+
+    def recent(self, limit: int) -> List[Dict]:
+        """
+        Most recent receipts from the local copy, newest first
+        """
+
+        return self.frame.head(limit).to_dict("records")
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return None
+
+        try:
+            frame = pd.read_parquet(self.snapshot_path)
+            print(f"✓ Receipt mirror loaded snapshot ({len(frame)} receipts)")
+            return build_receipt_frame(frame)
+
+        except Exception as e:
+            print(f"✗ Receipt mirror snapshot read error: {e}")
+            return None
+
+    def _save_snapshot(self):
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f"{self.snapshot_path}.tmp"
+            self._frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.snapshot_path)
+
+        except Exception as e:
+            print(f"✗ Receipt mirror snapshot write error: {e}")
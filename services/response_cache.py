@@ -0,0 +1,151 @@
+"""
+Response Cache for Pilot
+Bounded LRU + TTL cache of Gemini answers, keyed on the normalized
+question and a version stamp of the user's receipt data
+Optionally backed by an on-disk SQLite tier that survives restarts
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """
+    Two-tier response cache
+
+    Memory tier: OrderedDict in LRU order, at most max_entries items.
+    Disk tier (optional): SQLite table consulted on memory misses.
+    Entries older than ttl_seconds are treated as misses in both tiers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600,
+        disk_path: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._disk = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            with self._disk:
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                    "stored_at REAL NOT NULL)"
+                )
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """
+        Lowercase, collapse whitespace and drop trailing punctuation
+        """
+
+        question = re.sub(r"\s+", " ", question.strip().lower())
+        return question.rstrip("?!. ")
+
+    def make_key(self, question: str, data_version: str = "") -> str:
+        raw = f"{data_version}\x00{self.normalize_question(question)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, question: str, data_version: str = "") -> Optional[str]:
+        """
+        Cached response, or None on a miss
+        """
+
+        key = self.make_key(question, data_version)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                del self._entries[key]
+
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self._remember(key, entry)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, question: str, data_version: str, response: str):
+        """
+        Store a response in both tiers
+        """
+
+        key = self.make_key(question, data_version)
+        entry = (response, time.time())
+
+        with self._lock:
+            self._remember(key, entry)
+
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                        (key, entry[0], entry[1])
+                    )
+                    self._disk.execute(
+                        "DELETE FROM responses WHERE stored_at < ?",
+                        (entry[1] - self.ttl_seconds,)
+                    )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def _remember(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple]:
+        if self._disk is None:
+            return None
+
+        row = self._disk.execute(
+            "SELECT response, stored_at FROM responses WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl_seconds:
+            return None
+
+        return row
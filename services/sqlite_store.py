@@ -0,0 +1,647 @@
+"""
+SQLite Receipt Store
+Embedded single-node storage backend
+(no network round trips; also used for local profiling)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.aggregates import ROLLUP_DIMENSIONS, rollup_totals
+from services.storage import DEFAULT_USER_ID, TABLE_SORT_FIELDS, ReceiptStore
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS receipts (
+    id TEXT PRIMARY KEY,
+    merchant_name TEXT,
+    category TEXT,
+    total_amount REAL,
+    transaction_date TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    user_id TEXT NOT NULL DEFAULT 'default'
+);
+
+CREATE TABLE IF NOT EXISTS receipt_deletions (
+    id TEXT PRIMARY KEY,
+    deleted_at TEXT NOT NULL,
+    user_id TEXT NOT NULL DEFAULT 'default'
+);
+
+CREATE TABLE IF NOT EXISTS receipt_rollups (
+    user_id TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    total REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, dimension, key)
+);
+"""
+
+# Every query filters on user_id first, so it leads each index
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_receipts_created_at
+    ON receipts (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_receipts_updated_at
+    ON receipts (user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_receipts_transaction_date
+    ON receipts (user_id, transaction_date);
+CREATE INDEX IF NOT EXISTS idx_receipts_category
+    ON receipts (user_id, category);
+CREATE INDEX IF NOT EXISTS idx_receipts_merchant_name
+    ON receipts (user_id, merchant_name);
+CREATE INDEX IF NOT EXISTS idx_receipts_total_amount
+    ON receipts (user_id, total_amount);
+CREATE INDEX IF NOT EXISTS idx_receipt_deletions_deleted_at
+    ON receipt_deletions (user_id, deleted_at);
+"""
+
+RECEIPT_COLUMNS = (
+    "id, merchant_name, category, total_amount, transaction_date, "
+    "created_at, updated_at, data, user_id"
+)
+
+INSERT_RECEIPT = (
+    f"INSERT INTO receipts ({RECEIPT_COLUMNS}) "
+    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Same keys as services.aggregates.rollup_keys, as SQL expressions
+ROLLUP_BACKFILL = {
+    "day": "substr(created_at, 1, 10)",
+    "month": "substr(created_at, 1, 7)",
+    "category": "COALESCE(category, '')",
+    "merchant": "COALESCE(merchant_name, '')"
+}
+
+UPSERT_ROLLUP = (
+    "INSERT INTO receipt_rollups VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (user_id, dimension, key) DO UPDATE SET "
+    "total = total + excluded.total, count = count + excluded.count"
+)
+
+# Transactions table ordering per sort key (see TABLE_SORT_FIELDS);
+# text sorts case-insensitively, like the fallback
+TABLE_ORDER = {
+    "date": "created_at",
+    "amount": "total_amount",
+    "merchant": "COALESCE(merchant_name, '') COLLATE NOCASE",
+    "category": "COALESCE(category, '') COLLATE NOCASE"
+}
+
+# Fixed-width timestamps so text comparison matches time order
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _to_text(value: datetime) -> str:
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def _from_text(value: str) -> datetime:
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+class SQLiteReceiptStore(ReceiptStore):
+    """
+    Receipt storage backed by a local SQLite database
+    All users share one database; rows carry a user_id column.
+    """
+
+    # Bound parameters per IN (...) lookup (SQLite's default limit is 999)
+    MAX_QUERY_PARAMS = 500
+
+    def __init__(self, db_path: str, user_id: str = DEFAULT_USER_ID):
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self.db_path = db_path
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self._lock = threading.Lock()
+
+            with self._lock, self.conn:
+                if db_path != ":memory:":
+                    self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.executescript(SCHEMA)
+                self._migrate()
+                self.conn.executescript(INDEXES)
+                self._backfill_rollups()
+
+            print(f"✓ SQLite store initialized ({db_path})")
+
+        except Exception as e:
+            print(f"✗ SQLite initialization error: {e}")
+            raise
+
+        super().__init__(user_id)
+
+    def _migrate(self):
+        # Databases created before per-user partitioning: existing rows
+        # belong to the default user; rollups are rebuilt per user
+        for table in ("receipts", "receipt_deletions"):
+            if "user_id" not in _columns(self.conn, table):
+                self.conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN "
+                    f"user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}'"
+                )
+
+                # Recreated with user_id leading by INDEXES
+                indexes = self.conn.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                    (table,)
+                ).fetchall()
+                for (name,) in indexes:
+                    self.conn.execute(f"DROP INDEX {name}")
+
+        if "user_id" not in _columns(self.conn, "receipt_rollups"):
+            self.conn.execute("DROP TABLE receipt_rollups")
+            self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _row_to_receipt(row: sqlite3.Row) -> Dict:
+        data = json.loads(row["data"])
+        data["id"] = row["id"]
+        data["created_at"] = _from_text(row["created_at"])
+        data["updated_at"] = _from_text(row["updated_at"])
+        return data
+
+    def _receipt_row(self, receipt_id: str, receipt_data: Dict) -> Tuple:
+        payload = {
+            key: value for key, value in receipt_data.items()
+            if key not in ("id", "created_at", "updated_at")
+        }
+
+        return (
+            receipt_id,
+            receipt_data.get("merchant_name"),
+            receipt_data.get("category"),
+            receipt_data.get("total_amount"),
+            receipt_data.get("transaction_date"),
+            _to_text(receipt_data["created_at"]),
+            _to_text(receipt_data["updated_at"]),
+            json.dumps(payload, default=str),
+            self.user_id
+        )
+
+    def _backfill_rollups(self):
+        # Databases created before rollups existed get them built once
+        if self.conn.execute("SELECT 1 FROM receipt_rollups LIMIT 1").fetchone():
+            return
+
+        for dimension, expression in ROLLUP_BACKFILL.items():
+            self.conn.execute(
+                f"INSERT INTO receipt_rollups "
+                f"SELECT user_id, ?, {expression}, SUM(total_amount), COUNT(*) "
+                f"FROM receipts WHERE total_amount > 0 "
+                f"GROUP BY user_id, {expression}",
+                (dimension,)
+            )
+
+    def _apply_rollups(self, receipts: List[Dict], sign: int = 1):
+        """
+        Add (or with sign=-1, remove) receipts from the rollup table
+        Call inside the transaction that writes the receipts.
+        """
+
+        rows = [
+            (self.user_id, dimension, key, sign * total, sign * count)
+            for dimension, keys in rollup_totals(receipts).items()
+            for key, (total, count) in keys.items()
+        ]
+        self.conn.executemany(UPSERT_ROLLUP, rows)
+
+        if sign < 0:
+            self.conn.executemany(
+                "DELETE FROM receipt_rollups "
+                "WHERE user_id = ? AND dimension = ? AND key = ? "
+                "AND count <= 0",
+                [row[:3] for row in rows]
+            )
+
+    def save_receipt_data(self, receipt_data: Dict) -> str:
+        """
+        Save receipt data to SQLite
+        """
+
+        receipt_data["created_at"] = datetime.now()
+        receipt_data["updated_at"] = datetime.now()
+        receipt_id = uuid.uuid4().hex
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                INSERT_RECEIPT,
+                self._receipt_row(receipt_id, receipt_data)
+            )
+            self._apply_rollups([receipt_data])
+
+        self._on_receipt_saved(receipt_id, receipt_data)
+
+        return receipt_id
+
+    def save_receipts_batch(
+        self,
+        receipts: List[Dict],
+        receipt_ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Save several receipts in a single transaction
+        """
+
+        if receipt_ids is not None:
+            return super().save_receipts_batch(receipts, receipt_ids)
+
+        rows = []
+        for receipt_data in receipts:
+            receipt_data["created_at"] = datetime.now()
+            receipt_data["updated_at"] = datetime.now()
+            rows.append(self._receipt_row(uuid.uuid4().hex, receipt_data))
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                INSERT_RECEIPT,
+                rows
+            )
+            self._apply_rollups(receipts)
+
+        for row, receipt_data in zip(rows, receipts):
+            self._on_receipt_saved(row[0], receipt_data)
+
+        return [row[0] for row in rows]
+
+    def import_receipts(self, receipts: List[Dict]) -> List[str]:
+        """
+        Insert receipts with their own IDs and timestamps, skipping
+        IDs already stored (see ReceiptStore), in one transaction
+        """
+
+        ids = [receipt["id"] for receipt in receipts]
+        sources = [r["source_id"] for r in receipts if r.get("source_id")]
+        fresh = []
+
+        with self._lock, self.conn:
+            existing = self._existing_ids(ids)
+            # Source IDs only count when they name one of this user's receipts
+            existing.update(self._existing_ids(sources, own=True))
+
+            for receipt_data in receipts:
+                if receipt_data["id"] in existing:
+                    continue
+                if receipt_data.get("source_id") in existing:
+                    continue
+                existing.add(receipt_data["id"])
+                fresh.append(receipt_data)
+
+            self.conn.executemany(
+                INSERT_RECEIPT,
+                [self._receipt_row(r["id"], r) for r in fresh]
+            )
+            self._apply_rollups(fresh)
+
+        for receipt_data in fresh:
+            self._on_receipt_saved(receipt_data["id"], receipt_data)
+
+        return [receipt_data["id"] for receipt_data in fresh]
+
+    def _existing_ids(self, ids: List[str], own: bool = False) -> set:
+        """
+        Which of ids are stored receipts (only this user's when own),
+        looked up MAX_QUERY_PARAMS at a time
+        """
+
+        scope, params = ("user_id = ? AND ", (self.user_id,)) if own else ("", ())
+        existing = set()
+        for start in range(0, len(ids), self.MAX_QUERY_PARAMS):
+            chunk = ids[start:start + self.MAX_QUERY_PARAMS]
+            existing.update(
+                row["id"] for row in self.conn.execute(
+                    f"SELECT id FROM receipts "
+                    f"WHERE {scope}id IN ({', '.join('?' * len(chunk))})",
+                    (*params, *chunk)
+                )
+            )
+
+        return existing
+
+    def get_receipts_page(
+        self,
+        page_size: int = ReceiptStore.PAGE_SIZE,
+        start_after: Optional[Any] = None
+    ) -> Tuple[List[Dict], Optional[Any]]:
+        """
+        Fetch one page of receipts, newest first
+        The cursor is the (created_at, id) key of the last row.
+        """
+
+        if start_after is None:
+            sql = (
+                "SELECT * FROM receipts WHERE user_id = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT ?"
+            )
+            params = (self.user_id, page_size)
+        else:
+            sql = (
+                "SELECT * FROM receipts "
+                "WHERE user_id = ? AND (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?"
+            )
+            params = (self.user_id, *start_after, page_size)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        receipts = [self._row_to_receipt(row) for row in rows]
+        cursor = None
+        if len(rows) == page_size:
+            cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+        return receipts, cursor
+
+    def iter_receipts_between(
+        self,
+        start: datetime,
+        end: datetime,
+        page_size: int = ReceiptStore.PAGE_SIZE,
+        categories: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts with start <= created_at < end, newest first
+        (optionally only some categories)
+        A range scan on the (user_id, created_at, id) index.
+        """
+
+        in_categories, category_params = "", ()
+        if categories:
+            category_params = tuple(categories)
+            in_categories = (
+                f"AND category IN ({', '.join('?' * len(categories))}) "
+            )
+
+        sql = (
+            "SELECT * FROM receipts "
+            "WHERE user_id = ? AND created_at >= ? AND created_at < ? "
+            + in_categories
+        )
+        params = (self.user_id, _to_text(start), _to_text(end), *category_params)
+
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    sql + "ORDER BY created_at DESC, id DESC LIMIT ?",
+                    (*params, page_size)
+                ).fetchall()
+
+            for row in rows:
+                yield self._row_to_receipt(row)
+
+            if len(rows) < page_size:
+                break
+
+            sql = (
+                "SELECT * FROM receipts "
+                "WHERE user_id = ? AND created_at >= ? "
+                "AND (created_at, id) < (?, ?) "
+                + in_categories
+            )
+            params = (
+                self.user_id, _to_text(start),
+                rows[-1]["created_at"], rows[-1]["id"],
+                *category_params
+            )
+
+    def iter_receipts_updated_since(
+        self,
+        since: datetime,
+        page_size: int = ReceiptStore.PAGE_SIZE
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts whose updated_at is after the given watermark
+        """
+
+        sql = "SELECT * FROM receipts WHERE user_id = ? AND updated_at > ? "
+        params = (self.user_id, _to_text(since))
+
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    sql + "ORDER BY updated_at, id LIMIT ?",
+                    (*params, page_size)
+                ).fetchall()
+
+            for row in rows:
+                yield self._row_to_receipt(row)
+
+            if len(rows) < page_size:
+                break
+
+            sql = (
+                "SELECT * FROM receipts "
+                "WHERE user_id = ? AND (updated_at, id) > (?, ?) "
+            )
+            params = (self.user_id, rows[-1]["updated_at"], rows[-1]["id"])
+
+    def get_deleted_receipt_ids_since(self, since: datetime) -> List[str]:
+        """
+        IDs of receipts deleted after the given watermark
+        """
+
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id FROM receipt_deletions "
+                "WHERE user_id = ? AND deleted_at > ? "
+                "ORDER BY deleted_at",
+                (self.user_id, _to_text(since))
+            ).fetchall()
+
+        return [row["id"] for row in rows]
+
+    def prune_deletions_before(self, before: datetime) -> int:
+        """
+        Drop deletion tombstones older than before
+        """
+
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM receipt_deletions "
+                "WHERE user_id = ? AND deleted_at < ?",
+                (self.user_id, _to_text(before))
+            )
+
+        return cursor.rowcount
+
+    def search_receipts(
+        self,
+        search: str = "",
+        sort_by: str = "date",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = ReceiptStore.PAGE_SIZE,
+        window: Optional[Tuple[datetime, datetime]] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        One page of the transactions table (see ReceiptStore)
+        A COUNT plus a LIMIT / OFFSET query; only the page is read.
+        """
+
+        if sort_by not in TABLE_SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort_by}")
+
+        where = "WHERE user_id = ? AND total_amount > 0 "
+        params = [self.user_id]
+
+        if window is not None:
+            where += "AND created_at >= ? AND created_at < ? "
+            params += [_to_text(window[0]), _to_text(window[1])]
+
+        needle = search.strip()
+        if needle:
+            # LIKE is case-insensitive for ASCII; escape its wildcards
+            pattern = "%" + (
+                needle.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            ) + "%"
+            where += (
+                "AND (merchant_name LIKE ? ESCAPE '\\' "
+                "OR category LIKE ? ESCAPE '\\') "
+            )
+            params += [pattern, pattern]
+
+        direction = "DESC" if descending else "ASC"
+        # Ties break on date, then id (without repeating the sort column)
+        order = ", ".join(
+            f"{column} {direction}"
+            for column in dict.fromkeys((TABLE_ORDER[sort_by], "created_at", "id"))
+        )
+
+        with self._lock:
+            (total,) = self.conn.execute(
+                f"SELECT COUNT(*) FROM receipts {where}", params
+            ).fetchone()
+            rows = self.conn.execute(
+                f"SELECT * FROM receipts {where}ORDER BY {order} "
+                f"LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+
+        return [self._row_to_receipt(row) for row in rows], total
+
+    def get_spending_totals(self) -> Dict:
+        """
+        Headline figures computed by SQLite (see ReceiptStore)
+        """
+
+        with self._lock:
+            count, total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_amount), 0) "
+                "FROM receipts WHERE user_id = ? AND total_amount > 0",
+                (self.user_id,)
+            ).fetchone()
+
+        return {
+            "total_spent": total,
+            "total_receipts": count,
+            "average_transaction": total / count if count else 0
+        }
+
+    def get_category_totals(self) -> Dict[str, Dict]:
+        """
+        Per-category breakdown computed by SQLite (see ReceiptStore)
+        """
+
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT COALESCE(category, ''), SUM(total_amount), COUNT(*) "
+                "FROM receipts WHERE user_id = ? AND total_amount > 0 "
+                "GROUP BY COALESCE(category, '')",
+                (self.user_id,)
+            ).fetchall()
+
+        return {
+            category: {
+                "total": total,
+                "count": count,
+                "average": total / count
+            }
+            for category, total, count in rows
+        }
+
+    def get_rollup(self, dimension: str) -> Dict[str, Tuple[float, int]]:
+        """
+        Read one dimension from the rollup table (see ReceiptStore)
+        """
+
+        if dimension not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, total, count FROM receipt_rollups "
+                "WHERE user_id = ? AND dimension = ? AND count > 0",
+                (self.user_id, dimension)
+            ).fetchall()
+
+        return {key: (total, count) for key, total, count in rows}
+
+    def get_receipt_by_id(self, receipt_id: str) -> Optional[Dict]:
+        """
+        Get a receipt by ID
+        """
+
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT * FROM receipts WHERE id = ? AND user_id = ?",
+                    (receipt_id, self.user_id)
+                ).fetchone()
+
+            return self._row_to_receipt(row) if row else None
+
+        except Exception as e:
+            print(f"✗ SQLite get error: {e}")
+            return None
+
+    def delete_receipt(self, receipt_id: str) -> bool:
+        """
+        Delete a receipt
+        """
+
+        try:
+            with self._lock, self.conn:
+                row = self.conn.execute(
+                    "SELECT * FROM receipts WHERE id = ? AND user_id = ?",
+                    (receipt_id, self.user_id)
+                ).fetchone()
+
+                if row:
+                    self.conn.execute(
+                        "DELETE FROM receipts WHERE id = ?",
+                        (receipt_id,)
+                    )
+                    self._apply_rollups([self._row_to_receipt(row)], sign=-1)
+
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO receipt_deletions "
+                        "(id, deleted_at, user_id) VALUES (?, ?, ?)",
+                        (receipt_id, _to_text(datetime.now()), self.user_id)
+                    )
+
+            self._on_receipt_deleted(receipt_id)
+
+            return True
+        except Exception as e:
+            print(f"✗ SQLite delete error: {e}")
+            return False
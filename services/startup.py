@@ -0,0 +1,192 @@
+"""
+Startup Orchestration
+Heavy clients (Firestore, Gemini, Document AI) are initialized on
+background threads so the web server can bind right away
+Each phase of startup is timed and every service reports its state
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from services.metrics import STARTUP_PHASE_SECONDS
+
+# Service states reported by the readiness endpoint
+PENDING = "pending"
+STARTING = "starting"
+READY = "ready"
+FAILED = "failed"
+
+
+class StartupTimer:
+    """
+    Records how long each startup phase took (seconds)
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.phases[name] = round(seconds, 4)
+        STARTUP_PHASE_SECONDS.labels(phase=name).set(seconds)
+        print(f"⏱ {name}: {seconds * 1000:.0f} ms")
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def mark(self, name: str):
+        """Record the time elapsed since process start under name"""
+
+        self.record(name, time.perf_counter() - self.started_at)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.phases)
+
+
+class LazyService:
+    """
+    Handle to a service built by a factory on first use or in the background
+
+    Attribute access is forwarded to the real object and waits for it
+    to finish initializing, so UI code can hold the handle as if it
+    were the service itself. The handle's own members are prefixed
+    (service_*, init_*) so they never shadow the service's. A failed
+    initialization is retried on the next use instead of requiring a
+    process restart.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        timer: Optional[StartupTimer] = None
+    ):
+        self.service_name = name
+        self._factory = factory
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._instance = None
+        self.init_state = PENDING
+        self.init_error: Optional[str] = None
+        self.init_seconds: Optional[float] = None
+
+    def _claim(self) -> bool:
+        """Move pending/failed to starting; False if someone else is on it"""
+
+        with self._lock:
+            if self.init_state not in (PENDING, FAILED):
+                return False
+            self.init_state = STARTING
+            self.init_error = None
+            self._done.clear()
+            return True
+
+    def _initialize(self):
+        start = time.perf_counter()
+        try:
+            instance = self._factory()
+        except Exception as e:
+            print(f"✗ {self.service_name} initialization error: {e}")
+            with self._lock:
+                self.init_state = FAILED
+                self.init_error = str(e)
+        else:
+            with self._lock:
+                self._instance = instance
+                self.init_state = READY
+        finally:
+            self.init_seconds = round(time.perf_counter() - start, 4)
+            if self._timer is not None:
+                self._timer.record(f"service:{self.service_name}", self.init_seconds)
+            self._done.set()
+
+    def start_background(self):
+        """Begin initializing on a background thread"""
+
+        if self._claim():
+            threading.Thread(
+                target=self._initialize,
+                name=f"init-{self.service_name}",
+                daemon=True
+            ).start()
+
+    def resolve(self, timeout: Optional[float] = None):
+        """Return the service, initializing it here if nobody has yet"""
+
+        if self.init_state == READY:
+            return self._instance
+
+        if self._claim():
+            self._initialize()
+        elif not self._done.wait(timeout):
+            raise TimeoutError(f"{self.service_name} is still starting")
+
+        if self.init_state != READY:
+            raise RuntimeError(f"{self.service_name} unavailable: {self.init_error}")
+
+        return self._instance
+
+    def service_status(self) -> Dict[str, Any]:
+        return {
+            "state": self.init_state,
+            "error": self.init_error,
+            "init_seconds": self.init_seconds
+        }
+
+    def __getattr__(self, attr):
+        # Only reached for attributes the handle itself does not define
+        return getattr(self.resolve(), attr)
+
+
+class ServiceRegistry:
+    """
+    Named LazyServices plus the startup timer, for the health endpoints
+    """
+
+    def __init__(self, timer: Optional[StartupTimer] = None):
+        self.timer = timer or StartupTimer()
+        self.services: Dict[str, LazyService] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> LazyService:
+        service = LazyService(name, factory, self.timer)
+        self.services[name] = service
+        return service
+
+    def start(self):
+        """Initialize every registered service in parallel"""
+
+        for service in self.services.values():
+            service.start_background()
+
+    @property
+    def ready(self) -> bool:
+        return all(s.init_state == READY for s in self.services.values())
+
+    def status(self) -> Dict[str, Any]:
+        states = [s.init_state for s in self.services.values()]
+        if FAILED in states:
+            overall = "degraded"
+        elif self.ready:
+            overall = "ready"
+        else:
+            overall = "starting"
+
+        return {
+            "status": overall,
+            "services": {
+                name: service.service_status()
+                for name, service in self.services.items()
+            },
+            "startup": self.timer.as_dict()
+        }
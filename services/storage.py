@@ -0,0 +1,469 @@
+"""
+Receipt Storage Interface
+Common base for persistence backends (Firestore, SQLite)
+and the factory that picks one from Settings
+"""
+
+import copy
+import heapq
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.aggregates import ROLLUP_DIMENSIONS, SpendingAggregates
+
+# Owner of receipts saved without a signed-in user (and of all
+# receipts saved before storage was partitioned per user)
+DEFAULT_USER_ID = "default"
+
+# Transactions table sort keys and the receipt field each one orders by
+TABLE_SORT_FIELDS = {
+    "date": "created_at",
+    "amount": "total_amount",
+    "merchant": "merchant_name",
+    "category": "category"
+}
+
+
+def request_user_id(request) -> str:
+    """
+    User ID for a Gradio request: the signed-in username when the app
+    runs with authentication (see Settings.APP_USERS), else the default
+    """
+
+    return getattr(request, "username", None) or DEFAULT_USER_ID
+
+
+def _table_value(receipt: Dict, field: str):
+    # Comparable value of one table field: amounts and dates as floats
+    # (missing ones sort as 0), text lower-cased
+    value = receipt.get(field)
+
+    if field == "total_amount":
+        try:
+            return float(value or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    if field == "created_at":
+        return value.timestamp() if isinstance(value, datetime) else 0.0
+
+    return str(value or "").lower()
+
+
+class ReceiptStore(ABC):
+    """
+    Persistence backend for receipts
+
+    Backends implement the document operations; paginated iteration,
+    the legacy get_all_receipts and the running aggregates are shared.
+
+    Every store instance is scoped to one user: reads, writes and the
+    running aggregates only ever see that user's receipts. for_user()
+    returns a scoped store that shares the backend connection.
+    """
+
+    # Documents fetched per round trip by the paginated readers
+    PAGE_SIZE = 500
+
+    def __init__(self, user_id: str = DEFAULT_USER_ID):
+        self._user_stores: Dict[str, "ReceiptStore"] = {user_id: self}
+        self._user_stores_lock = threading.Lock()
+        self._scope(user_id)
+
+    def _scope(self, user_id: str):
+        self.user_id = user_id
+        self.aggregates = SpendingAggregates()
+        self._aggregates_loaded = False
+        self._aggregates_lock = threading.Lock()
+        # Bumped by every save or delete through this store
+        self.write_count = 0
+
+    def for_user(self, user_id: Optional[str]) -> "ReceiptStore":
+        """
+        Get the store scoped to user_id (DEFAULT_USER_ID when empty)
+        Scoped stores are cached, so each user's running aggregates
+        are loaded once and then kept up to date.
+        """
+
+        user_id = user_id or DEFAULT_USER_ID
+        if user_id == self.user_id:
+            return self
+
+        with self._user_stores_lock:
+            store = self._user_stores.get(user_id)
+            if store is None:
+                # Shallow copy: shares the client / connection and the
+                # cache of scoped stores, with fresh per-user state
+                store = copy.copy(self)
+                store._scope(user_id)
+                self._user_stores[user_id] = store
+
+        return store
+
+    # ------------------------------------------------------------------
+    # Backend operations
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def save_receipt_data(self, receipt_data: Dict) -> str:
+        """
+        Save a receipt and return its ID
+        Sets created_at and updated_at on receipt_data.
+        """
+
+    def save_receipts_batch(
+        self,
+        receipts: List[Dict],
+        receipt_ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Save several receipts and return their IDs in order
+        Backends override this with a single batched write. Given
+        receipt_ids, each receipt is saved under its ID with the
+        batched import and one already stored is left alone, so
+        retrying a batch whose write did land saves nothing twice.
+        """
+
+        if receipt_ids is None:
+            return [self.save_receipt_data(receipt) for receipt in receipts]
+
+        now = datetime.now()
+        for receipt_data, receipt_id in zip(receipts, receipt_ids):
+            receipt_data.update(id=receipt_id, created_at=now, updated_at=now)
+
+        self.import_receipts(receipts)
+        return list(receipt_ids)
+
+    @abstractmethod
+    def import_receipts(self, receipts: List[Dict]) -> List[str]:
+        """
+        Save receipts that bring their own "id", "created_at" and
+        "updated_at" (e.g. rows of a bank export; see bulk_import)
+        Receipts whose ID is already stored are skipped, so importing
+        the same file twice is harmless; so are receipts whose
+        "source_id" is the ID of one of this user's receipts (an export
+        of the store read back in). Returns the IDs written.
+        """
+
+    @abstractmethod
+    def get_receipts_page(
+        self,
+        page_size: int = PAGE_SIZE,
+        start_after: Optional[Any] = None
+    ) -> Tuple[List[Dict], Optional[Any]]:
+        """
+        Fetch one page of receipts, newest first
+        Returns (receipts, cursor); pass the cursor back as start_after
+        to get the next page. The cursor is None after the last page.
+        Timestamps are left as datetimes.
+        """
+
+    @abstractmethod
+    def get_receipt_by_id(self, receipt_id: str) -> Optional[Dict]:
+        """
+        Get a receipt by ID
+        """
+
+    @abstractmethod
+    def delete_receipt(self, receipt_id: str) -> bool:
+        """
+        Delete a receipt
+        """
+
+    @abstractmethod
+    def iter_receipts_updated_since(
+        self,
+        since: datetime,
+        page_size: int = PAGE_SIZE
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts whose updated_at is after the given watermark
+        """
+
+    @abstractmethod
+    def get_deleted_receipt_ids_since(self, since: datetime) -> List[str]:
+        """
+        IDs of receipts deleted after the given watermark
+        """
+
+    @abstractmethod
+    def prune_deletions_before(self, before: datetime) -> int:
+        """
+        Drop deletion tombstones older than before; returns how many
+        Only safe once every mirror has synced past before.
+        """
+
+    # ------------------------------------------------------------------
+    # Shared reads
+    # ------------------------------------------------------------------
+
+    def iter_receipts(
+        self,
+        page_size: int = PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts newest first, one page at a time
+        Only a single page is held in memory. Stops after limit
+        receipts when given. Read errors are raised to the caller.
+        """
+
+        cursor = None
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            receipts, cursor = self.get_receipts_page(size, cursor)
+
+            yield from receipts
+
+            if remaining is not None:
+                remaining -= len(receipts)
+            if cursor is None:
+                break
+
+    def iter_receipts_between(
+        self,
+        start: datetime,
+        end: datetime,
+        page_size: int = PAGE_SIZE,
+        categories: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream receipts with start <= created_at < end, newest first
+        Limited to the given categories when any are given. Backends
+        override this with a range query so only receipts in the window
+        are read; this fallback walks back from the newest receipt and
+        stops at the first one older than start.
+        """
+
+        wanted = set(categories or ())
+
+        for receipt in self.iter_receipts(page_size):
+            created_at = receipt.get("created_at")
+            if created_at is None or created_at >= end:
+                continue
+            if created_at < start:
+                break
+            if wanted and receipt.get("category") not in wanted:
+                continue
+            yield receipt
+
+    def get_recent_receipts(self, limit: int = 10) -> List[Dict]:
+        """
+        Fetch the most recent receipts without reading the collection
+        """
+
+        try:
+            receipts, _ = self.get_receipts_page(limit)
+            return receipts
+
+        except Exception as e:
+            print(f"✗ Receipt read error: {e}")
+            return []
+
+    def get_all_receipts(self) -> List[Dict]:
+        """
+        Fetch all receipts
+        Prefer iter_receipts or get_recent_receipts for large collections.
+        """
+
+        try:
+            receipts = []
+
+            for data in self.iter_receipts():
+                if "created_at" in data:
+                    data["created_at"] = data["created_at"].strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    )
+
+                receipts.append(data)
+
+            return receipts
+
+        except Exception as e:
+            print(f"✗ Receipt read error: {e}")
+            return []
+
+    # ------------------------------------------------------------------
+    # Table pages
+    # ------------------------------------------------------------------
+
+    def search_receipts(
+        self,
+        search: str = "",
+        sort_by: str = "date",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = PAGE_SIZE,
+        window: Optional[Tuple[datetime, datetime]] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        One page of the transactions table and the number of matches
+        Lists receipts with a positive amount, optionally only those
+        created inside window ([start, end)) and whose merchant or
+        category contains search (case-insensitive). sort_by is a key
+        of TABLE_SORT_FIELDS; ties are broken by date, then ID.
+        Backends override this with a query that reads only the page;
+        this fallback streams every receipt once, holding at most
+        offset + limit of them.
+        """
+
+        if sort_by not in TABLE_SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort_by}")
+
+        field = TABLE_SORT_FIELDS[sort_by]
+        needle = search.strip().lower()
+        receipts = (
+            self.iter_receipts() if window is None
+            else self.iter_receipts_between(*window)
+        )
+        matched = 0
+
+        def matches():
+            nonlocal matched
+            for receipt in receipts:
+                if _table_value(receipt, "total_amount") <= 0:
+                    continue
+                if needle and not any(
+                    needle in _table_value(receipt, text_field)
+                    for text_field in ("merchant_name", "category")
+                ):
+                    continue
+                matched += 1
+                yield receipt
+
+        def sort_key(receipt):
+            return (
+                _table_value(receipt, field),
+                _table_value(receipt, "created_at"),
+                str(receipt.get("id", ""))
+            )
+
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        page = pick(offset + limit, matches(), key=sort_key)[offset:]
+        return page, matched
+
+    # ------------------------------------------------------------------
+    # Aggregation queries
+    # ------------------------------------------------------------------
+
+    def get_spending_totals(self) -> Dict:
+        """
+        Headline figures: total_spent, total_receipts, average_transaction
+        Receipts with a non-positive amount are not counted.
+        Computed client-side from the running aggregates; backends with
+        server-side aggregation override this.
+        """
+
+        summary = self.get_aggregates().summary()
+        return {
+            "total_spent": summary["total_spent"],
+            "total_receipts": summary["total_receipts"],
+            "average_transaction": summary["average_transaction"]
+        }
+
+    def get_category_totals(self) -> Dict[str, Dict]:
+        """
+        Per-category breakdown: {category: {total, count, average}}
+        """
+
+        return {
+            category: {
+                "total": amount,
+                "count": count,
+                "average": amount / count if count else 0
+            }
+            for category, (amount, count)
+            in self.get_aggregates().totals("category").items()
+        }
+
+    # ------------------------------------------------------------------
+    # Rollups
+    # ------------------------------------------------------------------
+
+    def get_rollup(self, dimension: str) -> Dict[str, Tuple[float, int]]:
+        """
+        Get {key: (total_amount, count)} for one rollup dimension
+        (day, month, category or merchant; see ROLLUP_DIMENSIONS)
+        Backends that materialize rollups on write read them directly;
+        this fallback derives them from the running aggregates.
+        """
+
+        if dimension not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+
+        aggregates = self.get_aggregates()
+
+        if dimension == "category" or dimension == "merchant":
+            return aggregates.totals(dimension)
+
+        days = aggregates.totals("date")
+        if dimension == "day":
+            return days
+
+        months = {}
+        for day, (amount, count) in days.items():
+            total, seen = months.get(day[:7], (0.0, 0))
+            months[day[:7]] = (total + amount, seen + count)
+        return months
+
+    # ------------------------------------------------------------------
+    # Running aggregates
+    # ------------------------------------------------------------------
+
+    def get_aggregates(self) -> SpendingAggregates:
+        """
+        Get running spending totals
+        The first call loads every receipt once; after that the totals
+        are kept up to date by save_receipt_data and delete_receipt.
+        """
+
+        with self._aggregates_lock:
+            if not self._aggregates_loaded:
+                self.aggregates.load(self.iter_receipts())
+                self._aggregates_loaded = True
+
+        return self.aggregates
+
+    # Until the aggregates are first loaded there is nothing to keep up
+    # to date: the load reads every receipt, including these
+
+    def _on_receipt_saved(self, receipt_id: str, receipt_data: Dict):
+        with self._aggregates_lock:
+            self.write_count += 1
+            if self._aggregates_loaded:
+                self.aggregates.upsert(receipt_id, receipt_data)
+
+    def _on_receipt_deleted(self, receipt_id: str):
+        with self._aggregates_lock:
+            self.write_count += 1
+            if self._aggregates_loaded:
+                self.aggregates.discard(receipt_id)
+
+
+def create_receipt_store() -> ReceiptStore:
+    """
+    Build the storage backend selected by Settings.STORAGE_BACKEND
+    """
+
+    from config.settings import Settings
+
+    backend = Settings.STORAGE_BACKEND
+
+    if backend == "sqlite":
+        from services.sqlite_store import SQLiteReceiptStore
+        return SQLiteReceiptStore(Settings.SQLITE_DB_PATH)
+
+    if backend == "firebase":
+        from services.firebase_manager import FirebaseManager
+        store = FirebaseManager()
+        # Receipts saved before rollups existed (SQLite does this on open);
+        # per-user collections came later and always had rollups
+        if store.backfill_rollups():
+            print("✓ Rollups backfilled for existing receipts")
+        return store
+
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,62 @@
+from datetime import datetime
+from services.aggregates import SpendingAggregates
+
+
+def make_receipt(receipt_id, merchant, category, amount, day):
+    return {
+        "id": receipt_id,
+        "merchant_name": merchant,
+        "category": category,
+        "total_amount": amount,
+        "created_at": datetime(2025, 1, day, 12, 0, 0),
+    }
+
+
+def test_incremental_updates_match_full_load():
+    receipts = [
+        make_receipt("a", "Amazon", "Shopping", 100.0, 1),
+        make_receipt("b", "Starbucks", "Dining", 50.0, 1),
+        make_receipt("c", "Amazon", "Shopping", 25.0, 2),
+    ]
+
+    full = SpendingAggregates()
+    full.load(receipts)
+
+    incremental = SpendingAggregates()
+    for r in receipts:
+        incremental.upsert(r["id"], r)
+
+    for dim in SpendingAggregates.DIMENSIONS:
+        assert full.totals(dim) == incremental.totals(dim)
+
+    assert full.totals("category")["Shopping"] == (125.0, 2)
+    assert full.totals("date")["2025-01-01"] == (150.0, 2)
+    assert full.summary()["total_receipts"] == 3
+
+
+def test_upsert_is_idempotent_and_discard_removes():
+    aggregates = SpendingAggregates()
+    receipt = make_receipt("a", "Zomato", "Dining", 80.0, 3)
+
+    aggregates.upsert("a", receipt)
+    aggregates.upsert("a", receipt)
+    assert aggregates.summary()["total_spent"] == 80.0
+
+    aggregates.discard("a")
+    aggregates.discard("missing")
+    assert len(aggregates) == 0
+    assert aggregates.totals("merchant") == {}
+    assert aggregates.to_frame("category").empty
+
+
+def test_non_positive_amounts_are_skipped():
+    aggregates = SpendingAggregates()
+    aggregates.upsert("a", make_receipt("a", "Walmart", "Groceries", 0, 4))
+    assert aggregates.summary()["total_receipts"] == 0
+
+
+if __name__ == "__main__":
+    test_incremental_updates_match_full_load()
+    test_upsert_is_idempotent_and_discard_removes()
+    test_non_positive_amounts_are_skipped()
+    print("Aggregates tests passed")
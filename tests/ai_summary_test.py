@@ -0,0 +1,138 @@
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from services.ai_prompt import build_prompt, estimate_tokens
+from services.ai_summary import (
+    SummaryCache,
+    build_financial_summary,
+    summarize_store,
+    summary_version
+)
+
+
+def make_store(n):
+    start = datetime(2024, 1, 1)
+    return make_firebase_store(
+        {
+            "id": f"r{i}",
+            "merchant_name": f"Merchant {i % 97}",
+            "category": f"Category {i % 13}",
+            "total_amount": 10.0 + i % 50,
+            # Spread every history over the same two years
+            "created_at": start + timedelta(days=730 * i / n),
+        }
+        for i in range(n)
+    )
+
+
+def test_summary_size_is_independent_of_history():
+    small = summarize_store(make_store(200))
+    large = summarize_store(make_store(20000))
+
+    assert "Top categories" in large and "Top merchants" in large
+    assert "Month-over-month" in large
+    assert len(large.splitlines()) == len(small.splitlines())
+    assert abs(len(large) - len(small)) < 100
+
+
+def test_summary_accepts_plain_inputs():
+    summary = build_financial_summary(
+        {"total_expense": 300, "transaction_count": 3, "average_expense": 100},
+        {"Food": 200, "Books": 100},
+        {"2026-01": 100, "2026-02": 200},
+        100.0,
+    )
+
+    assert summary.splitlines()[0].startswith("Total spent: ₹300.00")
+    assert "+100.0%" in summary
+    assert "Food ₹200.00 (67%)" in summary
+
+    empty = build_financial_summary({}, None, None, None)
+    assert empty == "No transactions recorded yet."
+
+
+def test_month_over_month_compares_adjacent_calendar_months():
+    store = make_firebase_store([
+        {"id": "a", "total_amount": 100.0, "created_at": datetime(2026, 1, 5)},
+        {"id": "b", "total_amount": 150.0, "created_at": datetime(2026, 3, 5)},
+    ])
+
+    # February had no spending: no change is reported against March
+    summary = summarize_store(store)
+    assert "Month-over-month" not in summary
+    assert "2026-02 ₹0.00" in summary
+
+    store.import_receipts(
+        [{"id": "c", "total_amount": 50.0, "created_at": datetime(2026, 2, 1)}]
+    )
+    assert "+200.0%" in summarize_store(store)
+
+
+def test_store_summary_reads_only_totals_and_rollups():
+    receipts = make_receipts(3000)
+    store = make_firebase_store(receipts)
+
+    summary = summarize_store(store)
+
+    assert store.db.collection("receipts").reads == 0
+    assert "Total spent" in summary and "Top merchants" in summary
+
+    version = summary_version(summary)
+    store.save_receipt_data(
+        {"merchant_name": "New", "category": "Dining", "total_amount": 12.0}
+    )
+    assert summary_version(summarize_store(store)) != version
+
+
+def test_summary_cache_reuses_summary_until_store_writes():
+    store = make_firebase_store(make_receipts(500))
+    receipts = store.db.collection("receipts")
+    cache = SummaryCache(ttl_seconds=60)
+
+    summary, version = cache.get(store)
+    queries = receipts.aggregations
+    assert cache.get(store) == (summary, version)
+    assert receipts.aggregations == queries
+
+    store.save_receipt_data(
+        {"merchant_name": "New", "category": "Dining", "total_amount": 12.0}
+    )
+    assert cache.get(store)[1] != version
+    assert receipts.aggregations > queries
+
+    # Writes from other instances are picked up once the entry expires
+    expired = SummaryCache(ttl_seconds=-1)
+    expired.get(store)
+    queries = receipts.aggregations
+    expired.get(store)
+    assert receipts.aggregations > queries
+
+
+def test_prompt_respects_hard_budget():
+    summary = summarize_store(make_store(5000))
+
+    full = build_prompt(summary, "How can I save more money?", max_tokens=2000)
+    assert "Top categories" in full and full.endswith("save more money?")
+
+    tight = build_prompt(summary, "How can I save more money?", max_tokens=120)
+    assert estimate_tokens(tight) <= 120
+    assert "Total spent" in tight
+    assert "Monthly spending" not in tight
+
+    huge_question = build_prompt(summary, "why " * 5000, max_tokens=150)
+    assert estimate_tokens(huge_question) <= 150
+
+
+if __name__ == "__main__":
+    test_summary_size_is_independent_of_history()
+    test_summary_accepts_plain_inputs()
+    test_month_over_month_compares_adjacent_calendar_months()
+    test_store_summary_reads_only_totals_and_rollups()
+    test_summary_cache_reuses_summary_until_store_writes()
+    test_prompt_respects_hard_budget()
+    print("AI summary tests passed")
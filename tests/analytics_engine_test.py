@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from benchmarks.analytics_benchmark import make_transactions, run
+from services.analytics_data import load_transactions_csv, transactions_from_receipts
+from services.analytics_metrics import (
+    compute_basic_metrics,
+    compute_category_totals,
+    compute_monthly_totals,
+    compute_month_over_month_change,
+)
+
+
+def test_metrics_on_expenses_csv():
+    df = load_transactions_csv("expenses.csv")
+
+    basic = compute_basic_metrics(df)
+    assert basic["total_income"] == 3000
+    assert basic["total_expense"] == 1215
+    assert basic["net_savings"] == 1785
+    assert basic["expense_count"] == 5
+
+    category = compute_category_totals(df)
+    assert list(category.index) == ["Books", "Transport", "Entertainment", "Food"]
+    assert category["Food"] == 165
+    assert "Allowance" not in category.index
+
+    monthly = compute_monthly_totals(df)
+    assert monthly.to_dict() == {"2026-01": 1215.0}
+    assert compute_month_over_month_change(monthly) is None
+
+
+def test_matches_pandas_groupby_reference():
+    df = make_transactions(20_000, seed=7)
+    expenses = df[df["type"] == "expense"]
+
+    reference = expenses.groupby("category", observed=True)["amount"].sum()
+    category = compute_category_totals(df)
+    assert (category.sort_index() - reference.sort_index()).abs().max() < 1e-6
+
+    monthly = compute_monthly_totals(df)
+    reference = expenses.groupby(expenses["date"].dt.to_period("M"))["amount"].sum()
+    assert list(monthly.index) == [str(p) for p in reference.index]
+    assert abs(monthly.sum() - reference.sum()) < 1e-6
+
+    change = compute_month_over_month_change(monthly)
+    expected = (monthly.iloc[-1] - monthly.iloc[-2]) / monthly.iloc[-2] * 100
+    assert abs(change - expected) < 0.01
+
+
+def test_receipts_map_to_expense_transactions():
+    df = transactions_from_receipts([
+        {"created_at": datetime(2025, 2, 1), "total_amount": 40,
+         "category": "Dining", "merchant_name": "Starbucks"},
+        {"created_at": "2025-03-01 10:00:00", "total_amount": "60.5",
+         "category": "Dining", "merchant_name": "Zomato"},
+    ])
+
+    assert list(df["type"].unique()) == ["expense"]
+    assert compute_monthly_totals(df).to_dict() == {"2025-02": 40.0, "2025-03": 60.5}
+    assert compute_month_over_month_change(compute_monthly_totals(df)) == 51.25
+
+
+def test_million_transactions_under_a_second():
+    timings = run(1_000_000, repeat=1)
+    assert timings["full_pipeline"] < 1.0
+
+
+if __name__ == "__main__":
+    test_metrics_on_expenses_csv()
+    test_matches_pandas_groupby_reference()
+    test_receipts_map_to_expense_transactions()
+    test_million_transactions_under_a_second()
+    print("Analytics engine tests passed")
@@ -0,0 +1,76 @@
+import json
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from benchmarks import receipts_benchmark
+from benchmarks.fakes import make_firebase_store, make_gemini_manager
+from benchmarks.synthetic import make_receipts
+
+
+def test_synthetic_receipts_are_seeded():
+    assert make_receipts(100, seed=7) == make_receipts(100, seed=7)
+    assert make_receipts(100, seed=7) != make_receipts(100, seed=8)
+
+
+def test_in_memory_firestore_behaves_like_the_store():
+    receipts = make_receipts(1200)
+    store = make_firebase_store(receipts)
+
+    ids = [r["id"] for r in store.iter_receipts(page_size=500)]
+    assert sorted(ids) == sorted(r["id"] for r in receipts)
+
+    newest = max(receipts, key=lambda r: r["created_at"])
+    assert store.get_recent_receipts(1)[0]["id"] == newest["id"]
+
+    new_id = store.save_receipt_data({
+        "merchant_name": "Amazon", "category": "Shopping", "total_amount": 10.0
+    })
+    assert store.get_receipt_by_id(new_id)["merchant_name"] == "Amazon"
+    assert store.delete_receipt(new_id)
+    assert store.get_receipt_by_id(new_id) is None
+
+
+def test_fake_gemini_streams_a_reply():
+    manager = make_gemini_manager()
+    reply = "".join(manager.stream_response("How am I doing?"))
+
+    assert reply.strip() == manager.model.REPLY
+    assert len(manager.model.prompts) == 1
+
+
+def test_suite_writes_json_and_flags_regressions(tmp_path):
+    output = tmp_path / "results.json"
+    assert receipts_benchmark.main(
+        ["--sizes", "50", "--repeat", "1", "--output", str(output)]
+    ) == 0
+
+    results = json.loads(output.read_text())
+    cases = results["results"]["50"]
+    assert {"load_dashboard_cold", "normalize_receipts_all",
+            "calculate_spending_summary", "monthly_expense_chart",
+            "category_expense_chart", "upload_batch"} <= set(cases)
+
+    # A baseline that is impossibly fast turns every case into a regression
+    for timing in cases.values():
+        timing["best"] = 1e-9
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results))
+
+    assert receipts_benchmark.main([
+        "--sizes", "50", "--repeat", "1",
+        "--output", str(output), "--baseline", str(baseline)
+    ]) == 1
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_synthetic_receipts_are_seeded()
+    test_in_memory_firestore_behaves_like_the_store()
+    test_fake_gemini_streams_a_reply()
+    with tempfile.TemporaryDirectory() as directory:
+        test_suite_writes_json_and_flags_regressions(pathlib.Path(directory))
+    print("Benchmark suite tests passed")
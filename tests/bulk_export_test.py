@@ -0,0 +1,168 @@
+import io
+import os
+import tempfile
+from datetime import datetime
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from services.bulk_export import (
+    EXPORT_COLUMNS,
+    export_window,
+    iter_export_pages,
+    write_export
+)
+from services.bulk_import import import_transactions
+from services.sqlite_store import SQLiteReceiptStore
+
+
+def test_export_window_bounds():
+    assert export_window("", "") is None
+    assert export_window("2026-01-01", "2026-01-31") == (
+        datetime(2026, 1, 1), datetime(2026, 2, 1)
+    )
+
+    start, end = export_window(end_date="2026-01-31")
+    assert start < datetime(2000, 1, 1) and end == datetime(2026, 2, 1)
+
+    with pytest.raises(ValueError):
+        export_window("2026-02-01", "2026-01-01")
+
+
+def test_pages_stream_only_the_window():
+    receipts = make_receipts(2000)
+    store = make_firebase_store(receipts)
+    window = (datetime(2025, 11, 1), datetime(2025, 12, 1))
+
+    pages = list(iter_export_pages(
+        store, window, categories=["Dining", "Travel"], page_size=50
+    ))
+
+    in_window = [
+        r for r in receipts if window[0] <= r["created_at"] < window[1]
+    ]
+    expected = [r for r in in_window if r["category"] in ("Dining", "Travel")]
+
+    assert all(len(page) <= 50 for page in pages)
+    exported = pd.concat(pages)
+    assert list(exported.columns) == EXPORT_COLUMNS
+    assert sorted(exported["id"]) == sorted(r["id"] for r in expected)
+    assert exported["date"].between("2025-11-01", "2025-11-30").all()
+    # Only receipts in the window and the categories are read
+    assert store.db.collection("receipts").reads == len(expected)
+
+
+def test_sqlite_pages_filter_categories_in_the_query():
+    store = SQLiteReceiptStore(":memory:")
+    store.save_receipts_batch([
+        {"merchant_name": f"M{i}", "category": category, "total_amount": i + 1.0}
+        for i, category in enumerate(["Dining", "Travel", "Other"] * 40)
+    ])
+
+    pages = list(iter_export_pages(store, categories=["Travel"], page_size=15))
+
+    assert [len(page) for page in pages] == [15, 15, 10]
+    assert set(pd.concat(pages)["category"]) == {"Travel"}
+
+
+def test_old_export_files_are_removed():
+    from ui.export import remove_old_exports
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old, new = os.path.join(tmp, "old.csv"), os.path.join(tmp, "new.csv")
+        for path in (old, new):
+            open(path, "w").close()
+        os.utime(old, (0, 0))
+
+        remove_old_exports(tmp, max_age=60)
+
+        assert os.listdir(tmp) == ["new.csv"]
+
+
+def test_csv_export_round_trips_through_import():
+    source = SQLiteReceiptStore(":memory:")
+    source.save_receipts_batch([
+        {"merchant_name": f"M{i % 7}", "category": "Dining", "total_amount": i + 1.5}
+        for i in range(120)
+    ])
+
+    buffer = io.StringIO()
+    rows = write_export(iter_export_pages(source, page_size=25), buffer)
+    assert rows == 120
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.csv")
+        with open(path, "w") as handle:
+            handle.write(buffer.getvalue())
+
+        target = SQLiteReceiptStore(":memory:")
+        report = import_transactions(path, target)
+
+    assert report.imported == 120
+    assert target.get_spending_totals()["total_spent"] == pytest.approx(
+        source.get_spending_totals()["total_spent"]
+    )
+
+
+EXPENSES_CSV = os.path.join(os.path.dirname(__file__), "..", "expenses.csv")
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "firebase"])
+def test_export_reimports_into_the_same_store_as_duplicates(backend):
+    store = (
+        SQLiteReceiptStore(":memory:") if backend == "sqlite"
+        else make_firebase_store()
+    )
+    import_transactions(EXPENSES_CSV, store)
+    store.save_receipts_batch([
+        {"merchant_name": "Canteen", "category": "Food", "total_amount": 80.0},
+        {"merchant_name": "Print Shop", "category": "Books", "total_amount": 35.5}
+    ])
+    before = store.get_spending_totals()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.csv")
+        assert write_export(iter_export_pages(store), path) == 7
+
+        report = import_transactions(path, store)
+
+    assert (report.imported, report.duplicates) == (0, 7)
+    assert store.get_spending_totals() == before
+    assert before["total_spent"] == pytest.approx(1215 + 80 + 35.5)
+
+
+def test_parquet_export_writes_a_row_group_per_page():
+    import pyarrow.parquet as pq
+
+    store = make_firebase_store(make_receipts(300))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.parquet")
+        rows = write_export(iter_export_pages(store, page_size=100), path, "parquet")
+        parquet = pq.ParquetFile(path)
+
+        assert rows == 300
+        assert parquet.metadata.num_rows == 300
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.schema_arrow.names == EXPORT_COLUMNS
+
+        empty = os.path.join(tmp, "empty.parquet")
+        assert write_export(iter([]), empty, "parquet") == 0
+        assert pq.ParquetFile(empty).metadata.num_rows == 0
+
+
+if __name__ == "__main__":
+    test_export_window_bounds()
+    test_pages_stream_only_the_window()
+    test_sqlite_pages_filter_categories_in_the_query()
+    test_old_export_files_are_removed()
+    test_csv_export_round_trips_through_import()
+    test_export_reimports_into_the_same_store_as_duplicates("sqlite")
+    test_export_reimports_into_the_same_store_as_duplicates("firebase")
+    test_parquet_export_writes_a_row_group_per_page()
+    print("✓ bulk export tests passed")
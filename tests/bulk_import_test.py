@@ -0,0 +1,125 @@
+import os
+import tempfile
+from datetime import datetime
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from services.bulk_import import (
+    import_file,
+    import_transactions,
+    normalize_chunk
+)
+from services.sqlite_store import SQLiteReceiptStore
+
+EXPENSES_CSV = os.path.join(os.path.dirname(__file__), "..", "expenses.csv")
+
+
+def write_transactions(path: str, count: int, duplicate_every: int = 0):
+    # Synthetic bank export: every 10th row is income and, when asked,
+    # every duplicate_every-th row repeats an earlier ID
+    rng = np.random.default_rng(7)
+    ids = [f"tx{i}" for i in range(count)]
+    if duplicate_every:
+        for i in range(duplicate_every, count, duplicate_every):
+            ids[i] = ids[i // 2]
+
+    df = pd.DataFrame({
+        "id": ids,
+        "date": pd.date_range("2020-01-01", periods=count, freq="h").strftime("%Y-%m-%d"),
+        "type": ["income" if i % 10 == 0 else "expense" for i in range(count)],
+        "amount": rng.integers(1, 5000, count).astype(float),
+        "category": rng.choice(["Food", "Transport", "Books"], count),
+        "merchant": rng.choice(["Canteen", "Bus Pass", "Book Store"], count),
+        "notes": ""
+    })
+
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return df
+
+
+def test_normalize_chunk_validates_column_wise():
+    chunk = pd.DataFrame({
+        "ID": ["a", "b", "c", "d", "e", "", "a", "f"],
+        "Date": [
+            "2026-01-01", "31/01/2026", "not a date", "2026-01-02",
+            "2026-01-03", "2026-01-04", "2026-01-05", "2026-01-06"
+        ],
+        "Type": ["expense", "DEBIT", "expense", "refund", "income", "", "", "credit"],
+        "Amount": ["₹1,234.50", "10", "5", "5", "300", "5", "7", "-2"]
+    })
+
+    expenses, income, invalid = normalize_chunk(chunk)
+
+    assert expenses["id"].tolist() == ["a", "b"]
+    assert expenses["amount"].tolist() == [1234.5, 10.0]
+    assert expenses["date"].tolist() == [datetime(2026, 1, 1), datetime(2026, 1, 31)]
+    assert expenses["category"].tolist() == ["Other", "Other"]
+    assert income == 1
+    # bad date, unknown type, missing ID, negative amount
+    assert invalid == 4
+
+    with pytest.raises(ValueError):
+        normalize_chunk(pd.DataFrame({"id": ["a"], "amount": ["1"]}))
+
+
+def test_expenses_csv_imports_once():
+    store = SQLiteReceiptStore(":memory:")
+
+    report = import_transactions(EXPENSES_CSV, store)
+    assert (report.rows, report.imported, report.income) == (6, 5, 1)
+    assert report.progress == 1.0
+
+    totals = store.get_spending_totals()
+    assert totals["total_receipts"] == 5
+    assert totals["total_spent"] == pytest.approx(120 + 45 + 300 + 550 + 200)
+    assert store.get_rollup("day")["2026-01-02"] == (345.0, 2)
+    assert store.get_aggregates().summary()["total_spent"] == pytest.approx(1215)
+
+    again = import_transactions(EXPENSES_CSV, store)
+    assert (again.imported, again.duplicates) == (0, 5)
+    assert store.get_spending_totals()["total_receipts"] == 5
+
+    # Each user gets their own copy
+    other = store.for_user("alice")
+    assert import_transactions(EXPENSES_CSV, other).imported == 5
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_large_file_is_streamed_in_chunks(extension):
+    store = make_firebase_store()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export" + extension)
+        df = write_transactions(path, 3000, duplicate_every=7)
+
+        reports = [
+            (r.rows, r.imported) for r in import_file(path, store, chunk_size=500)
+        ]
+
+    assert len(reports) == 6
+    assert [rows for rows, _ in reports] == list(range(500, 3001, 500))
+
+    expenses = df[df["type"] == "expense"].drop_duplicates("id")
+    imported = reports[-1][1]
+    assert imported == len(expenses)
+    assert store.get_spending_totals()["total_spent"] == pytest.approx(
+        expenses["amount"].sum()
+    )
+    assert sum(count for _, count in store.get_rollup("month").values()) == imported
+
+
+if __name__ == "__main__":
+    test_normalize_chunk_validates_column_wise()
+    test_expenses_csv_imports_once()
+    test_large_file_is_streamed_in_chunks(".csv")
+    test_large_file_is_streamed_in_chunks(".parquet")
+    print("✓ bulk import tests passed")
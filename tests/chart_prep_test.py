@@ -0,0 +1,90 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import gradio as gr
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from config.settings import Settings
+from services.chart_prep import OTHER, downsample_series, top_n_with_other
+from ui.dashboard import create_dashboard_tab
+
+
+def daily_series(start: str, end: str) -> pd.DataFrame:
+    days = pd.date_range(start, end, freq="D")
+    return pd.DataFrame({"date": days.strftime("%Y-%m-%d"), "amount": 1.0})
+
+
+def test_top_n_folds_the_rest_into_other():
+    df = pd.DataFrame({
+        "merchant": [f"m{i}" for i in range(30)] + [OTHER],
+        "amount": [float(i) for i in range(30)] + [100.0]
+    })
+
+    top = top_n_with_other(df, "merchant", 5)
+
+    assert len(top) == 6
+    assert top["merchant"].tolist().count(OTHER) == 1
+    assert set(top["merchant"]) - {OTHER} == {"m29", "m28", "m27", "m26", "m25"}
+    assert top["amount"].sum() == pytest.approx(df["amount"].sum())
+    assert top["amount"].is_monotonic_decreasing
+
+
+def test_top_n_leaves_short_frames_alone():
+    df = pd.DataFrame({"category": ["Dining", "Travel"], "amount": [5.0, 9.0]})
+
+    top = top_n_with_other(df, "category", 5)
+
+    assert top["category"].tolist() == ["Travel", "Dining"]
+    assert top_n_with_other(df.head(0), "category", 5).empty
+
+
+def test_downsample_picks_the_finest_bin_within_budget():
+    series = daily_series("2020-01-01", "2024-12-31")
+
+    assert downsample_series(series, 5000) is series
+
+    weekly = downsample_series(series, 300)
+    assert len(weekly) <= 300
+    assert weekly["date"].iloc[1] == "2020-01-06"  # a Monday
+
+    monthly = downsample_series(series, 100)
+    assert len(monthly) == 60
+    assert monthly["date"].iloc[0] == "2020-01-01"
+    assert monthly["amount"].iloc[1] == 29  # leap year February
+
+    for budget in (300, 100, 4, 2):
+        binned = downsample_series(series, budget)
+        assert len(binned) <= budget
+        assert binned["amount"].sum() == pytest.approx(len(series))
+        assert binned["date"].is_monotonic_increasing
+
+
+def test_dashboard_charts_stay_within_budget(monkeypatch):
+    monkeypatch.setattr(Settings, "CHART_TOP_N", 3)
+    monkeypatch.setattr(Settings, "CHART_MAX_POINTS", 20)
+
+    receipts = make_receipts(2000)
+    store = make_firebase_store(receipts)
+    with gr.Blocks():
+        load_dashboard = create_dashboard_tab(store)[0]
+
+    _, _, _, categories, merchants, days, *_ = load_dashboard()
+
+    total = sum(r["total_amount"] for r in receipts)
+    assert len(categories) <= 4
+    assert len(merchants) <= 4
+    assert len(days) <= 20
+    for chart in (categories, merchants, days):
+        assert chart["amount"].sum() == pytest.approx(total)
+
+
+if __name__ == "__main__":
+    test_top_n_folds_the_rest_into_other()
+    test_top_n_leaves_short_frames_alone()
+    test_downsample_picks_the_finest_bin_within_budget()
+    print("✓ chart prep tests passed")
@@ -0,0 +1,128 @@
+import os
+from datetime import datetime
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import gradio as gr
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from services.date_range import (
+    ALL_TIME,
+    CUSTOM,
+    LAST_90_DAYS,
+    THIS_MONTH,
+    THIS_WEEK,
+    describe_window,
+    resolve_window
+)
+from services.receipt_frame import build_receipt_frame, frame_between
+from services.sqlite_store import SQLiteReceiptStore
+from services.storage import ReceiptStore
+from ui.dashboard import create_dashboard_tab
+
+NOW = datetime(2025, 12, 17, 15, 30)  # a Wednesday
+
+
+def test_presets_resolve_to_midnight_bounds():
+    tomorrow = datetime(2025, 12, 18)
+
+    assert resolve_window(ALL_TIME, now=NOW) is None
+    assert resolve_window(THIS_WEEK, now=NOW) == (datetime(2025, 12, 15), tomorrow)
+    assert resolve_window(THIS_MONTH, now=NOW) == (datetime(2025, 12, 1), tomorrow)
+    assert resolve_window(LAST_90_DAYS, now=NOW) == (datetime(2025, 9, 19), tomorrow)
+
+
+def test_custom_range_includes_end_date():
+    window = resolve_window(CUSTOM, "2025-01-01", "2025-01-31")
+
+    assert window == (datetime(2025, 1, 1), datetime(2025, 2, 1))
+    assert describe_window(window) == "2025-01-01 to 2025-01-31"
+
+    with pytest.raises(ValueError):
+        resolve_window(CUSTOM, "2025-02-01", "2025-01-01")
+    with pytest.raises(ValueError):
+        resolve_window(CUSTOM, "last week", "2025-01-01")
+
+
+def window_ids(receipts, start, end):
+    return {r["id"] for r in receipts if start <= r["created_at"] < end}
+
+
+def test_firebase_range_query_reads_only_the_window():
+    receipts = make_receipts(3000)
+    store = make_firebase_store(receipts)
+    start, end = datetime(2025, 12, 1), datetime(2026, 1, 1)
+
+    found = list(store.iter_receipts_between(start, end, page_size=50))
+
+    expected = window_ids(receipts, start, end)
+    assert {r["id"] for r in found} == expected
+    assert [r["created_at"] for r in found] == sorted(
+        (r["created_at"] for r in found), reverse=True
+    )
+    assert store.db.collection("receipts").reads == len(expected)
+
+
+def test_sqlite_range_query_matches_fallback():
+    store = SQLiteReceiptStore(":memory:")
+    store.save_receipts_batch([
+        {"merchant_name": f"M{i}", "total_amount": 10.0} for i in range(7)
+    ])
+    created = sorted(r["created_at"] for r in store.iter_receipts())
+    start, end = created[2], created[5]
+
+    found = [r["id"] for r in store.iter_receipts_between(start, end, page_size=2)]
+    fallback = [
+        r["id"] for r in ReceiptStore.iter_receipts_between(store, start, end)
+    ]
+
+    assert found == fallback
+    assert len(found) == 3
+
+
+def test_frame_between_uses_half_open_bounds():
+    frame = build_receipt_frame([
+        {"id": "a", "created_at": datetime(2025, 1, 1)},
+        {"id": "b", "created_at": datetime(2025, 1, 31, 23, 59)},
+        {"id": "c", "created_at": datetime(2025, 2, 1)}
+    ])
+
+    window = frame_between(frame, datetime(2025, 1, 1), datetime(2025, 2, 1))
+    assert sorted(window["id"]) == ["a", "b"]
+
+
+def test_dashboard_window_totals_only_cover_the_window():
+    receipts = make_receipts(2000)
+    store = make_firebase_store(receipts)
+    with gr.Blocks():
+        load_dashboard = create_dashboard_tab(store)[0]
+
+    table, status, summary, categories, merchants, days, *_ = load_dashboard(
+        CUSTOM, "2025-12-01", "2025-12-31"
+    )
+
+    in_window = [
+        r for r in receipts
+        if datetime(2025, 12, 1) <= r["created_at"] < datetime(2026, 1, 1)
+    ]
+    assert f"{len(in_window)} receipt(s)" in status
+    assert categories["amount"].sum() == pytest.approx(
+        sum(r["total_amount"] for r in in_window)
+    )
+    assert days["date"].min() >= "2025-12-01"
+
+    _, status, *_ = load_dashboard(CUSTOM, "2025-12-31", "2025-12-01")
+    assert status.startswith("❌")
+
+
+if __name__ == "__main__":
+    test_presets_resolve_to_midnight_bounds()
+    test_custom_range_includes_end_date()
+    test_firebase_range_query_reads_only_the_window()
+    test_sqlite_range_query_matches_fallback()
+    test_frame_between_uses_half_open_bounds()
+    test_dashboard_window_totals_only_cover_the_window()
+    print("✓ date range tests passed")
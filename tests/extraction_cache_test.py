@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from services.extraction_cache import (
+    CachedDocumentAIProcessor,
+    ExtractionCache,
+    file_sha256
+)
+
+
+class CountingProcessor:
+    def __init__(self):
+        self.calls = 0
+
+    def process_receipt(self, file_path, mime_type):
+        self.calls += 1
+        return {"merchant_name": f"Shop {self.calls}", "total_amount": 10.0}
+
+
+def write_file(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def test_identical_files_skip_extraction():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ExtractionCache(os.path.join(directory, "cache.db"))
+        processor = CountingProcessor()
+        cached = CachedDocumentAIProcessor(processor, cache)
+
+        first = write_file(directory, "a.png", b"receipt-bytes")
+        same = write_file(directory, "copy-of-a.png", b"receipt-bytes")
+        other = write_file(directory, "b.png", b"other-bytes")
+
+        result = cached.process_receipt(first, "image/png")
+        result["original_filename"] = "a.png"
+
+        assert cached.process_receipt(same, "image/png") == {
+            "merchant_name": "Shop 1", "total_amount": 10.0
+        }
+        assert cached.process_receipt(other, "image/png")["merchant_name"] == "Shop 2"
+        assert processor.calls == 2
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+        # Survives a restart
+        reopened = ExtractionCache(os.path.join(directory, "cache.db"))
+        assert reopened.get(file_sha256(first))["merchant_name"] == "Shop 1"
+
+
+def test_size_bound_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as directory:
+        entry = {"raw_text": "x" * 100}
+        cache = ExtractionCache(os.path.join(directory, "cache.db"), max_bytes=250)
+
+        cache.set("a", entry)
+        cache.set("b", entry)
+        cache.get("a")
+        cache.set("c", entry)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == entry
+        assert cache.get("c") == entry
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= 250
+
+
+if __name__ == "__main__":
+    test_identical_files_skip_extraction()
+    test_size_bound_evicts_least_recently_used()
+    print("Extraction cache tests passed")
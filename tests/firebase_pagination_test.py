@@ -0,0 +1,114 @@
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from services.firebase_manager import FirebaseManager
+from services.storage import ReceiptStore
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeQuery:
+    def __init__(self, docs, reads):
+        self._docs = docs
+        self._reads = reads
+        self._limit = None
+        self._after = None
+
+    def order_by(self, field, direction=None):
+        reverse = direction == "DESCENDING"
+        self._docs = sorted(
+            self._docs, key=lambda d: d._data[field], reverse=reverse
+        )
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def start_after(self, doc):
+        self._after = doc
+        return self
+
+    def stream(self):
+        docs = self._docs
+        if self._after is not None:
+            docs = docs[docs.index(self._after) + 1:]
+        if self._limit is not None:
+            docs = docs[:self._limit]
+        self._reads.append(len(docs))
+        return iter(docs)
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.reads = []
+
+    def order_by(self, field, direction=None):
+        return FakeQuery(list(self.docs), self.reads).order_by(field, direction)
+
+
+class FakeDB:
+    def __init__(self, n):
+        start = datetime(2025, 1, 1)
+        self.receipts = FakeCollection([
+            FakeDoc(f"r{i}", {
+                "merchant_name": "Amazon",
+                "category": "Shopping",
+                "total_amount": 10.0,
+                "created_at": start + timedelta(minutes=i),
+            })
+            for i in range(n)
+        ])
+
+    def collection(self, name):
+        return self.receipts
+
+
+def make_manager(n):
+    manager = FirebaseManager.__new__(FirebaseManager)
+    ReceiptStore.__init__(manager)
+    manager.db = FakeDB(n)
+    return manager
+
+
+def test_iter_receipts_walks_every_page():
+    manager = make_manager(25)
+    ids = [r["id"] for r in manager.iter_receipts(page_size=10)]
+
+    assert ids == [f"r{i}" for i in range(24, -1, -1)]
+    assert manager.db.receipts.reads == [10, 10, 5]
+
+
+def test_recent_receipts_read_a_single_page():
+    manager = make_manager(25)
+    recent = manager.get_recent_receipts(3)
+
+    assert [r["id"] for r in recent] == ["r24", "r23", "r22"]
+    assert isinstance(recent[0]["created_at"], datetime)
+    assert manager.db.receipts.reads == [3]
+
+
+def test_limit_stops_pagination_early():
+    manager = make_manager(25)
+    receipts = list(manager.iter_receipts(page_size=10, limit=12))
+
+    assert len(receipts) == 12
+    assert manager.db.receipts.reads == [10, 2]
+
+
+if __name__ == "__main__":
+    test_iter_receipts_walks_every_page()
+    test_recent_receipts_read_a_single_page()
+    test_limit_stops_pagination_early()
+    print("Pagination tests passed")
@@ -0,0 +1,86 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from services.gemini_manager import GeminiManager
+from services.response_cache import ResponseCache
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("no text parts")
+        return self._text
+
+
+class FakeModel:
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.calls = []
+
+    def generate_content(self, prompt, stream=False):
+        self.calls.append((prompt, stream))
+
+        def gen():
+            for i, text in enumerate(self.chunks):
+                if self.fail_after is not None and i == self.fail_after:
+                    raise RuntimeError("connection reset")
+                yield FakeChunk(text)
+
+        return gen()
+
+
+def make_manager(model, response_cache=None):
+    manager = GeminiManager.__new__(GeminiManager)
+    manager.model = model
+    manager.response_cache = response_cache
+    return manager
+
+
+def test_stream_yields_chunks_in_order():
+    model = FakeModel(["Save ", None, "more."])
+    chunks = list(make_manager(model).stream_response("How do I save?"))
+
+    assert chunks == ["Save ", "more."]
+    assert model.calls[0][1] is True
+    assert "How do I save?" in model.calls[0][0]
+
+
+def test_stream_reports_failures():
+    failed = list(make_manager(FakeModel(["a"], fail_after=0)).stream_response("q"))
+    assert failed == ["Gemini API failed. Check terminal logs."]
+
+    partial = list(make_manager(FakeModel(["a", "b"], fail_after=1)).stream_response("q"))
+    assert partial[0] == "a"
+    assert "interrupted" in partial[1]
+
+
+def test_cached_answers_skip_gemini():
+    model = FakeModel(["Budget ", "wisely."])
+    manager = make_manager(model, ResponseCache())
+
+    assert "".join(manager.stream_response("Tips?", "v1")) == "Budget wisely."
+    assert list(manager.stream_response("tips", "v1")) == ["Budget wisely."]
+    assert len(model.calls) == 1
+
+    # A new data version misses the cache
+    list(manager.stream_response("tips", "v2"))
+    assert len(model.calls) == 2
+
+    # Failures are never cached
+    failing = make_manager(FakeModel(["x"], fail_after=0), ResponseCache())
+    list(failing.stream_response("q", "v1"))
+    assert failing.response_cache.get("q", "v1") is None
+
+
+if __name__ == "__main__":
+    test_stream_yields_chunks_in_order()
+    test_stream_reports_failures()
+    test_cached_answers_skip_gemini()
+    print("Gemini streaming tests passed")
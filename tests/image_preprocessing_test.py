@@ -0,0 +1,79 @@
+import os
+import tempfile
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import numpy as np
+from PIL import Image
+
+from services.image_preprocessing import PreprocessingDocumentAIProcessor
+
+# EXIF orientation 6: stored landscape, displayed rotated 90° clockwise
+ORIENTATION = 0x0112
+
+
+class RecordingProcessor:
+    def __init__(self):
+        self.seen = []
+
+    def process_receipt(self, file_path, mime_type):
+        with Image.open(file_path) as image:
+            self.seen.append((mime_type, image.mode, image.size))
+        return {"merchant_name": "Amazon"}
+
+
+def make_photo(path, size=(4000, 3000)):
+    noise = np.random.default_rng(0).integers(0, 255, (size[1], size[0], 3), np.uint8)
+    exif = Image.Exif()
+    exif[ORIENTATION] = 6
+    Image.fromarray(noise).save(path, "JPEG", quality=95, exif=exif)
+
+
+def test_photo_is_rotated_downscaled_and_smaller():
+    with tempfile.TemporaryDirectory() as directory:
+        photo = os.path.join(directory, "receipt.jpg")
+        make_photo(photo)
+
+        recorder = RecordingProcessor()
+        processor = PreprocessingDocumentAIProcessor(recorder, max_dimension=1000)
+
+        assert processor.process_receipt(photo, "image/jpeg") == {"merchant_name": "Amazon"}
+
+        # Portrait after EXIF rotation, longest edge capped, grayscale
+        assert recorder.seen == [("image/jpeg", "L", (750, 1000))]
+
+        stats = processor.stats()
+        assert stats["images"] == 1
+        assert stats["original_bytes"] == os.path.getsize(photo)
+        assert 0 < stats["processed_bytes"] < stats["original_bytes"]
+        assert stats["bytes_saved"] > 0
+
+
+def test_pdfs_and_unreadable_files_pass_through():
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = os.path.join(directory, "receipt.pdf")
+        broken = os.path.join(directory, "broken.png")
+        for path in (pdf, broken):
+            with open(path, "wb") as f:
+                f.write(b"not an image")
+
+        calls = []
+
+        class PathProcessor:
+            def process_receipt(self, file_path, mime_type):
+                calls.append((file_path, mime_type))
+                return {}
+
+        processor = PreprocessingDocumentAIProcessor(PathProcessor())
+        processor.process_receipt(pdf, "application/pdf")
+        processor.process_receipt(broken, "image/png")
+
+        assert calls == [(pdf, "application/pdf"), (broken, "image/png")]
+        assert processor.stats()["images"] == 0
+
+
+if __name__ == "__main__":
+    test_photo_is_rotated_downscaled_and_smaller()
+    test_pdfs_and_unreadable_files_pass_through()
+    print("Image preprocessing tests passed")
@@ -0,0 +1,173 @@
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from services.job_queue import DONE, FAILED, QueueFullError, ReceiptJobQueue
+
+
+class MemoryStore:
+    def __init__(self, failures=0, lost_replies=0):
+        self.saved = {}
+        self.writes = 0
+        self.failures = failures
+        # Writes that land but whose reply never arrives
+        self.lost_replies = lost_replies
+
+    def save_receipts_batch(self, receipts, receipt_ids):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("firestore unavailable")
+
+        self.writes += 1
+        for receipt_data, receipt_id in zip(receipts, receipt_ids):
+            self.saved.setdefault(receipt_id, receipt_data)
+
+        if self.lost_replies:
+            self.lost_replies -= 1
+            raise TimeoutError("deadline exceeded")
+        return receipt_ids
+
+    def for_user(self, user_id):
+        self.user_id = user_id
+        return self
+
+
+class Processor:
+    def __init__(self, gate=None):
+        self.calls = 0
+        self.gate = gate
+
+    def process_receipt(self, file_path, mime_type):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls += 1
+        return {"merchant_name": "Amazon", "total_amount": 10.0}
+
+
+def make_files(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"receipt_{i}.png")
+        with open(path, "wb") as f:
+            f.write(b"png")
+        paths.append(path)
+    return paths
+
+
+def test_jobs_are_processed_in_the_background():
+    with tempfile.TemporaryDirectory() as directory:
+        store = MemoryStore()
+        jobs = ReceiptJobQueue(store, Processor(), workers=3)
+
+        job_ids = [jobs.submit(path) for path in make_files(directory, 5)]
+        assert jobs.wait(job_ids, timeout=5)
+
+        statuses = jobs.status(job_ids)
+        assert [s["state"] for s in statuses] == [DONE] * 5
+        assert statuses[0]["receipt"]["original_filename"] == "receipt_0.png"
+        assert len(store.saved) == 5
+        jobs.shutdown()
+
+
+def test_a_submission_is_saved_in_one_write():
+    with tempfile.TemporaryDirectory() as directory:
+        store = MemoryStore()
+        jobs = ReceiptJobQueue(store, Processor(), workers=3)
+        files = make_files(directory, 4) + [os.path.join(directory, "missing.png")]
+
+        job_ids, rejected = jobs.submit_batch(files, "alice")
+        assert jobs.wait(job_ids, timeout=5)
+
+        assert rejected == []
+        assert [s["state"] for s in jobs.status(job_ids)] == [DONE] * 4 + [FAILED]
+        assert store.writes == 1
+        assert sorted(store.saved) == sorted(job_ids[:4])
+        assert store.user_id == "alice"
+        jobs.shutdown()
+
+
+def test_transient_failures_retry_without_reextracting():
+    with tempfile.TemporaryDirectory() as directory:
+        store = MemoryStore(failures=2)
+        processor = Processor()
+        jobs = ReceiptJobQueue(store, processor, workers=1, backoff_seconds=0.01)
+
+        job_id = jobs.submit(make_files(directory, 1)[0])
+        assert jobs.wait([job_id], timeout=5)
+
+        status = jobs.status([job_id])[0]
+        assert status["state"] == DONE
+        assert status["attempts"] == 3
+        assert processor.calls == 1
+        jobs.shutdown()
+
+
+def test_retrying_a_landed_write_saves_once():
+    with tempfile.TemporaryDirectory() as directory:
+        store = MemoryStore(lost_replies=1)
+        jobs = ReceiptJobQueue(store, Processor(), workers=1, backoff_seconds=0.01)
+
+        job_id = jobs.submit(make_files(directory, 1)[0])
+        assert jobs.wait([job_id], timeout=5)
+
+        status = jobs.status([job_id])[0]
+        assert (status["state"], status["attempts"]) == (DONE, 2)
+        assert list(store.saved) == [job_id]
+        assert status["receipt_id"] == job_id
+        jobs.shutdown()
+
+
+def test_permanent_failures_and_exhausted_retries_fail():
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = ReceiptJobQueue(
+            MemoryStore(failures=10), Processor(),
+            workers=1, max_retries=1, backoff_seconds=0.01
+        )
+
+        missing = jobs.submit(os.path.join(directory, "missing.png"))
+        flaky = jobs.submit(make_files(directory, 1)[0])
+        assert jobs.wait([missing, flaky], timeout=5)
+
+        missing_status, flaky_status = jobs.status([missing, flaky])
+        assert missing_status["state"] == FAILED
+        assert missing_status["attempts"] == 1
+        assert flaky_status["state"] == FAILED
+        assert flaky_status["attempts"] == 2
+        jobs.shutdown()
+
+
+def test_full_queue_pushes_back():
+    with tempfile.TemporaryDirectory() as directory:
+        gate = threading.Event()
+        jobs = ReceiptJobQueue(MemoryStore(), Processor(gate), workers=1, max_depth=1)
+        files = make_files(directory, 3)
+
+        first = jobs.submit(files[0])
+        # Wait until the worker has taken the first job off the queue
+        while jobs.status([first])[0]["state"] == "queued":
+            time.sleep(0.001)
+        second = jobs.submit(files[1])
+
+        try:
+            jobs.submit(files[2])
+            assert False, "expected QueueFullError"
+        except QueueFullError:
+            pass
+
+        gate.set()
+        assert jobs.wait([first, second], timeout=5)
+        jobs.shutdown()
+
+
+if __name__ == "__main__":
+    test_jobs_are_processed_in_the_background()
+    test_a_submission_is_saved_in_one_write()
+    test_transient_failures_retry_without_reextracting()
+    test_retrying_a_landed_write_saves_once()
+    test_permanent_failures_and_exhausted_retries_fail()
+    test_full_queue_pushes_back()
+    print("Job queue tests passed")
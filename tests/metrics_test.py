@@ -0,0 +1,68 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from services.metrics import MetricsRegistry, OPERATION_SECONDS, REGISTRY, track
+from services.document_ai_processor import DocumentAIProcessor
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "test_seconds", "Test latency", ("op",), buckets=(0.1, 1.0)
+    )
+    latency.labels(op="read").observe(0.05)
+    latency.labels(op="read").observe(0.5)
+    latency.labels(op="read").observe(5)
+
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{op="read",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{op="read",le="1"} 2' in text
+    assert 'test_seconds_bucket{op="read",le="+Inf"} 3' in text
+    assert 'test_seconds_count{op="read"} 3' in text
+
+
+def test_counter_and_gauge():
+    registry = MetricsRegistry()
+    errors = registry.counter("test_errors_total", "Errors", ("op",))
+    in_flight = registry.gauge("test_in_flight", "Running")
+
+    errors.labels(op='say "hi"').inc(2)
+    in_flight.labels().inc()
+    in_flight.labels().dec()
+
+    text = registry.render()
+    assert 'test_errors_total{op="say \\"hi\\""} 2' in text
+    assert "test_in_flight 0" in text
+
+
+def test_track_counts_errors_and_restores_in_flight():
+    try:
+        with track("test", "boom"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    text = REGISTRY.render()
+    assert 'pocketpilot_operation_errors_total{component="test",operation="boom"} 1' in text
+    assert 'pocketpilot_operations_in_flight{component="test",operation="boom"} 0' in text
+    assert 'pocketpilot_operation_seconds_count{component="test",operation="boom"} 1' in text
+
+
+def test_extraction_is_instrumented():
+    series = OPERATION_SECONDS.labels(component="document_ai", operation="extract")
+    before = series.count
+
+    DocumentAIProcessor().process_receipt("receipt.png", "image/png")
+
+    assert series.count == before + 1
+
+
+if __name__ == "__main__":
+    test_histogram_renders_cumulative_buckets()
+    test_counter_and_gauge()
+    test_track_counts_errors_and_restores_in_flight()
+    test_extraction_is_instrumented()
+    print("Metrics tests passed")
@@ -0,0 +1,91 @@
+import os
+from datetime import datetime
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import pandas as pd
+
+from services.aggregates import SpendingAggregates
+from services.receipt_frame import build_receipt_frame, frame_table_rows
+from ui.dashboard import normalize_receipts
+from utils.helpers import format_receipts_for_display, generate_short_id
+
+RECEIPTS = [
+    {"id": "doc-a", "merchant_name": "Amazon", "category": "Shopping",
+     "total_amount": 120.5, "created_at": datetime(2025, 1, 2, 9, 30)},
+    {"id": "doc-b", "merchant_name": "Zomato", "category": "Dining",
+     "total_amount": 80.0, "created_at": datetime(2025, 1, 3, 20, 0)},
+    {"id": "doc-c", "merchant_name": "Amazon", "category": "Shopping",
+     "total_amount": 0, "created_at": datetime(2025, 1, 4, 8, 0)},
+]
+
+
+def test_frame_is_dictionary_encoded():
+    frame = build_receipt_frame(RECEIPTS * 1000)
+
+    assert isinstance(frame["merchant_name"].dtype, pd.CategoricalDtype)
+    assert isinstance(frame["category"].dtype, pd.CategoricalDtype)
+    assert frame["total_amount"].dtype == "float64"
+    assert str(frame["created_at"].dtype).startswith("datetime64")
+    assert len(frame["merchant_name"].cat.categories) == 2
+
+
+def test_table_rows_match_legacy_formatting():
+    frame = build_receipt_frame(RECEIPTS)
+    legacy = format_receipts_for_display(
+        normalize_receipts(sorted(RECEIPTS, key=lambda r: r["created_at"], reverse=True))
+    )
+
+    assert frame_table_rows(frame) == legacy
+
+
+def test_load_frame_matches_incremental_load():
+    from_records = SpendingAggregates()
+    from_records.load(RECEIPTS)
+
+    from_frame = SpendingAggregates()
+    from_frame.load_frame(build_receipt_frame(RECEIPTS))
+
+    for dim in SpendingAggregates.DIMENSIONS:
+        assert from_frame.totals(dim) == from_records.totals(dim)
+    assert from_frame.summary() == from_records.summary()
+
+
+def test_normalize_receipts_handles_mixed_inputs():
+    raw = [
+        {"id": "doc-a", "merchant_name": "Amazon", "category": "Shopping",
+         "total_amount": "120.50", "created_at": "2025-01-02 09:30:00"},
+        {"id": "doc-b", "merchant_name": "Zomato", "category": "Dining",
+         "total_amount": 80, "created_at": datetime(2025, 1, 3, 20, 0)},
+        {"id": "doc-c", "merchant_name": "Bad", "category": "Other",
+         "total_amount": "n/a", "created_at": datetime(2025, 1, 4)},
+        {"id": "doc-d", "merchant_name": "Free", "category": "Other",
+         "total_amount": 0, "created_at": datetime(2025, 1, 5)},
+    ]
+
+    assert normalize_receipts(raw) == [
+        {"date": "2025-01-02", "merchant": "Amazon", "amount": 120.5,
+         "category": "Shopping", "id": generate_short_id("doc-a")},
+        {"date": "2025-01-03", "merchant": "Zomato", "amount": 80.0,
+         "category": "Dining", "id": generate_short_id("doc-b")},
+    ]
+    assert normalize_receipts([]) == []
+
+
+def test_short_ids_are_memoized():
+    generate_short_id.cache_clear()
+    normalize_receipts(RECEIPTS * 100)
+
+    info = generate_short_id.cache_info()
+    assert info.currsize == 2
+    assert info.maxsize is not None
+
+
+if __name__ == "__main__":
+    test_frame_is_dictionary_encoded()
+    test_table_rows_match_legacy_formatting()
+    test_load_frame_matches_incremental_load()
+    test_normalize_receipts_handles_mixed_inputs()
+    test_short_ids_are_memoized()
+    print("Receipt frame tests passed")
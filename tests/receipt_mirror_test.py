@@ -0,0 +1,111 @@
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from services.receipt_mirror import ReceiptMirror
+
+START = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+
+
+class FakeFirebase:
+    def __init__(self):
+        self.receipts = {}
+        self.deleted = {}
+        self.full_reads = 0
+        self.delta_reads = 0
+
+    def put(self, receipt_id, amount, minute):
+        ts = START + timedelta(minutes=minute)
+        self.receipts[receipt_id] = {
+            "id": receipt_id,
+            "merchant_name": "Amazon",
+            "category": "Shopping",
+            "total_amount": amount,
+            "created_at": ts,
+            "updated_at": ts,
+        }
+
+    def remove(self, receipt_id, minute):
+        del self.receipts[receipt_id]
+        self.deleted[receipt_id] = START + timedelta(minutes=minute)
+
+    def iter_receipts(self):
+        self.full_reads += 1
+        return iter(list(self.receipts.values()))
+
+    def iter_receipts_updated_since(self, since):
+        changed = [r for r in self.receipts.values() if r["updated_at"] > since]
+        self.delta_reads += len(changed)
+        return iter(changed)
+
+    def get_deleted_receipt_ids_since(self, since):
+        return [rid for rid, ts in self.deleted.items() if ts > since]
+
+    def prune_deletions_before(self, before):
+        stale = [rid for rid, ts in self.deleted.items() if ts < before]
+        for rid in stale:
+            del self.deleted[rid]
+        return len(stale)
+
+
+def test_snapshot_and_delta_sync():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.parquet")
+        firebase = FakeFirebase()
+        for i in range(5):
+            firebase.put(f"r{i}", 10.0, i * 60)
+
+        mirror = ReceiptMirror(firebase, path)
+        assert len(mirror.refresh()) == 5
+        assert firebase.full_reads == 1
+        assert os.path.exists(path)
+
+        # Warm refresh only re-reads the overlap window
+        firebase.delta_reads = 0
+        mirror.refresh()
+        assert firebase.delta_reads == 1
+
+        firebase.put("r5", 20.0, 600)
+        firebase.remove("r0", 601)
+        frame = mirror.refresh()
+        assert set(frame["id"]) == {"r1", "r2", "r3", "r4", "r5"}
+        assert frame["total_amount"].sum() == 60.0
+        assert mirror.recent(1)[0]["id"] == "r5"
+
+        # A cold start loads the snapshot instead of a full read
+        restarted = ReceiptMirror(firebase, path)
+        assert len(restarted.refresh()) == 5
+        assert firebase.full_reads == 1
+
+
+def test_old_tombstones_are_pruned_and_old_snapshots_resynced():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.parquet")
+        firebase = FakeFirebase()
+        firebase.put("r0", 10.0, -20 * 24 * 60)
+        firebase.put("r1", 10.0, -19 * 24 * 60)
+        firebase.remove("r1", -10 * 24 * 60)
+        firebase.put("r2", 10.0, 0)
+        firebase.remove("r0", 1)
+
+        mirror = ReceiptMirror(firebase, path)
+        assert set(mirror.refresh()["id"]) == {"r2"}
+
+        # Only tombstones past the retention window are dropped
+        assert set(firebase.deleted) == {"r0"}
+
+        # A snapshot older than the retention window is not trusted
+        firebase.put("r3", 10.0, 2)
+        stale = ReceiptMirror(firebase, path)
+        stale.TOMBSTONE_RETENTION = timedelta(hours=1)
+        assert set(stale.refresh()["id"]) == {"r2", "r3"}
+        assert firebase.full_reads == 2
+
+
+if __name__ == "__main__":
+    test_snapshot_and_delta_sync()
+    test_old_tombstones_are_pruned_and_old_snapshots_resynced()
+    print("Receipt mirror tests passed")
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import time
+
+from services.response_cache import ResponseCache
+
+
+def test_normalized_questions_share_an_entry():
+    cache = ResponseCache()
+    cache.set("What's my top spending category?", "v1", "Dining")
+
+    assert cache.get("  what's my TOP spending   category ", "v1") == "Dining"
+    assert cache.get("What's my top spending category?", "v2") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "v", "A")
+    cache.set("b", "v", "B")
+    cache.get("a", "v")
+    cache.set("c", "v", "C")
+
+    assert cache.get("b", "v") is None
+    assert cache.get("a", "v") == "A"
+
+    expired = ResponseCache(ttl_seconds=0.01)
+    expired.set("a", "v", "A")
+    time.sleep(0.02)
+    assert expired.get("a", "v") is None
+
+
+def test_disk_tier_survives_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache", "responses.db")
+        ResponseCache(disk_path=path).set("budget tips", "v1", "Use 50/30/20")
+
+        restarted = ResponseCache(disk_path=path)
+        assert restarted.get("Budget tips?", "v1") == "Use 50/30/20"
+        assert restarted.get("budget tips", "v2") is None
+
+
+if __name__ == "__main__":
+    test_normalized_questions_share_an_entry()
+    test_lru_eviction_and_ttl()
+    test_disk_tier_survives_restart()
+    print("Response cache tests passed")
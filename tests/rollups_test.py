@@ -0,0 +1,150 @@
+import os
+import sqlite3
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from services.aggregates import ROLLUP_DIMENSIONS
+from services.sqlite_store import SQLiteReceiptStore
+from services.storage import ReceiptStore
+
+
+def receipt(i, amount=None):
+    return {
+        "merchant_name": f"Merchant {i % 3}",
+        "category": "Dining" if i % 2 else "Groceries",
+        "total_amount": 10.0 + i if amount is None else amount,
+        "transaction_date": "2025-01-07"
+    }
+
+
+def assert_rollups_match_fallback(store):
+    for dimension in ROLLUP_DIMENSIONS:
+        rollup = store.get_rollup(dimension)
+        expected = ReceiptStore.get_rollup(store, dimension)
+
+        assert set(rollup) == set(expected), dimension
+        for key, (total, count) in expected.items():
+            assert rollup[key][0] == pytest.approx(total)
+            assert rollup[key][1] == count
+
+
+def test_sqlite_rollups_follow_saves_and_deletes():
+    store = SQLiteReceiptStore(":memory:")
+    ids = [store.save_receipt_data(receipt(i)) for i in range(6)]
+    ids += store.save_receipts_batch([receipt(i) for i in range(6, 10)])
+    store.save_receipt_data(receipt(10, amount=0))
+
+    assert_rollups_match_fallback(store)
+    assert store.get_rollup("category")["Dining"][1] == 5
+
+    for receipt_id in ids[:3]:
+        assert store.delete_receipt(receipt_id)
+    # Deleting twice must not decrement again
+    assert store.delete_receipt(ids[0])
+
+    assert_rollups_match_fallback(store)
+    assert "Merchant 0" in store.get_rollup("merchant")
+
+
+def test_sqlite_drops_empty_rollup_keys():
+    store = SQLiteReceiptStore(":memory:")
+    receipt_id = store.save_receipt_data(receipt(1))
+    store.delete_receipt(receipt_id)
+
+    for dimension in ROLLUP_DIMENSIONS:
+        assert store.get_rollup(dimension) == {}
+
+
+def test_sqlite_backfills_rollups_for_existing_database(tmp_path):
+    path = str(tmp_path / "receipts.db")
+    store = SQLiteReceiptStore(path)
+    store.save_receipts_batch([receipt(i) for i in range(5)])
+    store.conn.close()
+
+    # Simulate a database written before rollups existed
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE receipt_rollups")
+    conn.commit()
+    conn.close()
+
+    reopened = SQLiteReceiptStore(path)
+    assert_rollups_match_fallback(reopened)
+
+
+def test_firebase_rollups_follow_saves_and_deletes():
+    store = make_firebase_store(make_receipts(200))
+    assert_rollups_match_fallback(store)
+
+    ids = [store.save_receipt_data(receipt(i)) for i in range(3)]
+    ids += store.save_receipts_batch([receipt(i) for i in range(3, 250)])
+    assert store.delete_receipt(ids[0])
+    assert store.delete_receipt(ids[0])
+    assert store.delete_receipt(ids[-1])
+
+    assert_rollups_match_fallback(store)
+
+
+def test_firebase_dashboard_reads_scale_with_keys():
+    store = make_firebase_store(make_receipts(2000))
+    collections = store.db.collections
+
+    merchants = store.get_rollup("merchant")
+    months = store.get_rollup("month")
+
+    assert collections["receipts"].reads == 0
+    assert collections["receipt_rollups"].reads == len(merchants) + len(months)
+
+
+def test_firebase_rebuild_removes_stale_rollups():
+    store = make_firebase_store()
+    receipt_id = store.save_receipt_data(receipt(1))
+    store.db.collection("receipts").remove(receipt_id)
+
+    store.rebuild_rollups()
+
+    assert len(store.db.collection("receipt_rollups").docs) == 0
+    assert store.get_rollup("day") == {}
+
+
+def test_firebase_backfills_legacy_receipts_once():
+    receipts = make_receipts(300)
+    store = make_firebase_store()
+    # Saved before rollups existed: receipts without rollup documents
+    store.db.collection("receipts").load(receipts)
+    assert store.get_rollup("month") == {}
+
+    assert store.backfill_rollups()
+    months = store.get_rollup("month")
+    assert sum(count for _, count in months.values()) == sum(
+        r["total_amount"] > 0 for r in receipts
+    )
+
+    store.save_receipt_data(receipt(1))
+    assert not store.backfill_rollups()
+    assert store.get_rollup("month") != months
+
+
+def test_unknown_dimension_is_rejected():
+    with pytest.raises(ValueError):
+        SQLiteReceiptStore(":memory:").get_rollup("week")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_sqlite_rollups_follow_saves_and_deletes()
+    test_sqlite_drops_empty_rollup_keys()
+    with tempfile.TemporaryDirectory() as directory:
+        test_sqlite_backfills_rollups_for_existing_database(Path(directory))
+    test_firebase_rollups_follow_saves_and_deletes()
+    test_firebase_dashboard_reads_scale_with_keys()
+    test_firebase_rebuild_removes_stale_rollups()
+    test_firebase_backfills_legacy_receipts_once()
+    test_unknown_dimension_is_rejected()
+    print("✓ rollup tests passed")
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from services.sqlite_store import SQLiteReceiptStore
+
+
+def newest_first(store, ids):
+    receipts = [store.get_receipt_by_id(i) for i in ids]
+    receipts.sort(key=lambda r: (r["created_at"], r["id"]), reverse=True)
+    return [r["id"] for r in receipts]
+
+
+def make_store(n=0):
+    store = SQLiteReceiptStore(":memory:")
+    ids = [
+        store.save_receipt_data({
+            "merchant_name": f"Merchant {i % 3}",
+            "category": "Dining",
+            "total_amount": 10.0 + i,
+            "transaction_date": "2025-01-07",
+            "raw_text": "demo",
+        })
+        for i in range(n)
+    ]
+    return store, ids
+
+
+def test_save_get_and_delete_roundtrip():
+    store, ids = make_store(2)
+
+    receipt = store.get_receipt_by_id(ids[0])
+    assert receipt["merchant_name"] == "Merchant 0"
+    assert receipt["raw_text"] == "demo"
+    assert isinstance(receipt["created_at"], datetime)
+
+    assert store.delete_receipt(ids[0])
+    assert store.get_receipt_by_id(ids[0]) is None
+    assert store.get_deleted_receipt_ids_since(datetime(2000, 1, 1)) == [ids[0]]
+    assert store.get_aggregates().summary()["total_receipts"] == 1
+
+
+def test_prune_deletions_keeps_recent_tombstones():
+    store, ids = make_store(2)
+    store.delete_receipt(ids[0])
+    store.delete_receipt(ids[1])
+    store.conn.execute(
+        "UPDATE receipt_deletions SET deleted_at = '2020-01-01 00:00:00' "
+        "WHERE id = ?",
+        (ids[0],)
+    )
+
+    assert store.prune_deletions_before(datetime.now() - timedelta(days=7)) == 1
+    assert store.get_deleted_receipt_ids_since(datetime(2000, 1, 1)) == [ids[1]]
+
+
+def test_pagination_is_newest_first_and_complete():
+    store, ids = make_store(7)
+    expected = newest_first(store, ids)
+
+    page, cursor = store.get_receipts_page(3)
+    assert [r["id"] for r in page] == expected[:3]
+    assert cursor is not None
+
+    all_ids = [r["id"] for r in store.iter_receipts(page_size=3)]
+    assert all_ids == expected
+    assert len(store.get_all_receipts()) == 7
+    assert [r["id"] for r in store.get_recent_receipts(2)] == expected[:2]
+
+
+def test_updated_since_and_indexes():
+    store, ids = make_store(4)
+    updated = {i: store.get_receipt_by_id(i)["updated_at"] for i in ids}
+    cutoff = updated[ids[1]]
+
+    changed = list(store.iter_receipts_updated_since(cutoff, page_size=1))
+    assert {r["id"] for r in changed} == {
+        i for i, ts in updated.items() if ts > cutoff
+    }
+
+    future = datetime.now() + timedelta(days=1)
+    assert list(store.iter_receipts_updated_since(future)) == []
+
+    indexes = {
+        row["name"] for row in store.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {
+        "idx_receipts_created_at",
+        "idx_receipts_transaction_date",
+        "idx_receipts_category",
+        "idx_receipts_merchant_name",
+    } <= indexes
+
+
+def test_batch_save_updates_aggregates():
+    store, _ = make_store(1)
+    store.get_aggregates()
+
+    ids = store.save_receipts_batch([
+        {"merchant_name": "Walmart", "category": "Groceries", "total_amount": 5.0},
+        {"merchant_name": "Uber Eats", "category": "Dining", "total_amount": 7.5},
+    ])
+
+    assert len(ids) == 2
+    assert store.get_receipt_by_id(ids[1])["merchant_name"] == "Uber Eats"
+    assert store.get_aggregates().summary()["total_receipts"] == 3
+
+
+def test_batch_save_with_ids_is_idempotent():
+    store, _ = make_store()
+
+    for _ in range(2):
+        ids = store.save_receipts_batch(
+            [{"merchant_name": "Walmart", "category": "Groceries", "total_amount": 5.0}],
+            ["job-1"]
+        )
+        assert ids == ["job-1"]
+
+    assert store.get_spending_totals()["total_receipts"] == 1
+    assert store.get_rollup("category")["Groceries"] == (5.0, 1)
+
+
+if __name__ == "__main__":
+    test_save_get_and_delete_roundtrip()
+    test_prune_deletions_keeps_recent_tombstones()
+    test_pagination_is_newest_first_and_complete()
+    test_updated_since_and_indexes()
+    test_batch_save_updates_aggregates()
+    test_batch_save_with_ids_is_idempotent()
+    print("SQLite store tests passed")
@@ -0,0 +1,107 @@
+import threading
+
+from services.startup import (
+    FAILED,
+    PENDING,
+    READY,
+    LazyService,
+    ServiceRegistry
+)
+
+
+class Service:
+    def __init__(self):
+        self.value = 42
+
+    def status(self, job_id):
+        return f"status of {job_id}"
+
+
+def test_lazy_service_initializes_on_first_use():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return Service()
+
+    service = LazyService("svc", factory)
+    assert service.init_state == PENDING
+    assert calls == []
+
+    assert service.value == 42
+    assert service.value == 42
+    # Handle members never shadow the service's own methods
+    assert service.status("j1") == "status of j1"
+    assert service.init_state == READY
+    assert calls == [1]
+
+
+def test_background_start_and_waiting_callers():
+    release = threading.Event()
+
+    def factory():
+        release.wait(5)
+        return Service()
+
+    registry = ServiceRegistry()
+    service = registry.register("slow", factory)
+    registry.start()
+
+    assert registry.status()["status"] == "starting"
+    release.set()
+
+    assert service.resolve(timeout=5).value == 42
+    status = registry.status()
+    assert status["status"] == "ready"
+    assert status["services"]["slow"]["state"] == READY
+    assert "service:slow" in status["startup"]
+
+
+def test_failed_service_reports_and_retries():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("firestore unreachable")
+        return Service()
+
+    registry = ServiceRegistry()
+    service = registry.register("store", factory)
+
+    try:
+        service.resolve()
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert "firestore unreachable" in str(e)
+
+    status = registry.status()
+    assert status["status"] == "degraded"
+    assert status["services"]["store"]["state"] == FAILED
+
+    assert service.value == 42
+    assert registry.ready
+
+
+def test_mirror_is_registered_only_without_sign_in(monkeypatch):
+    from config.settings import Settings
+    from main import register_services
+
+    monkeypatch.setattr(Settings, "STORAGE_BACKEND", "firebase")
+    monkeypatch.setattr(Settings, "MIRROR_ENABLED", True)
+
+    monkeypatch.setattr(Settings, "APP_USERS", "")
+    registry = ServiceRegistry()
+    assert register_services(registry)[-1] is not None
+
+    monkeypatch.setattr(Settings, "APP_USERS", "alice:secret,bob:hunter2")
+    registry = ServiceRegistry()
+    assert register_services(registry)[-1] is None
+    assert "receipt_mirror" not in registry.services
+
+
+if __name__ == "__main__":
+    test_lazy_service_initializes_on_first_use()
+    test_background_start_and_waiting_callers()
+    test_failed_service_reports_and_retries()
+    print("Startup tests passed")
@@ -0,0 +1,87 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from services.sqlite_store import SQLiteReceiptStore
+from services.storage import ReceiptStore
+
+
+def fallback_totals(store):
+    return (
+        ReceiptStore.get_spending_totals(store),
+        ReceiptStore.get_category_totals(store)
+    )
+
+
+def assert_same_breakdown(actual, expected):
+    assert set(actual) == set(expected)
+    for category, totals in expected.items():
+        assert actual[category]["count"] == totals["count"]
+        assert actual[category]["total"] == pytest.approx(totals["total"])
+
+
+def test_sqlite_totals_match_client_side_fallback():
+    store = SQLiteReceiptStore(":memory:")
+    for i, amount in enumerate([12.5, 30.0, 0, -4.0, 7.25]):
+        store.save_receipt_data({
+            "merchant_name": f"Merchant {i}",
+            "category": "Dining" if i % 2 else "Groceries",
+            "total_amount": amount,
+            "transaction_date": "2025-01-07"
+        })
+
+    totals = store.get_spending_totals()
+    expected_totals, expected_categories = fallback_totals(store)
+
+    assert totals["total_receipts"] == 3
+    assert totals["total_spent"] == pytest.approx(49.75)
+    assert totals["average_transaction"] == pytest.approx(
+        expected_totals["average_transaction"]
+    )
+    assert_same_breakdown(store.get_category_totals(), expected_categories)
+
+
+def test_firebase_totals_use_aggregations_and_rollups():
+    receipts = make_receipts(500)
+    receipts[0]["category"] = "Pets"
+    store = make_firebase_store(receipts)
+    collection = store.db.collection("receipts")
+
+    totals = store.get_spending_totals()
+    categories = store.get_category_totals()
+
+    # No receipts were streamed: one aggregation, then the rollup documents
+    assert collection.reads == 0
+    assert collection.aggregations > 0
+    assert store.db.collection("receipt_rollups").reads == len(categories)
+
+    expected_totals, expected_categories = fallback_totals(store)
+    assert totals["total_receipts"] == expected_totals["total_receipts"]
+    assert totals["total_spent"] == pytest.approx(expected_totals["total_spent"])
+
+    # Categories outside the extraction list keep their own entry
+    assert "Pets" in categories
+    assert_same_breakdown(categories, expected_categories)
+
+
+def test_firebase_totals_on_empty_collection():
+    store = make_firebase_store()
+
+    assert store.get_spending_totals() == {
+        "total_spent": 0.0,
+        "total_receipts": 0,
+        "average_transaction": 0
+    }
+    assert store.get_category_totals() == {}
+
+
+if __name__ == "__main__":
+    test_sqlite_totals_match_client_side_fallback()
+    test_firebase_totals_use_aggregations_and_rollups()
+    test_firebase_totals_on_empty_collection()
+    print("✓ storage aggregation tests passed")
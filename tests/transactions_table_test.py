@@ -0,0 +1,188 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+import gradio as gr
+import pytest
+
+from benchmarks.fakes import make_firebase_store
+from benchmarks.synthetic import make_receipts
+from config.settings import Settings
+from services.receipt_frame import build_receipt_frame, frame_page
+from services.sqlite_store import SQLiteReceiptStore
+from services.storage import ReceiptStore
+from ui.dashboard import DEFAULT_SORT, create_dashboard_tab
+
+
+def matching(receipts, needle):
+    return [
+        r for r in receipts
+        if r["total_amount"] > 0 and (
+            needle in r["merchant_name"].lower()
+            or needle in r["category"].lower()
+        )
+    ]
+
+
+def test_fallback_keeps_only_the_requested_page():
+    receipts = make_receipts(500)
+    store = make_firebase_store(receipts)
+
+    page, total = ReceiptStore.search_receipts(
+        store, "mart", "amount", True, offset=10, limit=5
+    )
+
+    expected = sorted(
+        matching(receipts, "mart"),
+        key=lambda r: (r["total_amount"], r["created_at"], r["id"]),
+        reverse=True
+    )
+    assert total == len(expected)
+    assert [r["id"] for r in page] == [r["id"] for r in expected[10:15]]
+
+
+def test_frame_page_matches_fallback():
+    receipts = make_receipts(1000)
+    store = make_firebase_store(receipts)
+    frame = build_receipt_frame(receipts)
+
+    for sort_by in ("date", "amount", "merchant", "category"):
+        for descending in (True, False):
+            rows, total = frame_page(frame, "STAR", sort_by, descending, 20, 10)
+            page, expected_total = ReceiptStore.search_receipts(
+                store, "STAR", sort_by, descending, 20, 10
+            )
+
+            assert total == expected_total
+            assert rows["id"].tolist() == [r["id"] for r in page]
+
+
+def test_firebase_unsearched_page_reads_only_the_page():
+    receipts = make_receipts(2000)
+    store = make_firebase_store(receipts)
+
+    page, total = store.search_receipts(sort_by="date", offset=0, limit=25)
+
+    assert total == 2000
+    assert [r["id"] for r in page] == [
+        r["id"] for r in sorted(receipts, key=lambda r: r["created_at"], reverse=True)
+    ][:25]
+    assert store.db.collection("receipts").reads == 25
+
+
+def test_firebase_pages_resume_from_cursors():
+    receipts = make_receipts(500)
+    store = make_firebase_store(receipts)
+    collection = store.db.collection("receipts")
+    expected = sorted(
+        [r for r in receipts if r["total_amount"] > 0],
+        key=lambda r: (r["total_amount"], r["id"]),
+        reverse=True
+    )
+
+    for page_number in (0, 1, 2, 1, 3):
+        collection.reads = 0
+        page, total = store.search_receipts(
+            sort_by="amount", offset=page_number * 25, limit=25
+        )
+
+        assert [r["id"] for r in page] == [
+            r["id"] for r in expected[page_number * 25:][:25]
+        ]
+        assert total == len(expected)
+        assert collection.reads == 25
+
+    # One count until the next write
+    assert collection.aggregations == 1
+    store.save_receipt_data(
+        {"merchant_name": "New", "category": "Dining", "total_amount": 1.0}
+    )
+    assert store.search_receipts(sort_by="amount", limit=25)[1] == len(expected) + 1
+    assert collection.aggregations == 2
+
+
+def test_firebase_table_cache_expires(monkeypatch):
+    receipts = make_receipts(100)
+    store = make_firebase_store(receipts)
+    collection = store.db.collection("receipts")
+    total = store.search_receipts(sort_by="amount", limit=25)[1]
+
+    # Another instance adds a receipt: unseen until the cache expires
+    collection.load(
+        [{"id": "elsewhere", "merchant_name": "New", "category": "Dining",
+          "total_amount": 1.0}]
+    )
+    assert store.search_receipts(sort_by="amount", limit=25)[1] == total
+
+    monkeypatch.setattr(Settings, "TABLE_CACHE_TTL_SECONDS", 0)
+    assert store.search_receipts(sort_by="amount", limit=25)[1] == total + 1
+    assert collection.aggregations == 2
+
+
+def test_sqlite_search_escapes_like_wildcards():
+    store = SQLiteReceiptStore(":memory:")
+    store.save_receipts_batch([
+        {"merchant_name": "100% Organic", "category": "Groceries", "total_amount": 4.0},
+        {"merchant_name": "Corner Shop", "category": "Groceries", "total_amount": 9.0},
+        {"merchant_name": "Refund", "category": "Other", "total_amount": -3.0},
+    ])
+
+    page, total = store.search_receipts("0%", "amount")
+    assert total == 1
+    assert page[0]["merchant_name"] == "100% Organic"
+
+    page, total = store.search_receipts("GROCER", "amount", descending=False)
+    assert total == 2
+    assert [r["total_amount"] for r in page] == [4.0, 9.0]
+
+    with pytest.raises(ValueError):
+        store.search_receipts(sort_by="notes")
+
+
+def test_sqlite_date_sort_matches_fallback():
+    receipts = make_receipts(300)
+    store = SQLiteReceiptStore(":memory:")
+    store.import_receipts(receipts)
+
+    for descending in (True, False):
+        page, total = store.search_receipts("", "date", descending, 40, 25)
+        expected = sorted(
+            [r for r in receipts if r["total_amount"] > 0],
+            key=lambda r: (r["created_at"], r["id"]),
+            reverse=descending
+        )
+
+        assert total == len(expected)
+        assert [r["id"] for r in page] == [r["id"] for r in expected[40:65]]
+
+
+def test_dashboard_pages_through_the_table(monkeypatch):
+    monkeypatch.setattr(Settings, "DASHBOARD_TABLE_LIMIT", 20)
+
+    receipts = make_receipts(150)
+    store = make_firebase_store(receipts)
+    with gr.Blocks():
+        load_dashboard = create_dashboard_tab(store)[0]
+
+    table, *_, page_info, page = load_dashboard()
+    assert len(table) == 20
+    assert page == 1
+    assert page_info.startswith("Page 1 of 8")
+
+    # Past the end clamps to the last page
+    table, *_, page_info, page = load_dashboard(
+        "All time", "", "", "", DEFAULT_SORT, 99
+    )
+    assert page == 8
+    assert len(table) == 10
+
+
+if __name__ == "__main__":
+    test_fallback_keeps_only_the_requested_page()
+    test_frame_page_matches_fallback()
+    test_firebase_unsearched_page_reads_only_the_page()
+    test_firebase_pages_resume_from_cursors()
+    test_sqlite_search_escapes_like_wildcards()
+    test_sqlite_date_sort_matches_fallback()
+    print("✓ transactions table tests passed")
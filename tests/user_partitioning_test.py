@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from benchmarks.fakes import make_firebase_store
+from services.analytics_data import get_transactions_df
+from services.job_queue import DONE, ReceiptJobQueue
+from services.sqlite_store import SQLiteReceiptStore
+from services.storage import DEFAULT_USER_ID, request_user_id
+
+
+def receipt(merchant, amount):
+    return {
+        "merchant_name": merchant,
+        "category": "Dining",
+        "total_amount": amount,
+        "transaction_date": "2025-01-07"
+    }
+
+
+def check_isolation(store):
+    alice = store.for_user("alice")
+    bob = store.for_user("bob")
+
+    assert store.for_user("alice") is alice
+    assert store.for_user(None) is store
+    assert alice.user_id == "alice"
+
+    alice_ids = alice.save_receipts_batch(
+        [receipt("Cafe", 10.0), receipt("Cafe", 5.0)]
+    )
+    bob_id = bob.save_receipt_data(receipt("Books", 40.0))
+    store.save_receipt_data(receipt("Legacy", 1.0))
+
+    assert {r["id"] for r in alice.iter_receipts()} == set(alice_ids)
+    assert [r["id"] for r in bob.get_recent_receipts()] == [bob_id]
+    assert alice.get_spending_totals()["total_spent"] == 15.0
+    assert bob.get_rollup("merchant") == {"Books": (40.0, 1)}
+    assert store.get_rollup("merchant") == {"Legacy": (1.0, 1)}
+    assert len(alice.get_aggregates()) == 2
+
+    # Another user's receipt can be neither read nor deleted
+    assert alice.get_receipt_by_id(bob_id) is None
+    alice.delete_receipt(bob_id)
+    assert bob.get_receipt_by_id(bob_id) is not None
+    assert bob.get_spending_totals()["total_receipts"] == 1
+
+    assert alice.delete_receipt(alice_ids[0])
+    assert alice.get_deleted_receipt_ids_since(datetime(2000, 1, 1)) == [
+        alice_ids[0]
+    ]
+    assert alice.get_rollup("merchant") == {"Cafe": (5.0, 1)}
+
+
+def test_sqlite_users_are_isolated():
+    check_isolation(SQLiteReceiptStore(":memory:"))
+
+
+def test_firebase_users_are_isolated():
+    store = make_firebase_store()
+    check_isolation(store)
+
+    # Users live in their own subcollections; the default user keeps
+    # the original top-level collection
+    collections = store.db.collections
+    assert len(collections["users/alice/receipts"].docs) == 1
+    assert len(collections["users/bob/receipts"].docs) == 1
+    assert len(collections["receipts"].docs) == 1
+
+
+def test_sqlite_legacy_rows_belong_to_default_user():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "legacy.db")
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE receipts (
+                id TEXT PRIMARY KEY, merchant_name TEXT, category TEXT,
+                total_amount REAL, transaction_date TEXT,
+                created_at TEXT NOT NULL, updated_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX idx_receipts_created_at ON receipts (created_at, id);
+            CREATE TABLE receipt_deletions (
+                id TEXT PRIMARY KEY, deleted_at TEXT NOT NULL
+            );
+            INSERT INTO receipts VALUES (
+                'old', 'Cafe', 'Dining', 12.5, '2025-01-07',
+                '2025-01-07 10:00:00.000000', '2025-01-07 10:00:00.000000',
+                '{"merchant_name": "Cafe", "total_amount": 12.5}'
+            );
+        """)
+        conn.commit()
+        conn.close()
+
+        store = SQLiteReceiptStore(path)
+
+        assert store.user_id == DEFAULT_USER_ID
+        assert [r["id"] for r in store.iter_receipts()] == ["old"]
+        assert store.get_rollup("day") == {"2025-01-07": (12.5, 1)}
+        assert list(store.for_user("alice").iter_receipts()) == []
+
+        index_sql = store.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'idx_receipts_created_at'"
+        ).fetchone()[0]
+        assert "user_id" in index_sql
+        store.conn.close()
+
+
+def test_job_queue_saves_for_the_submitting_user():
+    store = SQLiteReceiptStore(":memory:")
+
+    class Processor:
+        def process_receipt(self, file_path, mime_type):
+            return receipt("Cafe", 10.0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "receipt.png")
+        with open(path, "wb") as f:
+            f.write(b"png")
+
+        jobs = ReceiptJobQueue(store, Processor(), workers=1)
+        job_id = jobs.submit(path, "alice")
+        assert jobs.wait([job_id], timeout=5)
+        assert jobs.status([job_id])[0]["state"] == DONE
+        jobs.shutdown()
+
+    assert len(list(store.for_user("alice").iter_receipts())) == 1
+    assert list(store.iter_receipts()) == []
+
+
+def test_transactions_df_is_user_scoped():
+    store = SQLiteReceiptStore(":memory:")
+    store.for_user("alice").save_receipt_data(receipt("Cafe", 10.0))
+    store.save_receipt_data(receipt("Other", 99.0))
+
+    df = get_transactions_df("alice", store)
+    assert list(df["merchant"]) == ["Cafe"]
+
+
+def test_request_user_id():
+    class Request:
+        username = "alice"
+
+    assert request_user_id(Request()) == "alice"
+    assert request_user_id(None) == DEFAULT_USER_ID
+
+
+if __name__ == "__main__":
+    test_sqlite_users_are_isolated()
+    test_firebase_users_are_isolated()
+    test_sqlite_legacy_rows_belong_to_default_user()
+    test_job_queue_saves_for_the_submitting_user()
+    test_transactions_df_is_user_scoped()
+    test_request_user_id()
+    print("✓ user partitioning tests passed")
@@ -0,0 +1,80 @@
+"""
+Bulk Import UI
+Imports a CSV or Parquet transactions export (expenses.csv schema)
+for the signed-in user, reporting progress after every chunk
+"""
+
+import gradio as gr
+from services.bulk_import import import_file
+from services.storage import ReceiptStore, request_user_id
+from utils.helpers import create_success_message, create_error_message
+
+
+def create_bulk_import_tab(receipt_store: ReceiptStore):
+    """
+    Bulk import tab
+    NOTE:
+    - Returns a hidden counter of imported receipts; main.py refreshes
+      the dashboard whenever it changes (once per finished import)
+    """
+
+    def run_import(file_path, imported_count, request: gr.Request = None):
+        """
+        Stream the file into the store, yielding progress per chunk
+        """
+
+        if not file_path:
+            yield create_error_message("No file uploaded"), imported_count
+            return
+
+        store = receipt_store.for_user(request_user_id(request))
+        report = None
+
+        try:
+            for report in import_file(file_path, store):
+                yield f"⏳ {report.describe()}", gr.update()
+
+        except Exception as e:
+            print(f"✗ Bulk import error: {e}")
+            yield create_error_message(f"Import failed: {e}"), imported_count
+            return
+
+        if report is None:
+            yield create_error_message("The file has no rows"), imported_count
+            return
+
+        yield (
+            create_success_message(report.describe()),
+            imported_count + report.imported
+        )
+
+    with gr.Column():
+        gr.Markdown("# Import Transactions")
+        gr.Markdown(
+            "*Upload a CSV or Parquet export with the columns "
+            "id, date, type, amount, category, merchant, notes. "
+            "Rows already imported are skipped; income rows are not "
+            "counted as spending.*"
+        )
+
+        file_input = gr.File(
+            label="Select Transactions File (CSV, Parquet)",
+            type="filepath",
+            file_types=[".csv", ".parquet"]
+        )
+
+        import_button = gr.Button(
+            "📥 Import Transactions",
+            variant="primary"
+        )
+
+        status_message = gr.Markdown("")
+        imported_receipts = gr.Number(value=0, visible=False)
+
+        import_button.click(
+            fn=run_import,
+            inputs=[file_input, imported_receipts],
+            outputs=[status_message, imported_receipts]
+        )
+
+    return imported_receipts
@@ -3,29 +3,52 @@ Pilot AI Chatbot UI
 """
 
 import gradio as gr
+from config.settings import Settings
 from services.gemini_manager import GeminiManager
-from services.firebase_manager import FirebaseManager
+from services.storage import ReceiptStore, request_user_id
+from services.ai_summary import SummaryCache
 
 
 def create_chatbot_tab(
     gemini_manager: GeminiManager,
-    firebase_manager: FirebaseManager
+    receipt_store: ReceiptStore
 ):
 
-    def respond(user_message, chat_history):
-        if not user_message or user_message.strip() == "":
-            return "", chat_history
+    summaries = SummaryCache(ttl_seconds=Settings.PILOT_SUMMARY_TTL_SECONDS)
+
+    def respond(user_message, chat_history, request: gr.Request = None):
+        """
+        Generator: renders the reply progressively as it streams in
+        """
 
-        reply = gemini_manager.generate_response(user_message)
+        chat_history = chat_history or []
+
+        if not user_message or user_message.strip() == "":
+            yield "", chat_history
+            return
 
         chat_history.append(
             {"role": "user", "content": user_message}
         )
         chat_history.append(
-            {"role": "assistant", "content": reply}
+            {"role": "assistant", "content": ""}
         )
-
-        return "", chat_history
+        yield "", chat_history
+
+        # The prompt carries a bounded summary built from the store's
+        # totals and rollups. Answers are cached per version of that
+        # summary, so a new or deleted receipt invalidates them; the
+        # summary itself is reused until the store writes or it expires
+        store = receipt_store.for_user(request_user_id(request))
+        context, data_version = summaries.get(store)
+
+        for chunk in gemini_manager.stream_response(
+            user_message,
+            data_version,
+            context
+        ):
+            chat_history[-1]["content"] += chunk
+            yield "", chat_history
 
     def clear_chat():
         return []
@@ -3,129 +3,350 @@ Dashboard UI component
 Displays receipt data and spending summary with charts
 """
 
+import math
+
 import gradio as gr
 import pandas as pd
-from services.firebase_manager import FirebaseManager
+from services.aggregates import SpendingAggregates, totals_frame
+from services.chart_prep import downsample_series, top_n_with_other
+from services.date_range import (
+    ALL_TIME,
+    CUSTOM,
+    WINDOW_PRESETS,
+    describe_window,
+    resolve_window
+)
+from services.storage import ReceiptStore, request_user_id
+from services.receipt_mirror import ReceiptMirror
+from services.receipt_frame import (
+    build_receipt_frame,
+    frame_between,
+    frame_page,
+    frame_table_rows,
+    normalize_receipt_frame
+)
+from services.metrics import track
+from config.settings import Settings
 from utils.helpers import (
     format_receipts_for_display,
-    calculate_spending_summary,
-    format_currency,
-    generate_short_id
+    format_currency
 )
-from datetime import datetime
+from typing import Optional
+
+# Transactions table sort choices: label -> (sort key, descending)
+TABLE_SORTS = {
+    "Newest first": ("date", True),
+    "Oldest first": ("date", False),
+    "Amount: high to low": ("amount", True),
+    "Amount: low to high": ("amount", False),
+    "Merchant A-Z": ("merchant", False),
+    "Merchant Z-A": ("merchant", True),
+    "Category A-Z": ("category", False),
+    "Category Z-A": ("category", True)
+}
+DEFAULT_SORT = "Newest first"
 
 
 def normalize_receipts(raw_receipts: list) -> list:
     """
-    Convert Firebase receipts to standardized format
+    Convert stored receipts to standardized format
     IMPORTANT FIX:
     - Use created_at for date (not static transaction_date)
     - Remove all demo / filler logic
+    Runs as one vectorized pass over all receipts (see receipt_frame);
+    created_at may be a datetime or a "YYYY-MM-DD HH:MM:SS" string.
     """
-    normalized = []
 
-    for r in raw_receipts:
-        try:
-            amount = float(r.get("total_amount", 0))
-            if amount <= 0:
-                continue
+    if not raw_receipts:
+        return []
 
-            full_id = r.get("id", "")
-            short_id = generate_short_id(full_id) if full_id else ""
+    frame = normalize_receipt_frame(
+        build_receipt_frame(raw_receipts, sort=False)
+    )
 
-            # created_at comes as string "YYYY-MM-DD HH:MM:SS"
-            created_at = r.get("created_at")
-            if created_at:
-                date_val = created_at.split(" ")[0]
-            else:
-                date_val = datetime.now().strftime("%Y-%m-%d")
+    # Plain Python values, built column-wise (faster than to_dict)
+    columns = list(frame.columns)
+    return [
+        dict(zip(columns, row))
+        for row in zip(*(frame[col].tolist() for col in columns))
+    ]
 
-            normalized.append({
-                "date": date_val,
-                "merchant": r.get("merchant_name", ""),
-                "amount": amount,
-                "category": r.get("category", ""),
-                "id": short_id
-            })
-        except Exception:
-            continue
 
-    return normalized
+def prepare_charts(
+    category_data: pd.DataFrame,
+    merchant_data: pd.DataFrame,
+    time_data: pd.DataFrame
+) -> tuple:
+    """
+    Bound each chart's payload however much history there is:
+    top categories / merchants plus "Other", and a binned time series
+    """
 
+    return (
+        top_n_with_other(category_data, "category", Settings.CHART_TOP_N),
+        top_n_with_other(merchant_data, "merchant", Settings.CHART_TOP_N),
+        downsample_series(time_data, Settings.CHART_MAX_POINTS)
+    )
 
-def create_dashboard_tab(firebase_manager: FirebaseManager):
 
-    def load_dashboard():
-        try:
-            raw_receipts = firebase_manager.get_all_receipts()
-            receipts = normalize_receipts(raw_receipts)
-
-            if not receipts:
-                empty_df = pd.DataFrame(columns=["category", "amount"])
-                return (
-                    [],
-                    "No receipts uploaded yet.",
-                    "**Total:** ₹0.00 | **Receipts:** 0 | **Average:** ₹0.00",
-                    empty_df,
-                    empty_df,
-                    empty_df
+def create_dashboard_tab(
+    receipt_store: ReceiptStore,
+    receipt_mirror: Optional[ReceiptMirror] = None
+):
+
+    def dashboard_scope(request, preset, start_date, end_date):
+        # Everything below only reads the signed-in user's receipts.
+        # The mirror tracks the default user's receipts only.
+        store = receipt_store.for_user(request_user_id(request))
+        window = resolve_window(preset, start_date, end_date)
+
+        mirror = None
+        if receipt_mirror is not None and store is receipt_mirror.store:
+            mirror = receipt_mirror
+
+        return store, mirror, window
+
+    def table_page(store, frame, window, search, sort, page):
+        """
+        One page of the transactions table: only its rows are read
+        (from the store, or sliced from a local receipt frame) and
+        formatted. Returns (rows, page_info, page); page is clamped
+        to the last page.
+        """
+
+        sort_by, descending = TABLE_SORTS.get(sort, TABLE_SORTS[DEFAULT_SORT])
+        search = (search or "").strip()
+        limit = Settings.DASHBOARD_TABLE_LIMIT
+        page = max(1, int(page or 1))
+
+        def fetch(page):
+            offset = (page - 1) * limit
+            if frame is not None:
+                rows, total = frame_page(
+                    frame, search, sort_by, descending, offset, limit
                 )
+                return frame_table_rows(rows), total
 
-            table_data = format_receipts_for_display(receipts)
+            receipts, total = store.search_receipts(
+                search, sort_by, descending, offset, limit, window
+            )
+            rows = format_receipts_for_display(normalize_receipts(receipts))
+            return rows, total
 
-            summary = calculate_spending_summary(receipts)
-            summary_text = (
-                f"**Total Spent:** {format_currency(summary['total_spent'])} | "
-                f"**Receipts:** {summary['total_receipts']} | "
-                f"**Average:** {format_currency(summary['average_transaction'])}"
+        with track("dashboard", "table"):
+            rows, total = fetch(page)
+            pages = max(1, math.ceil(total / limit))
+            if page > pages:
+                page = pages
+                rows, total = fetch(page)
+
+        matching = f' matching "{search}"' if search else ""
+        page_info = f"Page {page} of {pages} · {total} receipt(s){matching}"
+        return rows, page_info, page
+
+    def load_table(
+        preset: str = ALL_TIME,
+        start_date: str = "",
+        end_date: str = "",
+        search: str = "",
+        sort: str = DEFAULT_SORT,
+        page: int = 1,
+        request: gr.Request = None
+    ):
+        """
+        Reload just the transactions table (search, sort, paging)
+        The mirror is sliced as last synced; charts are left alone.
+        """
+
+        try:
+            store, mirror, window = dashboard_scope(
+                request, preset, start_date, end_date
             )
 
-            df = pd.DataFrame(receipts)
+            frame = None
+            if mirror is not None:
+                frame = mirror.frame
+                if window is not None:
+                    frame = frame_between(frame, *window)
+
+            return table_page(store, frame, window, search, sort, page)
+
+        except Exception as e:
+            return [], f"❌ Error: {e}", page
 
-            category_data = (
-                df.groupby("category", as_index=False)["amount"]
-                .sum()
-                .sort_values("amount", ascending=False)
+    def load_dashboard(
+        preset: str = ALL_TIME,
+        start_date: str = "",
+        end_date: str = "",
+        search: str = "",
+        sort: str = DEFAULT_SORT,
+        page: int = 1,
+        request: gr.Request = None
+    ):
+        # Each phase is timed separately (see services.metrics)
+        try:
+            store, mirror, window = dashboard_scope(
+                request, preset, start_date, end_date
             )
 
-            merchant_data = (
-                df.groupby("merchant", as_index=False)["amount"]
-                .sum()
-                .sort_values("amount", ascending=False)
+            # The mirror fetches only receipts changed since its last sync
+            if mirror is not None:
+                with track("dashboard", "mirror_refresh"):
+                    mirror.refresh()
+
+            table_state = (search, sort, page)
+            if window is not None:
+                return load_window(store, mirror, window, *table_state)
+
+            # Headline figures come from server-side aggregation queries
+            # (a handful of reads); the table only needs recent receipts
+            with track("dashboard", "summary"):
+                summary = store.get_spending_totals()
+
+            if not summary["total_receipts"]:
+                return empty_dashboard("No receipts uploaded yet.")
+
+            # The mirror's columnar frame feeds the table directly
+            table_data, page_info, page = table_page(
+                store,
+                mirror.frame if mirror is not None else None,
+                None,
+                *table_state
             )
 
-            time_data = (
-                df.groupby("date", as_index=False)["amount"]
-                .sum()
-                .sort_values("date")
+            summary_text = (
+                f"**Total Spent:** {format_currency(summary['total_spent'])} | "
+                f"**Receipts:** {summary['total_receipts']} | "
+                f"**Average:** {format_currency(summary['average_transaction'])}"
             )
 
+            # Charts read the rollups maintained on write: one row per
+            # category / merchant / day, however many receipts exist
+            with track("dashboard", "charts"):
+                category_data = totals_frame(
+                    store.get_rollup("category"), "category"
+                )
+                merchant_data = totals_frame(
+                    store.get_rollup("merchant"), "merchant"
+                )
+                time_data = totals_frame(store.get_rollup("day"), "date")
+                category_data, merchant_data, time_data = prepare_charts(
+                    category_data, merchant_data, time_data
+                )
+
             return (
                 table_data,
-                f"✅ Loaded {len(receipts)} receipt(s)",
+                f"✅ Loaded {summary['total_receipts']} receipt(s)",
                 summary_text,
                 category_data,
                 merchant_data,
-                time_data
+                time_data,
+                page_info,
+                page
             )
 
         except Exception as e:
-            empty_df = pd.DataFrame(columns=["category", "amount"])
-            return (
-                [],
-                f"❌ Error: {e}",
-                "**Total:** ₹0.00 | **Receipts:** 0 | **Average:** ₹0.00",
-                empty_df,
-                empty_df,
-                empty_df
+            return empty_dashboard(f"❌ Error: {e}")
+
+    def empty_dashboard(status: str):
+        empty_df = pd.DataFrame(columns=["category", "amount"])
+        return (
+            [],
+            status,
+            "**Total:** ₹0.00 | **Receipts:** 0 | **Average:** ₹0.00",
+            empty_df,
+            empty_df,
+            empty_df,
+            "",
+            1
+        )
+
+    def load_window(store, mirror, window, search, sort, page):
+        """
+        Dashboard for one date window: only receipts inside it are
+        read (a range query, or a slice of the mirror) and aggregated
+        """
+
+        with track("dashboard", "window"):
+            if mirror is not None:
+                window_frame = frame_between(mirror.frame, *window)
+            else:
+                window_frame = build_receipt_frame(
+                    store.iter_receipts_between(*window)
+                )
+
+            aggregates = SpendingAggregates()
+            aggregates.load_frame(window_frame)
+            summary = aggregates.summary()
+
+        label = describe_window(window)
+
+        if not summary["total_receipts"]:
+            return empty_dashboard(f"No receipts from {label}.")
+
+        # The window's receipts are already local: page through them
+        table_data, page_info, page = table_page(
+            store, window_frame, window, search, sort, page
+        )
+
+        summary_text = (
+            f"**Total Spent:** {format_currency(summary['total_spent'])} | "
+            f"**Receipts:** {summary['total_receipts']} | "
+            f"**Average:** {format_currency(summary['average_transaction'])}"
+        )
+
+        with track("dashboard", "charts"):
+            category_data, merchant_data, time_data = prepare_charts(
+                aggregates.to_frame("category"),
+                aggregates.to_frame("merchant"),
+                aggregates.to_frame("date")
             )
 
+        return (
+            table_data,
+            f"✅ Loaded {summary['total_receipts']} receipt(s) from {label}",
+            summary_text,
+            category_data,
+            merchant_data,
+            time_data,
+            page_info,
+            page
+        )
+
     gr.Markdown("# DASHBOARD")
     gr.Markdown("*View your receipts and spending insights*")
 
+    with gr.Row():
+        window_preset = gr.Dropdown(
+            choices=WINDOW_PRESETS,
+            value=ALL_TIME,
+            label="Date Range"
+        )
+        start_date = gr.Textbox(
+            label="Start Date",
+            placeholder="YYYY-MM-DD",
+            visible=False
+        )
+        end_date = gr.Textbox(
+            label="End Date",
+            placeholder="YYYY-MM-DD",
+            visible=False
+        )
+
     summary_display = gr.Markdown("**Total:** ₹0.00 | **Receipts:** 0 | **Average:** ₹0.00")
     status_message = gr.Markdown("")
 
+    with gr.Row():
+        table_search = gr.Textbox(
+            label="Search",
+            placeholder="Merchant or category"
+        )
+        table_sort = gr.Dropdown(
+            choices=list(TABLE_SORTS),
+            value=DEFAULT_SORT,
+            label="Sort By"
+        )
+
     receipts_table = gr.Dataframe(
         headers=["Date", "Merchant", "Amount", "Category", "ID"],
         datatype=["str", "str", "str", "str", "str"],
@@ -133,6 +354,17 @@ def create_dashboard_tab(firebase_manager: FirebaseManager):
         label="Transactions"
     )
 
+    with gr.Row():
+        previous_page = gr.Button("◀ Previous")
+        table_page_number = gr.Number(
+            value=1,
+            precision=0,
+            minimum=1,
+            label="Page"
+        )
+        next_page = gr.Button("Next ▶")
+    page_info = gr.Markdown("")
+
     gr.Markdown("## INSIGHTS")
 
     with gr.Row():
@@ -145,6 +377,10 @@ def create_dashboard_tab(firebase_manager: FirebaseManager):
                 "Groceries": "#2a7cff",
                 "Shopping": "#7c7cff",
                 "Transportation": "#00c2a8",
+                "Utilities": "#4fd1c5",
+                "Health": "#ff6b9a",
+                "Entertainment": "#b48cff",
+                "Travel": "#ffb454",
                 "Other": "#8892b0"
             },
             title="Spending by Category",
@@ -177,6 +413,89 @@ def create_dashboard_tab(firebase_manager: FirebaseManager):
         color="#1ec9ff"
     )
 
+    window_inputs = [window_preset, start_date, end_date]
+    dashboard_inputs = window_inputs + [
+        table_search,
+        table_sort,
+        table_page_number
+    ]
+    dashboard_outputs = [
+        receipts_table,
+        status_message,
+        summary_display,
+        category_chart,
+        merchant_chart,
+        time_chart,
+        page_info,
+        table_page_number
+    ]
+    table_outputs = [receipts_table, page_info, table_page_number]
+
+    def toggle_custom_range(preset):
+        visible = preset == CUSTOM
+        return gr.update(visible=visible), gr.update(visible=visible)
+
+    window_preset.change(
+        fn=toggle_custom_range,
+        inputs=[window_preset],
+        outputs=[start_date, end_date]
+    )
+
+    # A preset reloads at once; a custom range once a date is entered
+    window_preset.change(
+        fn=load_dashboard,
+        inputs=dashboard_inputs,
+        outputs=dashboard_outputs
+    )
+    start_date.submit(
+        fn=load_dashboard,
+        inputs=dashboard_inputs,
+        outputs=dashboard_outputs
+    )
+    end_date.submit(
+        fn=load_dashboard,
+        inputs=dashboard_inputs,
+        outputs=dashboard_outputs
+    )
+
+    # Table controls reload only the visible page
+    def first_page(preset, start, end, search, sort, page, request: gr.Request):
+        return load_table(preset, start, end, search, sort, 1, request)
+
+    def step_page(step):
+        def handler(preset, start, end, search, sort, page, request: gr.Request):
+            return load_table(
+                preset, start, end, search, sort,
+                max(1, int(page or 1) + step), request
+            )
+        return handler
+
+    table_search.submit(
+        fn=first_page,
+        inputs=dashboard_inputs,
+        outputs=table_outputs
+    )
+    table_sort.change(
+        fn=first_page,
+        inputs=dashboard_inputs,
+        outputs=table_outputs
+    )
+    table_page_number.submit(
+        fn=load_table,
+        inputs=dashboard_inputs,
+        outputs=table_outputs
+    )
+    previous_page.click(
+        fn=step_page(-1),
+        inputs=dashboard_inputs,
+        outputs=table_outputs
+    )
+    next_page.click(
+        fn=step_page(1),
+        inputs=dashboard_inputs,
+        outputs=table_outputs
+    )
+
     return (
         load_dashboard,
         receipts_table,
@@ -184,5 +503,8 @@ def create_dashboard_tab(firebase_manager: FirebaseManager):
         summary_display,
         category_chart,
         merchant_chart,
-        time_chart
+        time_chart,
+        page_info,
+        table_page_number,
+        dashboard_inputs
     )
@@ -0,0 +1,108 @@
+"""
+Export UI
+Streams the signed-in user's receipts into a CSV or Parquet file
+for download, optionally filtered by date range and category
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import gradio as gr
+from services.bulk_export import export_window, iter_export_pages, write_export
+from services.document_ai_processor import DEMO_CATEGORIES
+from services.storage import ReceiptStore, request_user_id
+from utils.helpers import create_success_message, create_error_message
+
+# Gradio copies a returned file into its own cache for download, so
+# written exports are only kept long enough to be served
+EXPORT_FILE_MAX_AGE = 10 * 60
+
+
+def remove_old_exports(export_dir: str, max_age: float = EXPORT_FILE_MAX_AGE):
+    """
+    Delete export files older than max_age seconds
+    """
+
+    cutoff = time.time() - max_age
+    for entry in os.scandir(export_dir):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError as e:
+            print(f"✗ Export cleanup error: {e}")
+
+
+def create_export_tab(receipt_store: ReceiptStore):
+    """
+    Export tab
+    NOTE:
+    - All exports are written to one temporary directory, removed when
+      the app exits; each export first clears out the old files
+    """
+
+    export_dir = tempfile.mkdtemp(prefix="receipt-exports-")
+    atexit.register(shutil.rmtree, export_dir, ignore_errors=True)
+
+    def run_export(fmt, start_date, end_date, categories, request: gr.Request = None):
+        """
+        Write the export page by page to a temporary file and offer it
+        """
+
+        try:
+            store = receipt_store.for_user(request_user_id(request))
+            window = export_window(start_date, end_date)
+            fmt = (fmt or "CSV").lower()
+
+            remove_old_exports(export_dir)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            fd, path = tempfile.mkstemp(
+                prefix=f"receipts-{stamp}-", suffix=f".{fmt}", dir=export_dir
+            )
+            os.close(fd)
+            rows = write_export(
+                iter_export_pages(store, window, categories), path, fmt
+            )
+
+            return path, create_success_message(f"Exported {rows} receipt(s)")
+
+        except Exception as e:
+            print(f"✗ Export error: {e}")
+            return None, create_error_message(f"Export failed: {e}")
+
+    with gr.Column():
+        gr.Markdown("# Export Receipts")
+        gr.Markdown(
+            "*Download your receipts as CSV or Parquet. "
+            "Leave the dates empty to export everything.*"
+        )
+
+        with gr.Row():
+            export_format = gr.Radio(
+                choices=["CSV", "Parquet"],
+                value="CSV",
+                label="Format"
+            )
+            start_date = gr.Textbox(label="Start Date", placeholder="YYYY-MM-DD")
+            end_date = gr.Textbox(label="End Date", placeholder="YYYY-MM-DD")
+
+        categories = gr.Dropdown(
+            choices=DEMO_CATEGORIES + ["Other"],
+            multiselect=True,
+            allow_custom_value=True,
+            label="Categories (all when empty)"
+        )
+
+        export_button = gr.Button("📤 Export Receipts", variant="primary")
+
+        status_message = gr.Markdown("")
+        export_file = gr.File(label="Export File", interactive=False)
+
+        export_button.click(
+            fn=run_export,
+            inputs=[export_format, start_date, end_date, categories],
+            outputs=[export_file, status_message]
+        )
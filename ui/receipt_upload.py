@@ -1,95 +1,209 @@
 """
 Receipt Upload UI
 Uses DEMO Document AI (free-tier safe)
+Uploads are handed to the background job queue and the click
+returns at once; a timer polls job status until every file is done
 """
 
 import gradio as gr
 import os
-from services.firebase_manager import FirebaseManager
-from services.document_ai_processor import DocumentAIProcessor
+from typing import List
+from services.storage import request_user_id
+from services.job_queue import (
+    DONE,
+    EXTRACTING,
+    FAILED,
+    FINISHED_STATES,
+    QUEUED,
+    RETRYING,
+    SAVING,
+    ReceiptJobQueue
+)
 from utils.helpers import (
-    validate_file,
-    get_mime_type,
     format_currency,
     create_success_message,
     create_error_message
 )
 
+# Seconds between job status polls while uploads are in progress
+POLL_INTERVAL = 1.0
+
+STATE_LABELS = {
+    QUEUED: "⏳ Queued",
+    EXTRACTING: "🔍 Extracting",
+    SAVING: "💾 Saving",
+    RETRYING: "🔁 Retrying",
+    DONE: "✅ Done",
+    FAILED: "❌ Failed"
+}
+
+
+def format_jobs(jobs: List[dict], rejected: List[str]) -> str:
+    """
+    Markdown table of job progress plus files the queue turned away
+    """
+
+    rows = [
+        "| File | Status | Merchant | Amount | Category | Confidence |",
+        "|---|---|---|---|---|---|"
+    ]
+
+    for job in jobs:
+        receipt = job["receipt"] or {}
+        status = STATE_LABELS.get(job["state"], job["state"])
+        if job["error"]:
+            status += f" ({job['error']})"
+
+        amount = ""
+        if "total_amount" in receipt:
+            amount = format_currency(receipt["total_amount"])
+
+        confidence = ""
+        if "confidence" in receipt:
+            confidence = f"{receipt['confidence']:.0%}"
+
+        rows.append(
+            f"| {job['file_name']} "
+            f"| {status} "
+            f"| {receipt.get('merchant_name', '')} "
+            f"| {amount} "
+            f"| {receipt.get('category', '')} "
+            f"| {confidence} |"
+        )
+
+    errors = [
+        f"- ❌ **{name}:** queue is full, try again shortly"
+        for name in rejected
+    ]
+    return "\n".join(rows + [""] + errors)
+
 
-def create_receipt_upload_tab(
-    firebase_manager: FirebaseManager,
-    doc_ai_processor: DocumentAIProcessor
-):
+def create_receipt_upload_tab(job_queue: ReceiptJobQueue):
     """
     Receipt upload tab
     NOTE:
     - Does NOT handle dashboard refresh itself
-    - Returns the upload event so main.py can chain .then(load_dashboard)
+    - Returns a hidden counter of saved receipts; main.py refreshes
+      the dashboard whenever it changes
     """
 
-    def process_receipt(file):
-        try:
-            if not file:
-                return create_error_message("No file uploaded"), ""
+    def submit_receipts(files, request: gr.Request = None):
+        """
+        Enqueue the files for the signed-in user and return immediately
+        Their receipts are saved together once all are extracted.
+        """
 
-            file_path = file
-            file_name = os.path.basename(file_path)
+        if not files:
+            return (
+                create_error_message("No file uploaded"),
+                "",
+                [],
+                [],
+                gr.Timer(active=False)
+            )
 
-            is_valid, msg = validate_file(file_path)
-            if not is_valid:
-                return create_error_message(msg), ""
+        file_paths = files if isinstance(files, list) else [files]
+        job_ids, rejected_paths = job_queue.submit_batch(
+            file_paths, request_user_id(request)
+        )
+        rejected = [os.path.basename(path) for path in rejected_paths]
 
-            # DEMO Document AI processing (service untouched)
-            receipt_data = doc_ai_processor.process_receipt(
-                file_path,
-                get_mime_type(file_path)
+        if not job_ids:
+            return (
+                create_error_message("Receipt queue is full, please try again shortly"),
+                format_jobs([], rejected),
+                [],
+                rejected,
+                gr.Timer(active=False)
             )
 
-            receipt_data["original_filename"] = file_name
-            firebase_manager.save_receipt_data(receipt_data)
+        return (
+            f"⏳ Queued {len(job_ids)} of {len(file_paths)} file(s)...",
+            format_jobs(job_queue.status(job_ids), rejected),
+            job_ids,
+            rejected,
+            gr.Timer(active=True)
+        )
 
-            result_text = f"""
-### ✅ Receipt Processed Successfully
+    def poll_jobs(job_ids, rejected, saved_count):
+        """
+        Render job progress; stops the timer once every job finished
+        """
 
-**Merchant:** {receipt_data.get('merchant_name', 'Unknown')}  
-**Date:** {receipt_data.get('transaction_date', 'Unknown')}  
-**Amount:** {format_currency(receipt_data.get('total_amount', 0))}  
-**Category:** {receipt_data.get('category', 'Other')}  
-**Confidence:** {receipt_data.get('confidence', 0):.0%}
+        if not job_ids:
+            return gr.update(), gr.update(), saved_count, gr.Timer(active=False)
 
----
+        jobs = job_queue.status(job_ids)
+        finished = [job for job in jobs if job["state"] in FINISHED_STATES]
+        saved = sum(job["state"] == DONE for job in jobs)
 
-ℹ️ *Document AI is demo-based for free-tier compatibility. Real API integration available.*
-"""
+        if len(finished) < len(jobs):
             return (
-                create_success_message(f"Receipt '{file_name}' processed"),
-                result_text
+                f"⏳ Processed {len(finished)}/{len(jobs)} file(s)...",
+                format_jobs(jobs, rejected),
+                saved_count,
+                gr.Timer(active=True)
             )
 
-        except Exception as e:
-            return create_error_message(str(e)), ""
+        if saved:
+            status = create_success_message(
+                f"{saved} of {len(jobs) + len(rejected)} receipt(s) processed"
+            )
+        else:
+            status = create_error_message("No receipts could be processed")
+
+        result_text = "\n".join([
+            "### ✅ Receipts Processed",
+            "",
+            format_jobs(jobs, rejected),
+            "",
+            "---",
+            "",
+            "ℹ️ *Document AI is demo-based for free-tier compatibility. "
+            "Real API integration available.*"
+        ])
+
+        return status, result_text, saved_count + saved, gr.Timer(active=False)
 
     with gr.Column():
         gr.Markdown("# Upload Receipt")
         gr.Markdown("*Upload receipt images or PDFs for automatic data extraction*")
 
         file_input = gr.File(
-            label="Select Receipt File (JPG, PNG, PDF)",
-            type="filepath"
+            label="Select Receipt Files (JPG, PNG, PDF)",
+            type="filepath",
+            file_count="multiple"
         )
 
         upload_button = gr.Button(
-            "🚀 Process Receipt",
+            "🚀 Process Receipts",
             variant="primary"
         )
 
         status_message = gr.Markdown("")
         result_display = gr.Markdown("")
 
-        upload_event = upload_button.click(
-            fn=process_receipt,
+        job_ids = gr.State([])
+        rejected_files = gr.State([])
+        saved_receipts = gr.Number(value=0, visible=False)
+        poll_timer = gr.Timer(POLL_INTERVAL, active=False)
+
+        upload_button.click(
+            fn=submit_receipts,
             inputs=[file_input],
-            outputs=[status_message, result_display]
+            outputs=[
+                status_message,
+                result_display,
+                job_ids,
+                rejected_files,
+                poll_timer
+            ]
+        )
+
+        poll_timer.tick(
+            fn=poll_jobs,
+            inputs=[job_ids, rejected_files, saved_receipts],
+            outputs=[status_message, result_display, saved_receipts, poll_timer]
         )
 
-    return upload_event
+    return saved_receipts
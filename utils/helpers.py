@@ -4,10 +4,15 @@ Helper functions for formatting, validation, and common operations
 """
 
 import os
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple
 import mimetypes
 
+# Upper bound on memoized short IDs (one entry per document ID)
+SHORT_ID_CACHE_SIZE = 100_000
+
 def validate_file(file_path: str) -> Tuple[bool, str]:
     """Validate uploaded file"""
     if not os.path.exists(file_path):
@@ -102,9 +107,9 @@ def create_error_message(message: str) -> str:
     """Create an error message"""
     return f"❌ {message}"
 
+@lru_cache(maxsize=SHORT_ID_CACHE_SIZE)
 def generate_short_id(full_id: str) -> str:
-    """Generate short readable ID from UUID"""
-    import hashlib
+    """Generate short readable ID from UUID (memoized per document ID)"""
     hash_obj = hashlib.md5(full_id.encode())
     hex_dig = hash_obj.hexdigest()[:7].upper()
     return hex_dig
\ No newline at end of file